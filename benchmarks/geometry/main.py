@@ -0,0 +1,80 @@
+import random
+import time
+
+import click
+
+from marker.schema.polygon import PolygonBox
+from marker.utils import geometry
+
+
+def random_polygons(count: int, seed: int):
+    rng = random.Random(seed)
+    polygons = []
+    for _ in range(count):
+        x0, y0 = rng.uniform(0, 500), rng.uniform(0, 700)
+        polygons.append(
+            PolygonBox.from_bbox([x0, y0, x0 + rng.uniform(5, 120), y0 + rng.uniform(5, 40)])
+        )
+    return polygons
+
+
+def time_it(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+@click.command(help="Benchmark the batch geometry functions against per-object PolygonBox methods.")
+@click.option("--boxes", default="10,50,200", help="Comma separated list of box counts per page.")
+@click.option("--repeats", default=5, help="Number of times to repeat each measurement.")
+@click.option("--seed", default=0, help="Random seed for the generated boxes.")
+def main(boxes: str, repeats: int, seed: int):
+    page_size = (612, 792)
+    image_size = (1224, 1584)
+    for count in [int(b) for b in boxes.split(",")]:
+        polygons = random_polygons(count, seed)
+
+        def object_gaps():
+            for a in polygons:
+                min(a.minimum_gap(b) for b in polygons if b is not a)
+
+        def batch_gaps():
+            bboxes = geometry.bboxes_array(polygons)
+            geometry.minimum_gap(bboxes, bboxes)
+
+        def object_transform():
+            for p in polygons:
+                p.rescale(page_size, image_size).fit_to_bounds((0, 0, *image_size))
+
+        def batch_transform():
+            geometry.to_polygons(
+                geometry.fit_to_bounds(
+                    geometry.rescale(geometry.corners_array(polygons), page_size, image_size),
+                    (0, 0, *image_size),
+                )
+            )
+
+        def object_distance():
+            for a in polygons:
+                min(a.center_distance(b, x_weight=5) for b in polygons)
+
+        def batch_distance():
+            bboxes = geometry.bboxes_array(polygons)
+            geometry.center_distance(bboxes, bboxes, x_weight=5).argmin(axis=1)
+
+        print(f"Boxes: {count}")
+        for name, object_fn, batch_fn in [
+            ("minimum_gap (all pairs)", object_gaps, batch_gaps),
+            ("rescale + fit_to_bounds", object_transform, batch_transform),
+            ("center_distance (all pairs)", object_distance, batch_distance),
+        ]:
+            object_time = time_it(object_fn, repeats)
+            batch_time = time_it(batch_fn, repeats)
+            print(
+                f"  {name}: objects {object_time * 1000:.2f}ms, batch {batch_time * 1000:.2f}ms, speedup {object_time / batch_time:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
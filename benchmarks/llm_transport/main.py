@@ -0,0 +1,68 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+import requests
+from pydantic import BaseModel
+
+from benchmarks.mock_llm.server import LatencyModel, MockLLMServer
+
+
+class AnswerSchema(BaseModel):
+    answer: str
+
+
+def run_requests_baseline(url: str, requests_count: int, concurrency: int):
+    # The previous path, one bare requests.post per block with a new connection each time
+    payload = {"model": "stand-in", "prompt": "hello", "stream": False}
+
+    def call(_):
+        response = requests.post(url, json=payload, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(call, range(requests_count)))
+
+
+def run_transport(service, requests_count: int, concurrency: int):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: service("hello", None, None, AnswerSchema), range(requests_count)))
+
+
+@click.command(help="Benchmark LLM request throughput against a local Ollama stand-in server.")
+@click.option("--requests_count", default=500, help="Number of requests to send.")
+@click.option("--concurrency", default=8, help="Number of processor threads sending requests.")
+@click.option("--latency_ms", default=5.0, help="Simulated model latency per request.")
+@click.option("--port", default=0, help="Port for the stand-in server, 0 picks a free port.")
+def main(requests_count: int, concurrency: int, latency_ms: float, port: int):
+    # Must be set before marker loads its settings
+    os.environ.setdefault("LLM_MAX_CONCURRENCY", str(concurrency))
+
+    from marker.services.ollama import OllamaService
+
+    server = MockLLMServer(latency=LatencyModel("fixed", latency_ms), port=port).start()
+    base_url = server.url
+
+    service = OllamaService({"ollama_base_url": base_url, "ollama_model": "stand-in"})
+    # Warm up the transport's event loop and connection pool outside the timed region
+    run_transport(service, concurrency, concurrency)
+
+    results = {}
+    for name, fn in [
+        ("requests.post", lambda: run_requests_baseline(f"{base_url}/api/generate", requests_count, concurrency)),
+        ("pooled transport", lambda: run_transport(service, requests_count, concurrency)),
+    ]:
+        start = time.perf_counter()
+        fn()
+        total = time.perf_counter() - start
+        results[name] = requests_count / total
+        print(f"{name}: {total:.2f}s, {results[name]:.1f} requests/sec")
+
+    print(f"Speedup: {results['pooled transport'] / results['requests.post']:.2f}x")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
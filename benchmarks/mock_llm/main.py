@@ -0,0 +1,172 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+import click
+import numpy as np
+
+from benchmarks.mock_llm.server import LatencyModel, MockLLMServer
+
+SERVICES = {
+    "ollama": "marker.services.ollama.OllamaService",
+    "openai": "marker.services.openai.OpenAIService",
+}
+
+
+class TimedService:
+    """
+    Records how long each LLM call takes from the processor's side, including waits for the transport and retries.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if "service" not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self.__dict__["service"], name)
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.service(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - start)
+
+
+def attach_timer(converter) -> TimedService:
+    # Processors hold their own reference to the service, including the ones grouped into meta processors
+    timed = TimedService(converter.llm_service)
+    stack = list(converter.processor_list)
+    while stack:
+        processor = stack.pop()
+        stack.extend(getattr(processor, "processors", []))
+        if getattr(processor, "llm_service", None) is converter.llm_service:
+            processor.llm_service = timed
+    return timed
+
+
+def percentiles(values, points=(50, 95, 99)) -> dict:
+    if not values:
+        return {f"p{p}": None for p in points}
+    return {f"p{p}": round(float(np.percentile(values, p)) * 1000, 1) for p in points}
+
+
+def service_config(service: str, url: str) -> dict:
+    if service == "ollama":
+        return {"ollama_base_url": url, "ollama_model": "mock"}
+    return {"openai_base_url": f"{url}/v1", "openai_model": "mock", "openai_api_key": "mock"}
+
+
+@click.command(help="Benchmark the LLM processors of PdfConverter against a local mock LLM server.")
+@click.argument("pdf_path", required=False)
+@click.option("--service", type=click.Choice(list(SERVICES)), default="ollama", help="The API format to use.")
+@click.option("--concurrency", default="1,4,8,16", help="Comma separated max_concurrency values to compare.")
+@click.option("--latency_ms", default=200.0, help="Mean simulated latency per request.")
+@click.option("--latency_distribution", type=click.Choice(["fixed", "uniform", "lognormal"]), default="lognormal")
+@click.option("--error_rate", default=0.0, help="Fraction of requests that fail with a 500.")
+@click.option("--rate_limit_rate", default=0.0, help="Fraction of requests that are rate limited with a 429.")
+@click.option("--retry_wait_time", default=1, help="Seconds the services wait between retries.")
+@click.option("--device", default="cpu", help="Torch device to run the models on.")
+@click.option("--output_path", default=None, help="Path to write the JSON results to.  Printed if not set.")
+def main(
+    pdf_path: str,
+    service: str,
+    concurrency: str,
+    latency_ms: float,
+    latency_distribution: str,
+    error_rate: float,
+    rate_limit_rate: float,
+    retry_wait_time: int,
+    device: str,
+    output_path: str,
+):
+    concurrencies = [int(c) for c in concurrency.split(",")]
+    # Must be set before marker loads its settings.  The transport limit is raised, so max_concurrency is what varies
+    os.environ["TORCH_DEVICE"] = device
+    os.environ.setdefault("LLM_MAX_CONCURRENCY", str(max(concurrencies)))
+
+    from marker.converters.pdf import PdfConverter
+    from marker.models import create_model_dict
+
+    if pdf_path is None:
+        from benchmarks.synthetic.generate import SyntheticSpec, generate_pdf
+
+        # Tables, equations and headers give most LLM processors some work
+        spec = SyntheticSpec(name="llm", pages=6, tables_per_page=1, equations_per_page=2)
+        pdf_path = generate_pdf(spec, os.path.join(tempfile.gettempdir(), "marker_mock_llm.pdf"))
+
+    model_dict = create_model_dict()
+    server = MockLLMServer(
+        latency=LatencyModel(latency_distribution, latency_ms),
+        error_rate=error_rate,
+        rate_limit_rate=rate_limit_rate,
+    )
+    runs = []
+    with server, tempfile.TemporaryDirectory() as cache_dir:
+        for max_concurrency in concurrencies:
+            config = {
+                "use_llm": True,
+                "max_concurrency": max_concurrency,
+                "retry_wait_time": retry_wait_time,
+                "disable_tqdm": True,
+                "profile_stages": True,
+                # Built documents are cached, so only the first run pays for the models
+                "document_cache_dir": cache_dir,
+                **service_config(service, server.url),
+            }
+            converter = PdfConverter(artifact_dict=model_dict, config=config, llm_service=SERVICES[service])
+            if not runs:
+                converter(pdf_path)
+
+            timed = attach_timer(converter)
+            server.reset_stats()
+            start = time.perf_counter()
+            rendered = converter(pdf_path)
+            total = time.perf_counter() - start
+
+            stages = rendered.metadata["pipeline_profile"]["stages"]
+            llm_time = sum(s["wall_time"] for s in stages if s["name"].startswith("LLM"))
+            stats = server.stats
+            runs.append(
+                {
+                    "max_concurrency": max_concurrency,
+                    "total_time": round(total, 3),
+                    "llm_stage_time": round(llm_time, 3),
+                    "llm_calls": len(timed.latencies),
+                    "server_requests": stats.requests,
+                    "requests_per_sec": round(stats.requests / llm_time, 2) if llm_time else None,
+                    "errors": stats.errors,
+                    "rate_limited": stats.rate_limited,
+                    "max_in_flight": stats.max_in_flight,
+                    "call_latency_ms": percentiles(timed.latencies),
+                    "server_latency_ms": percentiles(stats.latencies),
+                }
+            )
+            print(
+                f"max_concurrency={max_concurrency}: {stats.requests} requests in {llm_time:.2f}s, "
+                f"p99 call latency {runs[-1]['call_latency_ms']['p99']}ms"
+            )
+
+    results = {
+        "service": service,
+        "latency": {"distribution": latency_distribution, "mean_ms": latency_ms},
+        "error_rate": error_rate,
+        "rate_limit_rate": rate_limit_rate,
+        "runs": runs,
+    }
+    output = json.dumps(results, indent=2)
+    if output_path:
+        with open(output_path, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+
+@dataclass
+class LatencyModel:
+    """
+    Simulated model latency.  `fixed` always waits `mean_ms`, `uniform` waits between 0 and twice the mean, and
+    `lognormal` has the long tail real LLM endpoints show, with `sigma` controlling its weight.
+    """
+
+    distribution: str = "fixed"
+    mean_ms: float = 50
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "fixed":
+            ms = self.mean_ms
+        elif self.distribution == "uniform":
+            ms = rng.uniform(0, 2 * self.mean_ms)
+        elif self.distribution == "lognormal":
+            # Shifted so the mean stays at mean_ms
+            ms = self.mean_ms * rng.lognormvariate(-(self.sigma**2) / 2, self.sigma)
+        else:
+            raise ValueError(f"Unknown latency distribution {self.distribution}")
+        return ms / 1000
+
+
+@dataclass
+class ServerStats:
+    requests: int = 0
+    responses: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+
+def sample_from_schema(schema: Dict[str, Any], defs: Dict[str, Any] | None = None) -> Any:
+    """
+    The smallest value that matches a JSON schema, following `$ref`s into `$defs`.
+    """
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].split("/")[-1]], defs)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "default" in schema:
+        return schema["default"]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            return sample_from_schema(schema[key][0], defs)
+
+    schema_type = schema.get("type", "object")
+    if isinstance(schema_type, list):
+        schema_type = schema_type[0]
+    if schema_type == "object":
+        return {
+            name: sample_from_schema(prop, defs)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    return {"array": [], "string": "", "integer": 0, "number": 0.0, "boolean": False, "null": None}[schema_type]
+
+
+class MockLLMServer:
+    """
+    A local stand-in for an LLM endpoint, speaking the Ollama `/api/generate` and OpenAI `/v1/chat/completions`
+    formats.  Responses are valid for the requested JSON schema, after a simulated latency.  A share of requests can
+    fail with a 500 or be rate limited with a 429.
+    """
+
+    def __init__(
+        self,
+        latency: LatencyModel | None = None,
+        error_rate: float = 0,
+        rate_limit_rate: float = 0,
+        seed: int = 0,
+        port: int = 0,
+    ):
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.stats = ServerStats()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = ServerStats()
+
+    def _draw(self) -> tuple[str, float]:
+        # One lock for the shared generator, so a seed gives the same outcomes in the same order
+        with self._lock:
+            roll = self._rng.random()
+            delay = self.latency.sample(self._rng)
+        if roll < self.rate_limit_rate:
+            return "rate_limited", 0
+        if roll < self.rate_limit_rate + self.error_rate:
+            return "error", delay
+        return "ok", delay
+
+    def _handle(self, path: str, request: Dict[str, Any]) -> tuple[int, Dict[str, Any]]:
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.in_flight += 1
+            self.stats.max_in_flight = max(self.stats.max_in_flight, self.stats.in_flight)
+
+        start = time.perf_counter()
+        try:
+            outcome, delay = self._draw()
+            time.sleep(delay)
+            if outcome == "rate_limited":
+                with self._lock:
+                    self.stats.rate_limited += 1
+                return 429, {"error": "rate limited"}
+            if outcome == "error":
+                with self._lock:
+                    self.stats.errors += 1
+                return 500, {"error": "simulated failure"}
+
+            if path.endswith("/api/generate"):
+                body = self.ollama_response(request)
+            elif path.endswith("/chat/completions"):
+                body = self.openai_response(request)
+            else:
+                return 404, {"error": f"unknown path {path}"}
+
+            with self._lock:
+                self.stats.responses += 1
+                self.stats.latencies.append(time.perf_counter() - start)
+            return 200, body
+        finally:
+            with self._lock:
+                self.stats.in_flight -= 1
+
+    @staticmethod
+    def ollama_response(request: Dict[str, Any]) -> Dict[str, Any]:
+        schema = request.get("format")
+        content = sample_from_schema(schema) if isinstance(schema, dict) else {}
+        return {
+            "model": request.get("model"),
+            "response": json.dumps(content),
+            "done": True,
+            "prompt_eval_count": len(request.get("prompt", "")) // 4,
+            "eval_count": 16,
+        }
+
+    @staticmethod
+    def openai_response(request: Dict[str, Any]) -> Dict[str, Any]:
+        response_format = request.get("response_format") or {}
+        schema = response_format.get("json_schema", {}).get("schema")
+        content = sample_from_schema(schema) if schema else {}
+        prompt_tokens = len(json.dumps(request.get("messages", []))) // 4
+        return {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": json.dumps(content), "refusal": None},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": 16,
+                "total_tokens": prompt_tokens + 16,
+            },
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps connections open, like a real endpoint
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    request = {}
+
+                status, body = server._handle(self.path, request)
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
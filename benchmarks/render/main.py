@@ -0,0 +1,57 @@
+import os
+import time
+
+import click
+import pypdfium2 as pdfium
+
+from marker.providers.pdf import PdfProvider
+from marker.providers.pdf_render import get_render_executor
+
+
+@click.command(help="Benchmark page rasterization throughput across render worker counts.")
+@click.argument("pdf_path", type=str)
+@click.option("--dpi", default=192, help="DPI to render pages at.")
+@click.option(
+    "--workers",
+    default="1,2,4,8",
+    help="Comma separated list of render worker counts to compare.",
+)
+@click.option("--max_pages", default=None, type=int, help="Maximum number of pages to render.")
+def main(pdf_path: str, dpi: int, workers: str, max_pages: int):
+    pdf_doc = pdfium.PdfDocument(pdf_path)
+    page_count = len(pdf_doc)
+    pdf_doc.close()
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    page_idxs = list(range(page_count))
+
+    print(f"Rendering {page_count} pages at {dpi} DPI on {os.cpu_count()} CPUs")
+    baseline = None
+    for worker_count in [int(w) for w in workers.split(",")]:
+        # force_ocr skips pdftext, so only rendering is timed
+        provider = PdfProvider(
+            pdf_path,
+            {
+                "force_ocr": True,
+                "render_workers": worker_count,
+                "render_min_pages_per_worker": 1,
+            },
+        )
+        if worker_count > 1:
+            # Start the pool outside the timed region, it is reused across documents
+            list(get_render_executor(worker_count).map(int, range(worker_count * 2)))
+
+        start = time.time()
+        provider.get_images(page_idxs, dpi)
+        total = time.time() - start
+
+        pages_per_sec = page_count / total
+        if baseline is None:
+            baseline = pages_per_sec
+        print(
+            f"Workers: {worker_count}, time: {total:.2f}s, pages/sec: {pages_per_sec:.2f}, speedup: {pages_per_sec / baseline:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
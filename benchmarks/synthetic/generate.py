@@ -0,0 +1,162 @@
+import base64
+import io
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import List
+
+from PIL import Image, ImageDraw, ImageFont
+
+WORDS = (
+    "the of and model data results training method layer input output network performance "
+    "analysis table figure section value error rate sample feature learning approach system "
+    "function parameter experiment baseline accuracy robust adversarial gradient structure"
+).split()
+
+EQUATIONS = [
+    "E = mc²",
+    "∑ᵢ xᵢ² ≤ ‖x‖₂²",
+    "f(x) = ∫₀^∞ e^(−t x) dt",
+    "∇L(θ) = 𝔼[∂ℓ/∂θ]",
+    "P(A|B) = P(B|A) P(A) / P(B)",
+]
+
+# Words per page for each text density
+DENSITY_WORDS = {"low": 120, "medium": 300, "high": 550}
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # Letter size, in points
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """
+    Describes one synthetic document.  The same spec and seed always produce the same content.
+    """
+
+    name: str
+    pages: int = 10
+    density: str = "medium"
+    columns: int = 1
+    tables_per_page: int = 0
+    equations_per_page: int = 0
+    scanned_every: int = 0  # Every nth page is an image of text with no text layer, 0 for none
+    seed: int = 0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+DEFAULT_SPECS = [
+    SyntheticSpec(name="text", pages=10),
+    SyntheticSpec(name="dense_two_column", pages=10, density="high", columns=2),
+    SyntheticSpec(name="tables", pages=6, density="low", tables_per_page=2),
+    SyntheticSpec(name="equations", pages=6, equations_per_page=4),
+    SyntheticSpec(name="scanned", pages=6, density="low", scanned_every=2),
+]
+
+
+def sentence(rng: random.Random, length: int) -> str:
+    words = [rng.choice(WORDS) for _ in range(length)]
+    return " ".join(words).capitalize() + "."
+
+
+def paragraphs(rng: random.Random, word_count: int) -> List[str]:
+    result = []
+    while word_count > 0:
+        length = min(word_count, rng.randint(40, 90))
+        text = []
+        remaining = length
+        while remaining > 0:
+            sentence_length = min(remaining, rng.randint(8, 18))
+            text.append(sentence(rng, sentence_length))
+            remaining -= sentence_length
+        result.append(" ".join(text))
+        word_count -= length
+    return result
+
+
+def table_html(rng: random.Random) -> str:
+    cols = rng.randint(3, 5)
+    rows = rng.randint(3, 6)
+    header = "".join(f"<th>{rng.choice(WORDS).capitalize()}</th>" for _ in range(cols))
+    body = "".join(
+        "<tr>" + "".join(f"<td>{rng.uniform(0, 100):.2f}</td>" for _ in range(cols)) + "</tr>"
+        for _ in range(rows)
+    )
+    return f"<table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>"
+
+
+def load_font(size: int):
+    # Imported here, so the benchmark can set the torch device before marker loads its settings
+    from marker.settings import settings
+
+    if os.path.exists(settings.FONT_PATH):
+        return ImageFont.truetype(settings.FONT_PATH, size)
+    return ImageFont.load_default()
+
+
+def scanned_page_image(rng: random.Random, word_count: int, dpi: int = 150) -> Image.Image:
+    # A page of text drawn into an image, so it can only be recovered with OCR
+    scale = dpi / 72
+    image = Image.new("RGB", (int(PAGE_WIDTH * scale), int(PAGE_HEIGHT * scale)), "white")
+    draw = ImageDraw.Draw(image)
+    font = load_font(int(11 * scale))
+    margin = int(54 * scale)
+    line_height = int(16 * scale)
+    y = margin
+    for paragraph in paragraphs(rng, word_count):
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}".strip()
+            if draw.textlength(candidate, font=font) > image.width - 2 * margin:
+                draw.text((margin, y), line, fill="black", font=font)
+                y += line_height
+                line = word
+            else:
+                line = candidate
+        draw.text((margin, y), line, fill="black", font=font)
+        y += line_height * 2
+        if y > image.height - margin:
+            break
+    return image
+
+
+def page_html(spec: SyntheticSpec, page_idx: int, rng: random.Random) -> str:
+    word_count = DENSITY_WORDS[spec.density]
+    if spec.scanned_every and (page_idx + 1) % spec.scanned_every == 0:
+        buffer = io.BytesIO()
+        scanned_page_image(rng, word_count).save(buffer, format="PNG")
+        data = base64.b64encode(buffer.getvalue()).decode()
+        return f"<section class='scanned'><img src='data:image/png;base64,{data}'/></section>"
+
+    parts = [f"<h2>{sentence(rng, 4)[:-1]}</h2>"]
+    body = [f"<p>{p}</p>" for p in paragraphs(rng, word_count)]
+    for _ in range(spec.tables_per_page):
+        body.insert(rng.randint(0, len(body)), table_html(rng))
+    for _ in range(spec.equations_per_page):
+        body.insert(rng.randint(0, len(body)), f"<p class='equation'>{rng.choice(EQUATIONS)}</p>")
+    parts.append(f"<div class='body' style='column-count: {spec.columns}'>{''.join(body)}</div>")
+    return f"<section>{''.join(parts)}</section>"
+
+
+def document_html(spec: SyntheticSpec) -> str:
+    rng = random.Random(spec.seed)
+    pages = "".join(page_html(spec, i, rng) for i in range(spec.pages))
+    return f"""<html><head><style>
+    @page {{ size: {PAGE_WIDTH}pt {PAGE_HEIGHT}pt; margin: 54pt; }}
+    @page scanned {{ margin: 0; }}
+    body {{ font-size: 10pt; line-height: 1.3; }}
+    section {{ page-break-after: always; overflow: hidden; height: 684pt; }}
+    section.scanned {{ page: scanned; height: {PAGE_HEIGHT}pt; }}
+    section.scanned img {{ width: {PAGE_WIDTH}pt; height: {PAGE_HEIGHT}pt; }}
+    table {{ border-collapse: collapse; margin: 8pt 0; }}
+    td, th {{ border: 1px solid black; padding: 2pt 6pt; }}
+    .equation {{ text-align: center; font-style: italic; }}
+    </style></head><body>{pages}</body></html>"""
+
+
+def generate_pdf(spec: SyntheticSpec, output_path: str) -> str:
+    from weasyprint import HTML
+
+    HTML(string=document_html(spec)).write_pdf(output_path)
+    return output_path
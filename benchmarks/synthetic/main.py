@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+
+from benchmarks.synthetic.generate import DEFAULT_SPECS, generate_pdf
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    baseline_docs = {doc["spec"]["name"]: doc for doc in baseline["documents"]}
+    # Peak RSS only grows within a process, so memory is only comparable when the same documents ran in the same order
+    same_corpus = [doc["spec"] for doc in results["documents"]] == [doc["spec"] for doc in baseline["documents"]]
+    if same_corpus and "peak_rss_mb" in baseline:
+        if results["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(
+                f"peak RSS: {results['peak_rss_mb']:.1f} MB, baseline {baseline['peak_rss_mb']:.1f} MB"
+            )
+
+    for doc in results["documents"]:
+        name = doc["spec"]["name"]
+        base = baseline_docs.get(name)
+        if base is None or base["spec"] != doc["spec"]:
+            continue
+
+        if doc["pages_per_sec"] < base["pages_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {doc['pages_per_sec']:.2f} pages/sec, baseline {base['pages_per_sec']:.2f}"
+            )
+
+        # Small growth is mostly allocator noise
+        base_growth = base.get("peak_rss_growth_mb")
+        if same_corpus and base_growth is not None and base_growth >= 10:
+            if doc["peak_rss_growth_mb"] > base_growth * (1 + tolerance):
+                regressions.append(
+                    f"{name}: peak RSS grew {doc['peak_rss_growth_mb']:.1f} MB, baseline {base_growth:.1f} MB"
+                )
+
+        base_stages = {s["name"]: s for s in base["stages"]}
+        for stage in doc["stages"]:
+            base_stage = base_stages.get(stage["name"])
+            # Very short stages are too noisy to compare
+            if base_stage is None or base_stage["wall_time"] < 0.05:
+                continue
+            if stage["wall_time"] > base_stage["wall_time"] * (1 + tolerance):
+                regressions.append(
+                    f"{name}/{stage['name']}: {stage['wall_time']:.3f}s, baseline {base_stage['wall_time']:.3f}s"
+                )
+    return regressions
+
+
+@click.command(help="Benchmark conversion of a locally generated synthetic corpus, with a per-stage breakdown.")
+@click.option("--corpus_dir", default=os.path.join(tempfile.gettempdir(), "marker_synthetic"), help="Directory to write the generated PDFs to.")
+@click.option("--output_path", default=None, help="Path to write the JSON results to.  Printed if not set.")
+@click.option("--baseline", default=None, help="Results JSON from an earlier run to compare against.")
+@click.option("--tolerance", default=0.1, help="Fractional slowdown or memory growth versus the baseline that counts as a regression.")
+@click.option("--device", default="cpu", help="Torch device to run the models on.")
+@click.option("--docs", default=None, help="Comma separated list of synthetic document names to run.  Defaults to all.")
+@click.option("--repeats", default=1, help="Number of times to convert each document, the fastest run is kept.")
+def main(
+    corpus_dir: str,
+    output_path: str,
+    baseline: str,
+    tolerance: float,
+    device: str,
+    docs: str,
+    repeats: int,
+):
+    # Must be set before marker loads its settings
+    os.environ["TORCH_DEVICE"] = device
+
+    from marker.converters.pdf import PdfConverter
+    from marker.models import create_model_dict
+    from marker.utils.profile import peak_rss_bytes
+
+    specs = DEFAULT_SPECS
+    if docs:
+        names = docs.split(",")
+        specs = [spec for spec in specs if spec.name in names]
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    model_dict = create_model_dict()
+    model_rss = peak_rss_bytes()
+
+    documents = []
+    for spec in specs:
+        # Generated files are reused between runs, a changed spec gets a new file
+        spec_hash = hashlib.sha256(json.dumps(spec.to_dict(), sort_keys=True).encode()).hexdigest()[:12]
+        pdf_path = os.path.join(corpus_dir, f"{spec.name}_{spec_hash}.pdf")
+        if not os.path.exists(pdf_path):
+            generate_pdf(spec, pdf_path)
+
+        best = None
+        rss_start = peak_rss_bytes()
+        for _ in range(repeats):
+            converter = PdfConverter(
+                artifact_dict=model_dict,
+                config={"profile_stages": True, "disable_tqdm": True},
+            )
+            start = time.perf_counter()
+            rendered = converter(pdf_path)
+            total = time.perf_counter() - start
+            if best is None or total < best[0]:
+                best = (total, rendered, converter.page_count)
+
+        total, rendered, page_count = best
+        profile = rendered.metadata["pipeline_profile"]
+        documents.append(
+            {
+                "spec": spec.to_dict(),
+                "pages": page_count,
+                "total_time": round(total, 4),
+                "pages_per_sec": round(page_count / total, 4),
+                # How far this document pushed the process peak, earlier documents and the models are excluded
+                "peak_rss_growth_mb": round((peak_rss_bytes() - rss_start) / 1024**2, 1),
+                "stages": profile["stages"],
+            }
+        )
+        print(f"{spec.name}: {page_count} pages in {total:.2f}s", file=sys.stderr)
+
+    results = {
+        "commit": git_commit(),
+        "device": device,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "model_peak_rss_mb": round(model_rss / 1024**2, 1),
+        "peak_rss_mb": round(peak_rss_bytes() / 1024**2, 1),
+        "documents": documents,
+    }
+
+    output = json.dumps(results, indent=2)
+    if output_path:
+        with open(output_path, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if baseline:
+        with open(baseline) as f:
+            regressions = compare(results, json.load(f), tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,16 @@
-from typing import Annotated
+from typing import Annotated, List
 
 from marker.builders import BaseBuilder
 from marker.builders.layout import LayoutBuilder
 from marker.builders.line import LineBuilder
 from marker.builders.ocr import OcrBuilder
+from marker.providers import PageImageSource
 from marker.providers.pdf import PdfProvider
 from marker.schema import BlockTypes
 from marker.schema.document import Document
 from marker.schema.groups.page import PageGroup
 from marker.schema.registry import get_block_class
+from marker.utils.profile import profile_stage
 
 
 class DocumentBuilder(BaseBuilder):
@@ -27,27 +29,55 @@ class DocumentBuilder(BaseBuilder):
         bool,
         "Disable OCR processing.",
     ] = False
+    lazy_page_images: Annotated[
+        bool,
+        "Render page images on first use through a shared LRU cache, instead of rendering every page upfront.",
+    ] = True
 
-    def __call__(self, provider: PdfProvider, layout_builder: LayoutBuilder, line_builder: LineBuilder, ocr_builder: OcrBuilder):
-        document = self.build_document(provider)
-        layout_builder(document, provider)
-        line_builder(document, provider)
+    def __call__(self, provider: PdfProvider, layout_builder: LayoutBuilder, line_builder: LineBuilder, ocr_builder: OcrBuilder, page_range: List[int] | None = None):
+        page_ids = list(provider.page_range if page_range is None else page_range)
+        with profile_stage("DocumentBuilder", page_ids):
+            document = self.build_document(provider, page_range)
+        with profile_stage("LayoutBuilder", page_ids):
+            layout_builder(document, provider)
+        with profile_stage("LineBuilder", page_ids):
+            line_builder(document, provider)
         if not self.disable_ocr:
-            ocr_builder(document, provider)
+            with profile_stage("OcrBuilder", page_ids):
+                ocr_builder(document, provider)
         return document
 
-    def build_document(self, provider: PdfProvider):
+    def build_document(self, provider: PdfProvider, page_range: List[int] | None = None):
+        # Allows building a subset of the provider pages, used for windowed conversion
+        if page_range is None:
+            page_range = provider.page_range
+
         PageGroupClass: PageGroup = get_block_class(BlockTypes.Page)
-        lowres_images = provider.get_images(provider.page_range, self.lowres_image_dpi)
-        highres_images = provider.get_images(provider.page_range, self.highres_image_dpi)
         initial_pages = [
             PageGroupClass(
                 page_id=p,
-                lowres_image=lowres_images[i],
-                highres_image=highres_images[i],
                 polygon=provider.get_page_bbox(p),
                 refs=provider.get_page_refs(p)
-            ) for i, p in enumerate(provider.page_range)
+            ) for p in page_range
         ]
+
+        self.attach_page_images(initial_pages, provider)
+
         DocumentClass: Document = get_block_class(BlockTypes.Document)
-        return DocumentClass(filepath=provider.filepath, pages=initial_pages)
+        document = DocumentClass(filepath=provider.filename, pages=initial_pages)
+        document.set_source(provider.filepath)
+        return document
+
+    def attach_page_images(self, pages: List[PageGroup], provider: PdfProvider):
+        if self.lazy_page_images:
+            image_source = PageImageSource(provider, self.lowres_image_dpi, self.highres_image_dpi)
+            for page in pages:
+                page.set_image_source(image_source)
+            return
+
+        page_ids = [page.page_id for page in pages]
+        lowres_images = provider.get_images(page_ids, self.lowres_image_dpi)
+        highres_images = provider.get_images(page_ids, self.highres_image_dpi)
+        for page, lowres_image, highres_image in zip(pages, lowres_images, highres_images):
+            page.lowres_image = lowres_image
+            page.highres_image = highres_image
@@ -0,0 +1,329 @@
+"""
+A layout engine for born-digital PDFs that works from the text layer instead of the page image.  Lines are grouped
+into the text blocks pdftext found, labelled with font size and position heuristics, and put in reading order by
+splitting the page into columns.  Each page gets a confidence, so pages the heuristics can't handle, like ones with
+figures or equations, can be sent to the layout model instead.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from surya.layout.schema import LayoutBox, LayoutResult
+
+from marker.providers import ProviderOutput
+from marker.utils import geometry
+
+BULLET_PATTERN = re.compile(r"^\s*(?:[•●▪◦‣∙·\-–*]|\(?\d{1,3}[.)]|\(?[a-zA-Z][.)])\s+")
+MATH_CHARS = set("∑∫∏√∞≤≥≈≠±∂∇∈∉⊂⊆∪∩→⇒⇔αβγδεθλμπσφψω")
+
+
+@dataclass
+class TextBlock:
+    lines: List[ProviderOutput]
+    label: str = "Text"
+    column: int = 0  # -1 for blocks that span columns
+
+    @property
+    def bbox(self) -> List[float]:
+        bboxes = geometry.bboxes_array([line.line.polygon for line in self.lines])
+        return [*bboxes[:, :2].min(axis=0).tolist(), *bboxes[:, 2:].max(axis=0).tolist()]
+
+    @property
+    def text(self) -> str:
+        return " ".join(line.raw_text for line in self.lines).strip()
+
+    @property
+    def font_size(self) -> float:
+        return weighted_font_size([span for line in self.lines for span in line.spans])
+
+    @property
+    def bold(self) -> bool:
+        spans = [span for line in self.lines for span in line.spans if span.text.strip()]
+        return len(spans) > 0 and all(span.bold for span in spans)
+
+
+def weighted_font_size(spans) -> float:
+    # The font size covering the most characters
+    sizes = {}
+    for span in spans:
+        size = round(span.font_size, 1)
+        sizes[size] = sizes.get(size, 0) + len(span.text.strip())
+    if not sizes:
+        return 0
+    return max(sizes, key=sizes.get)
+
+
+class FastLayoutEngine:
+    def __init__(
+        self,
+        header_font_ratio: float = 1.15,
+        margin_frac: float = 0.06,
+        min_table_rows: int = 3,
+        min_table_columns: int = 3,
+        figure_gap_frac: float = 0.2,
+    ):
+        self.header_font_ratio = header_font_ratio
+        self.margin_frac = margin_frac
+        self.min_table_rows = min_table_rows
+        self.min_table_columns = min_table_columns
+        self.figure_gap_frac = figure_gap_frac
+
+    def __call__(
+        self, page_lines: List[List[ProviderOutput]], page_bboxes: List[Sequence[float]]
+    ) -> Tuple[List[LayoutResult], List[float]]:
+        """
+        Lay out each page from its provider lines.  Returns the layout results, in page coordinates, and a confidence
+        between 0 and 1 for every page.
+        """
+        # Headers are relative to the body text of the whole document, not just the page
+        body_size = weighted_font_size(
+            [span for lines in page_lines for line in lines for span in line.spans]
+        )
+
+        results, confidences = [], []
+        for lines, page_bbox in zip(page_lines, page_bboxes):
+            blocks, confidence = self.layout_page(lines, page_bbox, body_size)
+            results.append(
+                LayoutResult(
+                    image_bbox=list(page_bbox),
+                    bboxes=[
+                        LayoutBox(
+                            label=block.label,
+                            position=position,
+                            top_k={block.label: confidence},
+                            polygon=[
+                                [block.bbox[0], block.bbox[1]],
+                                [block.bbox[2], block.bbox[1]],
+                                [block.bbox[2], block.bbox[3]],
+                                [block.bbox[0], block.bbox[3]],
+                            ],
+                        )
+                        for position, block in enumerate(blocks)
+                    ],
+                    sliced=False,
+                )
+            )
+            confidences.append(confidence)
+        return results, confidences
+
+    def layout_page(
+        self, lines: List[ProviderOutput], page_bbox: Sequence[float], body_size: float
+    ) -> Tuple[List[TextBlock], float]:
+        if len(lines) == 0:
+            return [], 0
+
+        tables, lines = self.find_tables(lines)
+        blocks = self.group_blocks(lines)
+        for block in blocks:
+            block.label = self.label_block(block, page_bbox, body_size)
+
+        gutters = self.find_gutters(blocks)
+        blocks = self.reading_order(blocks + tables, gutters)
+        return blocks, self.confidence(blocks, tables, gutters, page_bbox)
+
+    def group_blocks(self, lines: List[ProviderOutput]) -> List[TextBlock]:
+        # Consecutive lines from the same pdftext block stay together
+        blocks: List[TextBlock] = []
+        for line in lines:
+            if blocks and self.same_block(blocks[-1].lines[-1], line):
+                blocks[-1].lines.append(line)
+            else:
+                blocks.append(TextBlock(lines=[line]))
+        return blocks
+
+    @staticmethod
+    def same_block(previous: ProviderOutput, line: ProviderOutput) -> bool:
+        if previous.block_idx is not None and line.block_idx is not None:
+            return previous.block_idx == line.block_idx
+
+        prev_bbox, bbox = previous.line.polygon.bbox, line.line.polygon.bbox
+        height = max(prev_bbox[3] - prev_bbox[1], 1)
+        x_overlap = min(prev_bbox[2], bbox[2]) - max(prev_bbox[0], bbox[0])
+        return 0 <= bbox[1] - prev_bbox[3] < 0.8 * height and x_overlap > 0
+
+    def label_block(self, block: TextBlock, page_bbox: Sequence[float], body_size: float) -> str:
+        x0, y0, x1, y1 = block.bbox
+        page_height = page_bbox[3] - page_bbox[1]
+        text = block.text
+        font_size = block.font_size
+
+        if len(text) < 100 and y1 <= page_bbox[1] + self.margin_frac * page_height:
+            return "PageHeader"
+        if len(text) < 100 and y0 >= page_bbox[3] - self.margin_frac * page_height:
+            return "PageFooter"
+
+        short = len(block.lines) <= 3 and len(text) < 150
+        if short and body_size > 0 and font_size >= body_size * self.header_font_ratio:
+            return "SectionHeader"
+        if len(block.lines) == 1 and block.bold and len(text) < 100 and not text.endswith((".", ":")):
+            return "SectionHeader"
+
+        if BULLET_PATTERN.match(text):
+            return "ListItem"
+        if body_size > 0 and font_size < body_size * 0.85 and y0 >= page_bbox[1] + 0.6 * page_height:
+            return "Footnote"
+        return "Text"
+
+    def find_tables(self, lines: List[ProviderOutput]) -> Tuple[List[TextBlock], List[ProviderOutput]]:
+        """
+        Find tables from whitespace.  Rows are lines at the same height, split into cells at wide gaps.  Runs of
+        rows with several short cells become tables, and their lines are taken out of the text.
+        """
+        rows: List[List[ProviderOutput]] = []
+        for line in sorted(lines, key=lambda l: (l.line.polygon.bbox[1] + l.line.polygon.bbox[3]) / 2):
+            bbox = line.line.polygon.bbox
+            center = (bbox[1] + bbox[3]) / 2
+            if rows:
+                row_bbox = rows[-1][0].line.polygon.bbox
+                if abs(center - (row_bbox[1] + row_bbox[3]) / 2) < 0.5 * max(row_bbox[3] - row_bbox[1], 1):
+                    rows[-1].append(line)
+                    continue
+            rows.append([line])
+
+        tabular = [self.row_cells(row) >= self.min_table_columns for row in rows]
+        tables: List[TextBlock] = []
+        table_lines = set()
+        start = 0
+        while start < len(rows):
+            end = start
+            while end < len(rows) and tabular[end]:
+                end += 1
+            if end - start >= self.min_table_rows:
+                run = [line for row in rows[start:end] for line in row]
+                cell_lengths = [len(span.text.strip()) for line in run for span in line.spans if span.text.strip()]
+                # Lines in columns of text are long, table cells are short
+                if np.median(cell_lengths) <= 30:
+                    tables.append(TextBlock(lines=run, label="Table"))
+                    table_lines.update(id(line) for line in run)
+            start = max(end, start + 1)
+
+        return tables, [line for line in lines if id(line) not in table_lines]
+
+    @staticmethod
+    def row_cells(row: List[ProviderOutput]) -> int:
+        # Spans closer than a couple of characters belong to the same cell
+        spans = sorted(
+            (span for line in row for span in line.spans if span.text.strip()),
+            key=lambda s: s.polygon.bbox[0],
+        )
+        if not spans:
+            return 0
+
+        cells = 1
+        right = spans[0].polygon.bbox[2]
+        for span in spans[1:]:
+            if span.polygon.bbox[0] - right > 1.5 * max(span.font_size, 1):
+                cells += 1
+            right = max(right, span.polygon.bbox[2])
+        return cells
+
+    @staticmethod
+    def find_gutters(blocks: List[TextBlock]) -> List[Tuple[float, float]]:
+        """
+        The empty vertical strips between columns of body text.
+        """
+        body = [b for b in blocks if b.label not in ("PageHeader", "PageFooter")]
+        if len(body) < 2:
+            return []
+
+        bboxes = np.array([b.bbox for b in body])
+        left, right = bboxes[:, 0].min(), bboxes[:, 2].max()
+        content_width = right - left
+        # Blocks that span the whole width, like titles, would hide the gutters
+        narrow = bboxes[(bboxes[:, 2] - bboxes[:, 0]) < 0.6 * content_width]
+        if len(narrow) < 2:
+            return []
+
+        covered = np.zeros(int(np.ceil(content_width)) + 1, dtype=bool)
+        for x0, _, x1, _ in narrow:
+            covered[int(x0 - left) : int(np.ceil(x1 - left)) + 1] = True
+
+        gutters = []
+        start = None
+        for x, filled in enumerate(covered):
+            if not filled and start is None:
+                start = x
+            elif filled and start is not None:
+                if x - start >= 8:
+                    gutters.append((left + start, left + x))
+                start = None
+        return gutters
+
+    @staticmethod
+    def reading_order(blocks: List[TextBlock], gutters: List[Tuple[float, float]]) -> List[TextBlock]:
+        headers = sorted((b for b in blocks if b.label == "PageHeader"), key=lambda b: b.bbox[1])
+        footers = sorted((b for b in blocks if b.label == "PageFooter"), key=lambda b: b.bbox[1])
+        body = sorted(
+            (b for b in blocks if b.label not in ("PageHeader", "PageFooter")),
+            key=lambda b: b.bbox[1],
+        )
+
+        for block in body:
+            x0, _, x1, _ = block.bbox
+            if any(x0 < g_start and x1 > g_end for g_start, g_end in gutters):
+                block.column = -1
+            else:
+                center = (x0 + x1) / 2
+                block.column = sum(1 for _, g_end in gutters if center >= g_end)
+
+        # Blocks that span columns split the page into bands, each band is read column by column
+        ordered, band = [], []
+        for block in body:
+            if block.column == -1:
+                ordered.extend(sorted(band, key=lambda b: (b.column, b.bbox[1])))
+                ordered.append(block)
+                band = []
+            else:
+                band.append(block)
+        ordered.extend(sorted(band, key=lambda b: (b.column, b.bbox[1])))
+        return headers + ordered + footers
+
+    def confidence(
+        self,
+        blocks: List[TextBlock],
+        tables: List[TextBlock],
+        gutters: List[Tuple[float, float]],
+        page_bbox: Sequence[float],
+    ) -> float:
+        confidence = 1.0
+        page_width = page_bbox[2] - page_bbox[0]
+        page_height = page_bbox[3] - page_bbox[1]
+        lines = [line for block in blocks for line in block.lines]
+        if len(lines) < 3:
+            confidence *= 0.5
+
+        # Equations are not in the text layer as text
+        text = "".join(line.raw_text for line in lines)
+        if text and sum(c in MATH_CHARS for c in text) / len(text) > 0.01:
+            confidence *= 0.4
+
+        # Large empty areas between blocks in a column usually hold figures
+        body = [b for b in blocks if b.label not in ("PageHeader", "PageFooter")]
+        for column in {b.column for b in body}:
+            column_blocks = sorted((b for b in body if b.column in (column, -1)), key=lambda b: b.bbox[1])
+            gaps = [
+                below.bbox[1] - above.bbox[3]
+                for above, below in zip(column_blocks, column_blocks[1:])
+            ]
+            if gaps and max(gaps) > self.figure_gap_frac * page_height:
+                confidence *= 0.5
+                break
+
+        bboxes = np.array([b.bbox for b in body]) if body else np.zeros((0, 4))
+        text_area = float(((bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1])).sum())
+        if text_area < 0.15 * page_width * page_height:
+            confidence *= 0.6
+
+        if len(bboxes) > 1:
+            overlap = geometry.intersection_pct(bboxes, bboxes)
+            np.fill_diagonal(overlap, 0)
+            if overlap.max() > 0.2:
+                confidence *= 0.6
+
+        if tables:
+            confidence *= 0.9
+        if len(gutters) >= 3:
+            confidence *= 0.7
+        return confidence
@@ -1,9 +1,12 @@
-from typing import Annotated, List
+from typing import Annotated, List, Set, Tuple
+
+import numpy as np
 
 from surya.layout import LayoutPredictor
 from surya.layout.schema import LayoutResult, LayoutBox
 
 from marker.builders import BaseBuilder
+from marker.builders.fast_layout import FastLayoutEngine
 from marker.providers.pdf import PdfProvider
 from marker.schema import BlockTypes
 from marker.schema.document import Document
@@ -11,6 +14,7 @@ from marker.schema.groups.page import PageGroup
 from marker.schema.polygon import PolygonBox
 from marker.schema.registry import get_block_class
 from marker.settings import settings
+from marker.utils import geometry
 
 
 class LayoutBuilder(BaseBuilder):
@@ -42,6 +46,19 @@ class LayoutBuilder(BaseBuilder):
     max_expand_frac: Annotated[
         float, "The maximum fraction to expand the layout box bounds by"
     ] = 0.05
+    fast_layout: Annotated[
+        bool,
+        "Lay out pages from the PDF text layer with heuristics, instead of the layout model.",
+        "Pages where the heuristics have low confidence, or that have no text layer, still use the layout model.",
+    ] = False
+    fast_layout_min_confidence: Annotated[
+        float,
+        "The minimum heuristic confidence for a page to skip the layout model with `fast_layout`.",
+    ] = 0.75
+    fast_layout_header_ratio: Annotated[
+        float,
+        "How much larger than the body text a short block's font must be to count as a section header with `fast_layout`.",
+    ] = 1.15
 
     def __init__(self, layout_model: LayoutPredictor, config=None):
         self.layout_model = layout_model
@@ -49,14 +66,22 @@ class LayoutBuilder(BaseBuilder):
         super().__init__(config)
 
     def __call__(self, document: Document, provider: PdfProvider):
+        heuristic_page_ids = set()
         if self.force_layout_block is not None:
             # Assign the full content of every page to a single layout type
             layout_results = self.forced_layout(document.pages)
+        elif self.fast_layout:
+            layout_results, heuristic_page_ids = self.heuristic_layout(document.pages, provider)
         else:
             layout_results = self.surya_layout(document.pages)
         self.add_blocks_to_pages(document.pages, layout_results)
         self.expand_layout_blocks(document)
 
+        for page in document.pages:
+            if page.page_id in heuristic_page_ids:
+                for block in page.structure_blocks(document):
+                    block.source = "heuristics"
+
     def get_batch_size(self):
         if self.layout_batch_size is not None:
             return self.layout_batch_size
@@ -83,50 +108,82 @@ class LayoutBuilder(BaseBuilder):
             )
         return layout_results
 
+    def heuristic_layout(
+        self, pages: List[PageGroup], provider: PdfProvider
+    ) -> Tuple[List[LayoutResult], Set[int]]:
+        """
+        Lay out pages from their text lines, and run the layout model only on the pages the heuristics can't handle.
+        Returns the layout results and the ids of the pages laid out by the heuristics.
+        """
+        engine = FastLayoutEngine(header_font_ratio=self.fast_layout_header_ratio)
+        layout_results, confidences = engine(
+            [provider.page_lines.get(page.page_id, []) for page in pages],
+            [page.polygon.bbox for page in pages],
+        )
+
+        model_pages = [
+            i for i, confidence in enumerate(confidences)
+            if confidence < self.fast_layout_min_confidence
+        ]
+        if model_pages:
+            model_results = self.surya_layout([pages[i] for i in model_pages])
+            for i, result in zip(model_pages, model_results):
+                layout_results[i] = result
+
+        heuristic_page_ids = {page.page_id for page in pages} - {pages[i].page_id for i in model_pages}
+        return layout_results, heuristic_page_ids
+
     def surya_layout(self, pages: List[PageGroup]) -> List[LayoutResult]:
         self.layout_model.disable_tqdm = self.disable_tqdm
-        layout_results = self.layout_model(
-            [p.get_image(highres=False) for p in pages],
-            batch_size=int(self.get_batch_size()),
-        )
+        layout_results = []
+        # Only one chunk of page images is rendered and held at a time
+        for chunk in PageGroup.image_chunks(pages, highres=False):
+            layout_results.extend(
+                self.layout_model(
+                    PageGroup.get_images(chunk, highres=False),
+                    batch_size=int(self.get_batch_size()),
+                )
+            )
         return layout_results
 
     def expand_layout_blocks(self, document: Document):
         for page in document.pages:
-            # Collect all blocks on this page as PolygonBox for easy access
             page_blocks = [document.get_block(bid) for bid in page.structure]
+            if not page_blocks:
+                continue
             page_size = page.polygon.size
-
-            for block_id in page.structure:
-                block = document.get_block(block_id)
-                if block.block_type in self.expand_block_types:
-                    other_blocks = [b for b in page_blocks if b != block]
-                    if not other_blocks:
-                        block.polygon = block.polygon.expand(
-                            self.max_expand_frac, self.max_expand_frac
-                        ).fit_to_bounds((0, 0, *page_size))
-                        continue
-
-                    min_gap = min(
-                        block.polygon.minimum_gap(other.polygon)
-                        for other in other_blocks
-                    )
+            page_bounds = (0, 0, *page_size)
+            # Boxes are updated as blocks expand, so later blocks see the new bounds
+            bboxes = geometry.bboxes_array([b.polygon for b in page_blocks])
+
+            for idx, block in enumerate(page_blocks):
+                if block.block_type not in self.expand_block_types:
+                    continue
+
+                if len(page_blocks) == 1:
+                    x_expand_frac = y_expand_frac = self.max_expand_frac
+                else:
+                    gaps = geometry.minimum_gap(bboxes[idx : idx + 1], bboxes)[0]
+                    gaps[idx] = np.inf
+                    min_gap = gaps.min()
                     if min_gap <= 0:
                         continue
 
-                    x_expand_frac = (
-                        min_gap / block.polygon.width if block.polygon.width > 0 else 0
+                    width, height = bboxes[idx, 2:] - bboxes[idx, :2]
+                    x_expand_frac = min(
+                        self.max_expand_frac, min_gap / width if width > 0 else 0
                     )
-                    y_expand_frac = (
-                        min_gap / block.polygon.height
-                        if block.polygon.height > 0
-                        else 0
+                    y_expand_frac = min(
+                        self.max_expand_frac, min_gap / height if height > 0 else 0
                     )
 
-                    block.polygon = block.polygon.expand(
-                        min(self.max_expand_frac, x_expand_frac),
-                        min(self.max_expand_frac, y_expand_frac),
-                    ).fit_to_bounds((0, 0, *page_size))
+                corners = geometry.corners_array([block.polygon])
+                corners = geometry.fit_to_bounds(
+                    geometry.expand(corners, x_expand_frac, y_expand_frac),
+                    page_bounds,
+                )
+                block.polygon = geometry.to_polygons(corners)[0]
+                bboxes[idx] = geometry.corners_to_bboxes(corners)[0]
 
     def add_blocks_to_pages(
         self, pages: List[PageGroup], layout_results: List[LayoutResult]
@@ -137,14 +194,22 @@ class LayoutBuilder(BaseBuilder):
             page.layout_sliced = (
                 layout_result.sliced
             )  # This indicates if the page was sliced by the layout model
-            for bbox in sorted(layout_result.bboxes, key=lambda x: x.position):
-                block_cls = get_block_class(BlockTypes[bbox.label])
-                layout_block = page.add_block(
-                    block_cls, PolygonBox(polygon=bbox.polygon)
+            layout_bboxes = sorted(layout_result.bboxes, key=lambda x: x.position)
+            polygons = geometry.to_polygons(
+                geometry.fit_to_bounds(
+                    geometry.rescale(
+                        geometry.corners_array(
+                            [PolygonBox(polygon=bbox.polygon) for bbox in layout_bboxes]
+                        ),
+                        layout_page_size,
+                        provider_page_size,
+                    ),
+                    (0, 0, *provider_page_size),
                 )
-                layout_block.polygon = layout_block.polygon.rescale(
-                    layout_page_size, provider_page_size
-                ).fit_to_bounds((0, 0, *provider_page_size))
+            )
+            for bbox, polygon in zip(layout_bboxes, polygons):
+                block_cls = get_block_class(BlockTypes[bbox.label])
+                layout_block = page.add_block(block_cls, polygon)
                 layout_block.top_k = {
                     BlockTypes[label]: prob
                     for (label, prob) in bbox.top_k.items()
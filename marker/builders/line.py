@@ -1,8 +1,6 @@
-from copy import deepcopy
 from typing import Annotated, List, Tuple
 
 import numpy as np
-from PIL import Image
 import cv2
 
 from surya.detection import DetectionPredictor
@@ -19,6 +17,7 @@ from marker.schema.registry import get_block_class
 from marker.schema.text.line import Line
 from marker.settings import settings
 from marker.util import matrix_intersection_area, sort_text_lines
+from marker.utils import geometry
 from marker.utils.image import is_blank_image
 
 
@@ -114,12 +113,21 @@ class LineBuilder(BaseBuilder):
         return 4
 
     def get_detection_results(
-        self, page_images: List[Image.Image], run_detection: List[bool]
+        self, pages: List[PageGroup], run_detection: List[bool]
     ):
         self.detection_model.disable_tqdm = self.disable_tqdm
-        page_detection_results = self.detection_model(
-            images=page_images, batch_size=self.get_detection_batch_size()
-        )
+        detect_pages = [page for page, bad in zip(pages, run_detection) if bad]
+        page_detection_results = []
+        # Only one chunk of page images is rendered and held at a time
+        for chunk in PageGroup.image_chunks(detect_pages, highres=False):
+            page_images = PageGroup.get_images(
+                chunk, highres=False, remove_blocks=self.ocr_remove_blocks
+            )
+            page_detection_results.extend(
+                self.detection_model(
+                    images=page_images, batch_size=self.get_detection_batch_size()
+                )
+            )
 
         assert len(page_detection_results) == sum(run_detection)
         detection_results = []
@@ -130,7 +138,7 @@ class LineBuilder(BaseBuilder):
                 idx += 1
             else:
                 detection_results.append(None)
-        assert idx == len(page_images)
+        assert idx == len(detect_pages)
 
         assert len(run_detection) == len(detection_results)
         return detection_results
@@ -169,15 +177,10 @@ class LineBuilder(BaseBuilder):
             layout_good.append(provider_lines_good)
 
         run_detection = [not good for good in layout_good]
-        page_images = [
-            page.get_image(highres=False, remove_blocks=self.ocr_remove_blocks)
-            for page, bad in zip(document.pages, run_detection)
-            if bad
-        ]
 
-        # Note: run_detection is longer than page_images, since it has a value for each page, not just good ones
+        # Note: run_detection has a value for each page, not just the ones that need detection
         # Detection results and inline detection results are for every page (we use run_detection to make the list full length)
-        detection_results = self.get_detection_results(page_images, run_detection)
+        detection_results = self.get_detection_results(document.pages, run_detection)
 
         assert len(detection_results) == len(layout_good) == len(document.pages)
         for document_page, detection_result, provider_lines_good in zip(
@@ -212,7 +215,7 @@ class LineBuilder(BaseBuilder):
         ocr_lines = {document_page.page_id: [] for document_page in document.pages}
         for page_id, page_ocr_boxes in boxes_to_ocr.items():
             page_size = provider.get_page_bbox(page_id).size
-            image_size = document.get_page(page_id).get_image(highres=False).size
+            image_size = document.get_page(page_id).get_image_size(highres=False)
             for box_to_ocr in page_ocr_boxes:
                 line_polygon = PolygonBox(polygon=box_to_ocr.polygon).rescale(
                     image_size, page_size
@@ -331,13 +334,17 @@ class LineBuilder(BaseBuilder):
         page_image = page.get_image()
         image_size = page_image.size
 
-        good_lines = []
-        for line in lines:
-            line_polygon_rescaled = deepcopy(line.line.polygon).rescale(
-                page_size, image_size
-            )
-            line_bbox = line_polygon_rescaled.fit_to_bounds((0, 0, *image_size)).bbox
+        line_bboxes = geometry.fit_to_bounds(
+            geometry.rescale(
+                geometry.bboxes_array([line.line.polygon for line in lines]),
+                page_size,
+                image_size,
+            ),
+            (0, 0, *image_size),
+        )
 
+        good_lines = []
+        for line, line_bbox in zip(lines, line_bboxes.tolist()):
             if not is_blank_image(page_image.crop(line_bbox)):
                 good_lines.append(line)
 
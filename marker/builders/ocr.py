@@ -20,6 +20,7 @@ from marker.schema.text.span import Span
 from marker.settings import settings
 from marker.schema.polygon import PolygonBox
 from marker.util import get_opening_tag_type, get_closing_tag_type
+from marker.utils import geometry
 
 
 class OcrBuilder(BaseBuilder):
@@ -81,17 +82,19 @@ class OcrBuilder(BaseBuilder):
 
     def __call__(self, document: Document, provider: PdfProvider):
         pages_to_ocr = [page for page in document.pages if page.text_extraction_method == 'surya']
-        ocr_page_images, block_polygons, block_ids, block_original_texts = (
-            self.get_ocr_images_polygons_ids(document, pages_to_ocr, provider)
-        )
-        self.ocr_extraction(
-            document,
-            pages_to_ocr,
-            ocr_page_images,
-            block_polygons,
-            block_ids,
-            block_original_texts,
-        )
+        # Only one chunk of highres page images is rendered and held at a time
+        for chunk in PageGroup.image_chunks(pages_to_ocr, highres=True):
+            ocr_page_images, block_polygons, block_ids, block_original_texts = (
+                self.get_ocr_images_polygons_ids(document, chunk, provider)
+            )
+            self.ocr_extraction(
+                document,
+                chunk,
+                ocr_page_images,
+                block_polygons,
+                block_ids,
+                block_original_texts,
+            )
 
     def get_recognition_batch_size(self):
         if self.recognition_batch_size is not None:
@@ -121,8 +124,8 @@ class OcrBuilder(BaseBuilder):
         self, document: Document, pages: List[PageGroup], provider: PdfProvider
     ):
         highres_images, highres_polys, block_ids, block_original_texts = [], [], [], []
-        for document_page in pages:
-            page_highres_image = document_page.get_image(highres=True)
+        page_images = PageGroup.get_images(pages, highres=True)
+        for document_page, page_highres_image in zip(pages, page_images):
             page_highres_polys = []
             page_block_ids = []
             page_block_original_texts = []
@@ -130,30 +133,30 @@ class OcrBuilder(BaseBuilder):
             page_size = provider.get_page_bbox(document_page.page_id).size
             image_size = page_highres_image.size
             max_intersection_pct = document_page.compute_max_structure_block_intersection_pct()
+            page_blocks_to_ocr = []
             for block in document_page.structure_blocks(document):
                 if block.block_type in self.skip_ocr_blocks:
                     # Skip OCR
                     continue
 
                 block_lines = block.contained_blocks(document, [BlockTypes.Line])
-                blocks_to_ocr = self.select_ocr_blocks_by_mode(document_page, block, block_lines, max_intersection_pct)
-
                 block.text_extraction_method = "surya"
-                for block in blocks_to_ocr:
-                    # Fit the polygon to image bounds since PIL image crop expands by default which might create bad images for the OCR model.
-                    block_polygon_rescaled = (
-                        copy.deepcopy(block.polygon)
-                        .rescale(page_size, image_size)
-                        .fit_to_bounds((0, 0, *image_size))
-                    )
-                    block_bbox_rescaled = block_polygon_rescaled.polygon
-                    block_bbox_rescaled = [
-                        [int(x) for x in point] for point in block_bbox_rescaled
-                    ]
-
-                    page_highres_polys.append(block_bbox_rescaled)
-                    page_block_ids.append(block.id)
-                    page_block_original_texts.append("")
+                page_blocks_to_ocr.extend(
+                    self.select_ocr_blocks_by_mode(document_page, block, block_lines, max_intersection_pct)
+                )
+
+            # Fit the polygons to image bounds since PIL image crop expands by default which might create bad images for the OCR model.
+            polygons_rescaled = geometry.fit_to_bounds(
+                geometry.rescale(
+                    geometry.corners_array([b.polygon for b in page_blocks_to_ocr]),
+                    page_size,
+                    image_size,
+                ),
+                (0, 0, *image_size),
+            )
+            page_highres_polys.extend(polygons_rescaled.astype(int).tolist())
+            page_block_ids.extend(b.id for b in page_blocks_to_ocr)
+            page_block_original_texts.extend("" for _ in page_blocks_to_ocr)
 
             highres_images.append(page_highres_image)
             highres_polys.append(page_highres_polys)
@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Dict
+from typing import Dict, List
 
 import click
 
@@ -16,6 +16,13 @@ from marker.util import classes_to_strings, parse_range_str, strings_to_classes
 
 logger = get_logger()
 
+OUTPUT_FORMAT_RENDERERS = {
+    "markdown": MarkdownRenderer,
+    "json": JSONRenderer,
+    "html": HTMLRenderer,
+    "chunks": ChunkRenderer,
+}
+
 
 class ConfigParser:
     def __init__(self, cli_options: dict):
@@ -33,9 +40,9 @@ class ConfigParser:
         fn = click.option("--debug", "-d", is_flag=True, help="Enable debug mode.")(fn)
         fn = click.option(
             "--output_format",
-            type=click.Choice(["markdown", "json", "html", "chunks"]),
+            type=str,
             default="markdown",
-            help="Format to output results in.",
+            help="Format to output results in, one of markdown, json, html, chunks.  Comma separate several formats, or use 'all', to render them from a single conversion.",
         )(fn)
         fn = click.option(
             "--processors",
@@ -111,6 +118,7 @@ class ConfigParser:
                         config.update(json.load(f))
                 case "disable_multiprocessing":
                     config["pdftext_workers"] = 1
+                    config["render_workers"] = 1
                 case "disable_image_extraction":
                     config["extract_images"] = False
                 case "keep_page_headers_footers":
@@ -137,19 +145,32 @@ class ConfigParser:
             service_cls = "marker.services.gemini.GoogleGeminiService"
         return service_cls
 
+    def get_output_formats(self) -> List[str]:
+        output_format = self.cli_options.get("output_format") or "markdown"
+        if isinstance(output_format, str):
+            output_format = output_format.split(",")
+
+        formats = []
+        for f in output_format:
+            f = str(getattr(f, "value", f)).strip()
+            if f == "all":
+                formats.extend(OUTPUT_FORMAT_RENDERERS.keys())
+            elif f in OUTPUT_FORMAT_RENDERERS:
+                formats.append(f)
+            else:
+                raise ValueError(f"Invalid output format: {f}")
+
+        # Keep the order the formats were requested in, without duplicates
+        return list(dict.fromkeys(formats))
+
+    def get_renderers(self) -> List[str]:
+        return classes_to_strings(
+            [OUTPUT_FORMAT_RENDERERS[f] for f in self.get_output_formats()]
+        )
+
     def get_renderer(self):
-        match self.cli_options["output_format"]:
-            case "json":
-                r = JSONRenderer
-            case "markdown":
-                r = MarkdownRenderer
-            case "html":
-                r = HTMLRenderer
-            case "chunks":
-                r = ChunkRenderer
-            case _:
-                raise ValueError("Invalid output format")
-        return classes_to_strings([r])[0]
+        # When several formats are requested, this is the renderer for the first one
+        return self.get_renderers()[0]
 
     def get_processors(self):
         processors = self.cli_options.get("processors", None)
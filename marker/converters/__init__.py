@@ -1,15 +1,20 @@
 import inspect
-from typing import Optional, List, Type
+from typing import Annotated, Optional, List, Type
 
 from pydantic import BaseModel
 
 from marker.processors import BaseProcessor
-from marker.processors.llm import BaseLLMSimpleBlockProcessor
-from marker.processors.llm.llm_meta import LLMSimpleBlockMetaProcessor
+from marker.processors.llm import BaseLLMProcessor, BaseLLMSimpleBlockProcessor
+from marker.processors.llm.llm_meta import LLMComplexMetaProcessor, LLMSimpleBlockMetaProcessor
 from marker.util import assign_config, download_font
 
 
 class BaseConverter:
+    concurrent_llm_processors: Annotated[
+        bool,
+        "Run LLM processors that touch different block types at the same time, instead of one after another.",
+    ] = True
+
     def __init__(self, config: Optional[BaseModel | dict] = None):
         assign_config(self, config)
         self.config = config
@@ -49,7 +54,7 @@ class BaseConverter:
         other_processors = [p for p in processors if not issubclass(type(p), BaseLLMSimpleBlockProcessor)]
 
         if not simple_llm_processors:
-            return processors
+            return self.group_llm_processors(processors)
 
         llm_positions = [i for i, p in enumerate(processors) if issubclass(type(p), BaseLLMSimpleBlockProcessor)]
         insert_position = max(0, llm_positions[-1] - len(simple_llm_processors) + 1)
@@ -60,4 +65,34 @@ class BaseConverter:
             config=self.config,
         )
         other_processors.insert(insert_position, meta_processor)
-        return other_processors
\ No newline at end of file
+        return self.group_llm_processors(other_processors)
+
+    def group_llm_processors(self, processors: List[BaseProcessor]) -> List[BaseProcessor]:
+        """
+        Collect runs of LLM processors into an LLMComplexMetaProcessor, so the ones that touch different block
+        types run at the same time.  A non-LLM processor that touches none of the block types in the current run
+        is moved ahead of it, instead of splitting the run.
+        """
+        if not self.concurrent_llm_processors or self.llm_service is None:
+            return processors
+
+        grouped = []
+        run = []
+
+        def flush():
+            if len(run) > 1:
+                grouped.append(LLMComplexMetaProcessor(list(run), config=self.config))
+            else:
+                grouped.extend(run)
+            run.clear()
+
+        for processor in processors:
+            if isinstance(processor, BaseLLMProcessor):
+                run.append(processor)
+            elif any(processor.conflicts_with(llm_processor) for llm_processor in run):
+                flush()
+                grouped.append(processor)
+            else:
+                grouped.append(processor)
+        flush()
+        return grouped
\ No newline at end of file
@@ -21,6 +21,7 @@ class OCRConverter(PdfConverter):
 
         self.config["force_ocr"] = True
         self.renderer = OCRJSONRenderer
+        self.renderers = [OCRJSONRenderer]
 
     def build_document(self, filepath: str):
         provider_cls = provider_from_filepath(filepath)
@@ -30,7 +31,9 @@ class OCRConverter(PdfConverter):
         document_builder = DocumentBuilder(self.config)
 
         provider = provider_cls(filepath, self.config)
-        document = document_builder(provider, layout_builder, line_builder, ocr_builder)
+        document = self.build_base_document(
+            provider, document_builder, layout_builder, line_builder, ocr_builder
+        )
 
         for processor in self.processor_list:
             processor(document)
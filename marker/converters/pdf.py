@@ -4,16 +4,24 @@ from marker.schema.document import Document
 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"  # disables a tokenizers warning
 
+import hashlib
+import json
 from collections import defaultdict
-from typing import Annotated, Any, Dict, List, Optional, Type, Tuple, Union
+from typing import Annotated, Any, Callable, Dict, Iterator, List, Optional, Type, Tuple, Union
 import io
 from contextlib import contextmanager
 import tempfile
 
+import filetype
+
 from marker.processors import BaseProcessor
+from marker.processors.graph import ProcessorGraph, compare_documents, snapshot_document
 from marker.services import BaseService
+from marker.services.cache import CachedLLMService
+from marker.processors.llm.llm_meta import LLMComplexMetaProcessor
 from marker.processors.llm.llm_table_merge import LLMTableMergeProcessor
 from marker.providers.registry import provider_from_filepath
+from marker.providers.structured import StructuredProvider
 from marker.builders.document import DocumentBuilder
 from marker.builders.layout import LayoutBuilder
 from marker.builders.line import LineBuilder
@@ -44,8 +52,12 @@ from marker.processors.llm.llm_equation import LLMEquationProcessor
 from marker.renderers.markdown import MarkdownRenderer
 from marker.schema import BlockTypes
 from marker.schema.blocks import Block
+from marker.schema.groups.page import PageGroup
 from marker.schema.registry import register_block_class
-from marker.util import strings_to_classes
+from marker.util import get_config_values, strings_to_classes
+from marker.utils.cache import DiskCache, hash_file
+from marker.utils.model_cache import cache_models
+from marker.utils.profile import PipelineProfile, profile_models, profile_stage
 from marker.processors.llm.llm_handwriting import LLMHandwritingProcessor
 from marker.processors.order import OrderProcessor
 from marker.services.gemini import GoogleGeminiService
@@ -112,6 +124,74 @@ class PdfConverter(BaseConverter):
         bool,
         "Enable LLM page correction processor for overall accuracy.",
     ] = True
+    page_window_size: Annotated[
+        Optional[int],
+        "The number of pages to convert at once when streaming output with `stream`.",
+        "Default is None, which converts the whole document in a single window.",
+    ] = None
+    structured_input: Annotated[
+        bool,
+        "Read spreadsheets, DOCX, EPUB and HTML files straight into blocks from their cells or DOM, instead of",
+        "rendering them to PDF and running layout, OCR and table recognition.",
+    ] = False
+    page_window_context: Annotated[
+        int,
+        "The number of pages carried over between windows, so cross-page processors can see them.",
+        "Carried pages are emitted with the following window.",
+    ] = 1
+    document_cache_dir: Annotated[
+        str,
+        "Directory for caching built documents, so reruns that only change processors or renderers skip the models.",
+        "Default is None, which disables the cache.",
+    ] = None
+    document_cache_size_mb: Annotated[
+        int,
+        "The maximum size of the document cache, least recently used documents are evicted first.",
+    ] = 10240
+    llm_cache_dir: Annotated[
+        str,
+        "Directory for an on-disk cache of LLM responses, so repeated requests skip the model.",
+        "Default is None, which disables the cache.",
+    ] = None
+    llm_cache_size_mb: Annotated[
+        int,
+        "The maximum size of the LLM response cache, least recently used responses are evicted first.",
+    ] = 1024
+    model_cache_dir: Annotated[
+        str,
+        "Directory for an on-disk cache of per-page layout, detection, OCR error and recognition results.",
+        "Pages that render to the same image skip those models, even in other documents.  Default is None, which disables the cache.",
+    ] = None
+    model_cache_size_mb: Annotated[
+        int,
+        "The maximum size of the model result cache, least recently used results are evicted first.",
+    ] = 4096
+    profile_stages: Annotated[
+        bool,
+        "Record wall time, CPU time, peak memory growth and model batches for every builder and processor.",
+        "The results are added to the rendered metadata, for the document and for each page.",
+    ] = False
+    parallel_processors: Annotated[
+        bool,
+        "Run processors that read and write different block types at the same time.",
+        "Default is False, which runs processors one after another in list order.",
+    ] = False
+    processor_workers: Annotated[
+        int,
+        "The maximum number of processors to run at the same time with `parallel_processors`.",
+    ] = 4
+    validate_parallel_processors: Annotated[
+        bool,
+        "Also run the processors one after another on a copy of the document, and raise an error if the result",
+        "differs from the parallel run.  This doubles processing time, and is meant for checking processor declarations.",
+    ] = False
+    cross_page_processors: Tuple[Type[BaseProcessor], ...] = (
+        IgnoreTextProcessor,
+        SectionHeaderProcessor,
+        LLMTableMergeProcessor,
+        TextProcessor,
+        ListProcessor,
+    )
     default_processors: Tuple[BaseProcessor, ...] = (
         OrderProcessor,
         BlockRelabelProcessor,
@@ -182,7 +262,7 @@ class PdfConverter(BaseConverter):
         self,
         artifact_dict: Dict[str, Any],
         processor_list: Optional[List[str]] = None,
-        renderer: str | None = None,
+        renderer: str | List[str] | None = None,
         llm_service: str | None = None,
         config=None,
     ):
@@ -200,12 +280,22 @@ class PdfConverter(BaseConverter):
             # Filter default processors based on LLM processor toggles
             processor_list = self._filter_processors_by_config(self.default_processors)
 
-        if renderer:
-            renderer = strings_to_classes([renderer])[0]
+        # A list of renderers renders one built document into several output formats
+        if isinstance(renderer, (list, tuple)):
+            renderers = strings_to_classes(list(renderer))
+        elif renderer:
+            renderers = strings_to_classes([renderer])
         else:
-            renderer = MarkdownRenderer
+            renderers = [MarkdownRenderer]
 
         # Put here so that resolve_dependencies can access it
+        if self.profile_stages:
+            artifact_dict = profile_models(artifact_dict)
+        # Wraps the profiled models, so profiles only count the items that reach the model
+        if self.model_cache_dir is not None:
+            artifact_dict = cache_models(
+                artifact_dict, self.model_cache_dir, self.model_cache_size_mb * 1024 * 1024
+            )
         self.artifact_dict = artifact_dict
 
         if llm_service:
@@ -214,62 +304,311 @@ class PdfConverter(BaseConverter):
         elif config.get("use_llm", False):
             llm_service = self.resolve_dependencies(self.default_llm_service)
 
+        if llm_service is not None and self.llm_cache_dir is not None:
+            llm_service = CachedLLMService(
+                llm_service, self.llm_cache_dir, self.llm_cache_size_mb * 1024 * 1024
+            )
+
         # Inject llm service into artifact_dict so it can be picked up by processors, etc.
         self.artifact_dict["llm_service"] = llm_service
         self.llm_service = llm_service
 
-        self.renderer = renderer
+        self.renderers = renderers
+        self.renderer = renderers[0]
 
         processor_list = self.initialize_processors(processor_list)
         self.processor_list = processor_list
 
         self.layout_builder_class = LayoutBuilder
         self.page_count = None  # Track how many pages were converted
+        self.total_page_count = None  # Set when streaming, so progress can be reported
 
     @contextmanager
-    def filepath_to_str(self, file_input: Union[str, io.BytesIO]):
-        temp_file = None
+    def resolve_input(self, file_input: Union[str, bytes, bytearray, memoryview, io.BytesIO]):
+        """
+        Resolve the input to a path or bytes for the provider.  In-memory PDFs stay in memory, other file types are
+        written to a temporary file, since their providers convert from a path.
+        """
+        if isinstance(file_input, str):
+            yield file_input
+            return
+
+        if isinstance(file_input, io.BytesIO):
+            data = file_input.getvalue()
+        elif isinstance(file_input, (bytes, bytearray, memoryview)):
+            data = bytes(file_input)
+        else:
+            raise TypeError(f"Expected str, bytes or BytesIO, got {type(file_input)}")
+
+        if provider_from_filepath(data, self.structured_input).accepts_bytes:
+            yield data
+            return
+
+        extension = filetype.guess_extension(data) or "pdf"
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{extension}") as temp_file:
+            temp_file.write(data)
         try:
-            if isinstance(file_input, str):
-                yield file_input
-            else:
-                with tempfile.NamedTemporaryFile(
-                    delete=False, suffix=".pdf"
-                ) as temp_file:
-                    if isinstance(file_input, io.BytesIO):
-                        file_input.seek(0)
-                        temp_file.write(file_input.getvalue())
-                    else:
-                        raise TypeError(
-                            f"Expected str or BytesIO, got {type(file_input)}"
-                        )
-
-                yield temp_file.name
+            yield temp_file.name
         finally:
-            if temp_file is not None and os.path.exists(temp_file.name):
+            if os.path.exists(temp_file.name):
                 os.unlink(temp_file.name)
 
-    def build_document(self, filepath: str) -> Document:
-        provider_cls = provider_from_filepath(filepath)
+    def build_document(self, filepath: str | bytes) -> Document:
+        provider_cls = provider_from_filepath(filepath, self.structured_input)
+        if issubclass(provider_cls, StructuredProvider):
+            return self.build_structured_document(provider_cls(filepath, self.config))
+
         layout_builder = self.resolve_dependencies(self.layout_builder_class)
         line_builder = self.resolve_dependencies(LineBuilder)
         ocr_builder = self.resolve_dependencies(OcrBuilder)
         provider = provider_cls(filepath, self.config)
-        document = DocumentBuilder(self.config)(
-            provider, layout_builder, line_builder, ocr_builder
+        profile = PipelineProfile() if self.profile_stages else None
+        with self.activate_profile(profile):
+            document = self.build_base_document(
+                provider, DocumentBuilder(self.config), layout_builder, line_builder, ocr_builder
+            )
+            page_ids = [page.page_id for page in document.pages]
+            structure_builder_cls = self.resolve_dependencies(StructureBuilder)
+            with profile_stage("StructureBuilder", page_ids):
+                structure_builder_cls(document)
+
+            expected = None
+            if self.parallel_processors and self.validate_parallel_processors:
+                expected = snapshot_document(document)
+                for processor in self.processor_list:
+                    processor(expected)
+
+            self.run_processors(lambda processor: document, page_ids)
+
+        if expected is not None:
+            differences = compare_documents(expected, document)
+            if differences:
+                raise RuntimeError(
+                    f"Parallel processors gave a different result than sequential processors for: {', '.join(differences)}"
+                )
+
+        document.set_profile(profile)
+        return document
+
+    def build_structured_document(self, provider: StructuredProvider, pages: List[PageGroup] | None = None) -> Document:
+        """
+        Build a document from a structured provider, whose pages already hold their final blocks.
+        """
+        profile = PipelineProfile() if self.profile_stages else None
+        with self.activate_profile(profile):
+            with profile_stage(type(provider).__name__, [page.page_id for page in pages or []]):
+                document = provider.build_document(pages)
+        document.set_profile(profile)
+        return document
+
+    def run_processors(self, document_for: Callable[[BaseProcessor], Document], page_ids: List[int]):
+        """
+        Run every processor, on the document `document_for` picks for it.  With `parallel_processors`, processors
+        that touch different block types run at the same time, otherwise they run in list order.
+        """
+        def run_processor(processor: BaseProcessor):
+            with profile_stage(type(processor).__name__, page_ids):
+                if isinstance(processor, LLMComplexMetaProcessor):
+                    # Each grouped processor still runs on the document it would on its own
+                    processor(document_for(processor), document_for=document_for)
+                else:
+                    processor(document_for(processor))
+
+        max_workers = self.processor_workers if self.parallel_processors else 1
+        ProcessorGraph(self.processor_list).run(run_processor, max_workers)
+
+    @contextmanager
+    def activate_profile(self, profile: PipelineProfile | None):
+        if profile is None:
+            yield
+            return
+
+        with profile.activate():
+            yield
+
+    def document_cache_key(self, provider, builders: List[Any]) -> str:
+        from surya.settings import settings as surya_settings
+
+        builder_config = {
+            type(obj).__name__: {
+                k: v
+                for k, v in get_config_values(obj).items()
+                if not (
+                    k == "disable_tqdm"
+                    or k.endswith("batch_size")
+                    or k.endswith("workers")
+                    or k.endswith("_per_worker")
+                )
+            }
+            for obj in [provider, *builders]
+        }
+        checkpoints = {
+            k: getattr(surya_settings, k)
+            for k in dir(surya_settings)
+            if k.endswith("_CHECKPOINT")
+        }
+        key_data = json.dumps(
+            {
+                "file": hash_file(provider.filepath),
+                "page_range": list(provider.page_range),
+                "config": builder_config,
+                "checkpoints": checkpoints,
+            },
+            sort_keys=True,
+            default=str,
         )
-        structure_builder_cls = self.resolve_dependencies(StructureBuilder)
-        structure_builder_cls(document)
+        return hashlib.sha256(key_data.encode()).hexdigest()
 
-        for processor in self.processor_list:
-            processor(document)
+    def build_base_document(
+        self,
+        provider,
+        document_builder: DocumentBuilder,
+        layout_builder: LayoutBuilder,
+        line_builder: LineBuilder,
+        ocr_builder: OcrBuilder,
+    ) -> Document:
+        """
+        Run the document builder, which makes all of the model calls.  When `document_cache_dir` is set, the built
+        document is cached on disk and reused for the same file, page range and builder config.
+        """
+        if self.document_cache_dir is None:
+            return document_builder(provider, layout_builder, line_builder, ocr_builder)
 
+        cache = DiskCache(self.document_cache_dir, self.document_cache_size_mb * 1024 * 1024)
+        key = self.document_cache_key(
+            provider, [document_builder, layout_builder, line_builder, ocr_builder]
+        )
+        with profile_stage("DocumentCache", provider.page_range):
+            data = cache.get(key)
+        if data is not None:
+            document = Document.loads(data)
+            document.filepath = provider.filename
+            document.set_source(provider.filepath)
+            document_builder.attach_page_images(document.pages, provider)
+            return document
+
+        document = document_builder(provider, layout_builder, line_builder, ocr_builder)
+        cache.put(key, document.dumps())
         return document
 
-    def __call__(self, filepath: str | io.BytesIO):
-        with self.filepath_to_str(filepath) as temp_path:
-            document = self.build_document(temp_path)
+    def __call__(self, filepath: str | bytes | io.BytesIO):
+        with self.resolve_input(filepath) as source:
+            document = self.build_document(source)
             self.page_count = len(document.pages)
             renderer = self.resolve_dependencies(self.renderer)
             rendered = renderer(document)
         return rendered
+
+    def render_document(self, document: Document, renderers: List[type] | None = None) -> List[Any]:
+        """
+        Render a built document with several renderers.  The rendered block tree and extracted images are
+        shared between renderers instead of being recomputed for each one.
+        """
+        if renderers is None:
+            renderers = self.renderers
+
+        with document.render_cache():
+            return [self.resolve_dependencies(renderer)(document) for renderer in renderers]
+
+    def render_all(self, filepath: str | bytes | io.BytesIO) -> List[Any]:
+        """
+        Build the document once and render it with every configured renderer, returning outputs in renderer order.
+        """
+        with self.resolve_input(filepath) as source:
+            document = self.build_document(source)
+            self.page_count = len(document.pages)
+            rendered = self.render_document(document)
+        return rendered
+
+    def stream(self, filepath: str | bytes | io.BytesIO) -> Iterator[Any]:
+        """
+        Convert the document in windows of `page_window_size` pages, yielding one rendered output per window.
+        Text is extracted one window at a time, and only the current window and the carried-over context pages
+        are held in memory, so peak memory depends on the window size instead of the document length.
+        """
+        renderer = self.resolve_dependencies(self.renderer)
+        for window_document in self.stream_documents(filepath):
+            yield renderer(window_document)
+
+    def stream_all(self, filepath: str | bytes | io.BytesIO) -> Iterator[List[Any]]:
+        """
+        Like `stream`, but yields the outputs of every configured renderer for each window.
+        """
+        for window_document in self.stream_documents(filepath):
+            yield self.render_document(window_document)
+
+    def stream_documents(self, filepath: str | bytes | io.BytesIO) -> Iterator[Document]:
+        with self.resolve_input(filepath) as source:
+            provider_cls = provider_from_filepath(source, self.structured_input)
+            # With windows, the provider only extracts text for the window being built
+            provider_config = {**(self.config or {}), "defer_text_extraction": bool(self.page_window_size)}
+            provider = provider_cls(source, provider_config)
+            if isinstance(provider, StructuredProvider):
+                yield from self.stream_structured_documents(provider)
+                return
+
+            layout_builder = self.resolve_dependencies(self.layout_builder_class)
+            line_builder = self.resolve_dependencies(LineBuilder)
+            ocr_builder = self.resolve_dependencies(OcrBuilder)
+            document_builder = DocumentBuilder(self.config)
+            structure_builder = self.resolve_dependencies(StructureBuilder)
+
+            page_range = list(provider.page_range)
+            window_size = self.page_window_size or len(page_range)
+            carried_pages: List[PageGroup] = []
+            self.page_count = 0
+            self.total_page_count = len(page_range)
+            # One profile covers every window, it is only active while a window is processed
+            profile = PipelineProfile() if self.profile_stages else None
+            for window_start in range(0, len(page_range), window_size):
+                window_range = page_range[window_start : window_start + window_size]
+                with self.activate_profile(profile):
+                    with profile_stage(type(provider).__name__, window_range):
+                        provider.extract_pages(window_range)
+                    window_document = document_builder(
+                        provider, layout_builder, line_builder, ocr_builder, window_range
+                    )
+                    with profile_stage("StructureBuilder", window_range):
+                        structure_builder(window_document)
+
+                    # Carried pages have already been through every processor, only cross-page processors revisit them
+                    context_document = window_document.model_copy(
+                        update={"pages": carried_pages + window_document.pages}
+                    )
+                    context_document.set_profile(profile)
+                    def document_for(processor: BaseProcessor) -> Document:
+                        if isinstance(processor, self.cross_page_processors):
+                            return context_document
+                        return window_document
+
+                    self.run_processors(document_for, window_range)
+
+                # Hold back the tail of the window, since the next window can still modify it
+                is_last_window = window_start + window_size >= len(page_range)
+                held_count = 0 if is_last_window else min(self.page_window_context, len(window_document.pages))
+                emit_count = len(context_document.pages) - held_count
+                emit_pages = context_document.pages[:emit_count]
+                carried_pages = context_document.pages[emit_count:]
+
+                # Provider lines are no longer needed once a page is emitted
+                for page in emit_pages:
+                    provider.page_lines.pop(page.page_id, None)
+
+                self.page_count += len(emit_pages)
+                yield context_document.model_copy(update={"pages": emit_pages})
+
+    def stream_structured_documents(self, provider: StructuredProvider) -> Iterator[Document]:
+        # Pages are read one at a time, so only the current window is in memory and the total is unknown upfront
+        self.page_count = 0
+        self.total_page_count = None
+        window: List[PageGroup] = []
+        for page in provider.iter_pages():
+            window.append(page)
+            if self.page_window_size and len(window) >= self.page_window_size:
+                self.page_count += len(window)
+                yield self.build_structured_document(provider, window)
+                window = []
+
+        if window or self.page_count == 0:
+            self.page_count += len(window)
+            yield self.build_structured_document(provider, window)
@@ -37,7 +37,9 @@ class TableConverter(PdfConverter):
         document_builder.disable_ocr = True
 
         provider = provider_cls(filepath, self.config)
-        document = document_builder(provider, layout_builder, line_builder, ocr_builder)
+        document = self.build_base_document(
+            provider, document_builder, layout_builder, line_builder, ocr_builder
+        )
 
         for page in document.pages:
             page.structure = [
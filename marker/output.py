@@ -1,5 +1,6 @@
 import json
 import os
+from typing import List
 
 from bs4 import BeautifulSoup, Tag
 from pydantic import BaseModel
@@ -44,12 +45,34 @@ def json_to_html(block: JSONBlockOutput | BlockOutput):
         return str(soup)
 
 
-def output_exists(output_dir: str, fname_base: str):
-    exts = ["md", "html", "json"]
-    for ext in exts:
-        if os.path.exists(os.path.join(output_dir, f"{fname_base}.{ext}")):
-            return True
-    return False
+# The file extension save_output writes for each output format
+OUTPUT_FORMAT_EXTENSIONS = {
+    "markdown": "md",
+    "json": "json",
+    "html": "html",
+    "chunks": "json",
+}
+
+
+def output_exists(
+    output_dir: str, fname_base: str, output_formats: List[str] | None = None
+):
+    if output_formats is None:
+        exts = ["md", "html", "json"]
+        for ext in exts:
+            if os.path.exists(os.path.join(output_dir, f"{fname_base}.{ext}")):
+                return True
+        return False
+
+    # Mirror the filenames save_outputs uses, and only count the output as existing once every format was written
+    if len(output_formats) == 1:
+        fnames = [f"{fname_base}.{OUTPUT_FORMAT_EXTENSIONS[output_formats[0]]}"]
+    else:
+        fnames = [
+            f"{fname_base}_{output_format}.{OUTPUT_FORMAT_EXTENSIONS[output_format]}"
+            for output_format in output_formats
+        ]
+    return all(os.path.exists(os.path.join(output_dir, fname)) for fname in fnames)
 
 
 def text_from_rendered(rendered: BaseModel):
@@ -71,6 +94,50 @@ def text_from_rendered(rendered: BaseModel):
         raise ValueError("Invalid output type")
 
 
+def merge_metadata(metadatas: List[dict]) -> dict:
+    merged = {"table_of_contents": [], "page_stats": []}
+    for metadata in metadatas:
+        for key, value in metadata.items():
+            if key in merged:
+                merged[key].extend(value or [])
+            else:
+                merged[key] = value
+    return merged
+
+
+def merge_rendered(rendered: List[BaseModel]) -> BaseModel:
+    # Combines the outputs of consecutive page windows from PdfConverter.stream into one output
+    from marker.renderers.chunk import ChunkOutput  # Has an import from this file
+
+    if len(rendered) == 1:
+        return rendered[0]
+
+    first = rendered[0]
+    metadata = merge_metadata([r.metadata for r in rendered])
+    images = {}
+    for r in rendered:
+        images.update(getattr(r, "images", {}))
+
+    if isinstance(first, MarkdownOutput):
+        markdown = "\n\n".join(r.markdown for r in rendered)
+        return MarkdownOutput(markdown=markdown, images=images, metadata=metadata)
+    elif isinstance(first, HTMLOutput):
+        soup = BeautifulSoup(first.html, "html.parser")
+        for r in rendered[1:]:
+            window_body = BeautifulSoup(r.html, "html.parser").body
+            for element in list(window_body.contents):
+                soup.body.append(element)
+        return HTMLOutput(html=soup.prettify(), images=images, metadata=metadata)
+    elif isinstance(first, JSONOutput):
+        children = [child for r in rendered for child in r.children]
+        return JSONOutput(children=children, metadata=metadata)
+    elif isinstance(first, ChunkOutput):
+        blocks = [block for r in rendered for block in r.blocks]
+        page_info = {k: v for r in rendered for k, v in r.page_info.items()}
+        return ChunkOutput(blocks=blocks, page_info=page_info, metadata=metadata)
+    raise ValueError("Invalid output type")
+
+
 def convert_if_not_rgb(image: Image.Image) -> Image.Image:
     if image.mode != "RGB":
         image = image.convert("RGB")
@@ -99,3 +166,15 @@ def save_output(rendered: BaseModel, output_dir: str, fname_base: str):
     for img_name, img in images.items():
         img = convert_if_not_rgb(img)  # RGBA images can't save as JPG
         img.save(os.path.join(output_dir, img_name), settings.OUTPUT_IMAGE_FORMAT)
+
+
+def save_outputs(
+    rendered: List[BaseModel], output_formats: List[str], output_dir: str, fname_base: str
+):
+    # A single format keeps the plain filename, several formats are suffixed so json and chunks don't collide
+    if len(rendered) == 1:
+        save_output(rendered[0], output_dir, fname_base)
+        return
+
+    for output_format, output in zip(output_formats, rendered):
+        save_output(output, output_dir, f"{fname_base}_{output_format}")
@@ -1,4 +1,4 @@
-from typing import Optional, Tuple
+from typing import Optional, Set, Tuple
 
 from pydantic import BaseModel
 
@@ -9,9 +9,48 @@ from marker.util import assign_config
 
 class BaseProcessor:
     block_types: Tuple[BlockTypes] | None = None  # What block types this processor is responsible for
+    # Used to find processors that can run at the same time.  BlockTypes.Page stands for the order of the top-level
+    # blocks on each page, which every processor reads while looking for its blocks.
+    read_block_types: Tuple[BlockTypes, ...] = tuple()  # Block types read in addition to block_types
+    write_block_types: Tuple[BlockTypes, ...] = tuple()  # Block types changed in addition to block_types
+    adds_blocks: bool = False  # New blocks take the next id from their page, so these processors can't overlap
 
     def __init__(self, config: Optional[BaseModel | dict] = None):
         assign_config(self, config)
 
     def __call__(self, document: Document, *args, **kwargs):
         raise NotImplementedError
+
+    def writes(self) -> Set[BlockTypes] | None:
+        """
+        The block types this processor changes, or None if it can change any block.
+        """
+        if self.block_types is None:
+            return None
+        return set(self.block_types) | set(self.write_block_types)
+
+    def reads(self) -> Set[BlockTypes] | None:
+        """
+        The block types this processor reads, or None if it can read any block.
+        """
+        writes = self.writes()
+        if writes is None:
+            return None
+        return writes | set(self.read_block_types) | {BlockTypes.Page}
+
+    def conflicts_with(self, other: "BaseProcessor") -> bool:
+        """
+        Whether the result depends on the order this processor and `other` run in.
+        """
+        if self.adds_blocks and other.adds_blocks:
+            return True
+        return block_types_overlap(self.writes(), other.reads()) or block_types_overlap(other.writes(), self.reads())
+
+
+def block_types_overlap(first: Set[BlockTypes] | None, second: Set[BlockTypes] | None) -> bool:
+    # None stands for every block type
+    if first is None:
+        return second is None or len(second) > 0
+    if second is None:
+        return len(first) > 0
+    return bool(first & second)
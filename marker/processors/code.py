@@ -9,6 +9,7 @@ class CodeProcessor(BaseProcessor):
     A processor for formatting code blocks.
     """
     block_types = (BlockTypes.Code, )
+    read_block_types = (BlockTypes.Line, BlockTypes.Span)
 
     def __call__(self, document: Document):
         for page in document.pages:
@@ -21,6 +21,7 @@ class DebugProcessor(BaseProcessor):
     block_types: Annotated[
         tuple, "The block types to process.", "Default is an empty tuple."
     ] = tuple()
+    read_block_types = tuple(BlockTypes)  # Draws every block
     debug_data_folder: Annotated[
         str,
         "The folder to dump debug data to.",
@@ -8,6 +8,8 @@ class DocumentTOCProcessor(BaseProcessor):
     A processor for generating a table of contents for the document.
     """
     block_types = (BlockTypes.SectionHeader, )
+    read_block_types = (BlockTypes.Line, BlockTypes.Span)
+    write_block_types = (BlockTypes.Document,)  # The table of contents
 
     def __call__(self, document: Document):
         toc = []
@@ -11,6 +11,7 @@ class FootnoteProcessor(BaseProcessor):
     A processor for pushing footnotes to the bottom, and relabeling mislabeled text blocks.
     """
     block_types = (BlockTypes.Footnote,)
+    write_block_types = (BlockTypes.Page, BlockTypes.Span)
 
     def __call__(self, document: Document):
         for page in document.pages:
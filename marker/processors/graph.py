@@ -0,0 +1,98 @@
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List
+
+from marker.processors import BaseProcessor
+from marker.schema.document import Document
+
+
+class ProcessorGraph:
+    """
+    Orders processors by the block types they read and write.  Each processor depends on the earlier processors it
+    conflicts with, so running every processor after its dependencies gives the same result as running the list in order.
+    """
+
+    def __init__(self, processors: List[BaseProcessor]):
+        self.processors = processors
+        self.dependencies = [
+            [i for i in range(j) if processors[i].conflicts_with(processor)]
+            for j, processor in enumerate(processors)
+        ]
+
+    def run(self, run_processor: Callable[[BaseProcessor], Any], max_workers: int = 1):
+        """
+        Call `run_processor` on every processor, running independent processors on up to `max_workers` threads.
+        With a single worker, processors run one after another in list order.
+        """
+        if max_workers <= 1:
+            for processor in self.processors:
+                run_processor(processor)
+            return
+
+        pending = list(range(len(self.processors)))
+        finished = set()
+        running: Dict[Future, int] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                # Start processors in list order, so the schedule only depends on which processors have finished
+                ready = [i for i in pending if all(d in finished for d in self.dependencies[i])]
+                for i in ready:
+                    # Copy the context, so profiling stages are recorded from the worker threads
+                    context = contextvars.copy_context()
+                    running[executor.submit(context.run, run_processor, self.processors[i])] = i
+                    pending.remove(i)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                    finished.add(running.pop(future))
+
+
+def snapshot_document(document: Document) -> Document:
+    """
+    A copy of the document that processors can change without touching the original.  Page images are shared.
+    """
+    snapshot = Document.loads(document.dumps())
+    for snapshot_page, page in zip(snapshot.pages, document.pages):
+        snapshot_page.lowres_image = page.lowres_image
+        snapshot_page.highres_image = page.highres_image
+        snapshot_page.set_image_source(page._image_source)
+    snapshot.set_source(document._source)
+    return snapshot
+
+
+def document_state(document: Document) -> Dict[str, Any]:
+    return {
+        "table_of_contents": document.table_of_contents,
+        "pages": [
+            {
+                "structure": page.structure,
+                "blocks": [
+                    block.model_dump(exclude={"lowres_image", "highres_image"})
+                    for block in page.children
+                ],
+            }
+            for page in document.pages
+        ],
+    }
+
+
+def compare_documents(expected: Document, actual: Document) -> List[str]:
+    """
+    Describe the parts that differ between two processed copies of a document, empty if they match.
+    """
+    expected_state = document_state(expected)
+    actual_state = document_state(actual)
+    if len(expected_state["pages"]) != len(actual_state["pages"]):
+        return ["page count"]
+
+    differences = [
+        f"page {page.page_id}"
+        for page, expected_page, actual_page in zip(
+            expected.pages, expected_state["pages"], actual_state["pages"]
+        )
+        if expected_page != actual_page
+    ]
+    if expected_state["table_of_contents"] != actual_state["table_of_contents"]:
+        differences.append("table of contents")
+    return differences
@@ -20,6 +20,7 @@ class IgnoreTextProcessor(BaseProcessor):
         BlockTypes.Text, BlockTypes.SectionHeader,
         BlockTypes.TextInlineMath
     )
+    read_block_types = (BlockTypes.Line, BlockTypes.Span)
     common_element_threshold: Annotated[
         float,
         "The minimum ratio of pages a text block must appear on to be considered a common element.",
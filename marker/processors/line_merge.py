@@ -13,6 +13,8 @@ class LineMergeProcessor(BaseProcessor):
     A processor for merging inline math lines.
     """
     block_types = (BlockTypes.Text, BlockTypes.TextInlineMath, BlockTypes.Caption, BlockTypes.Footnote, BlockTypes.SectionHeader)
+    read_block_types = (BlockTypes.Span,)
+    write_block_types = (BlockTypes.Line,)
     min_merge_pct: Annotated[
         float,
         "The minimum percentage of intersection area to consider merging."
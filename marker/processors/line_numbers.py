@@ -10,6 +10,8 @@ class LineNumbersProcessor(BaseProcessor):
     A processor for ignoring line numbers.
     """
     block_types = (BlockTypes.Text, BlockTypes.TextInlineMath)
+    read_block_types = (BlockTypes.Line,)
+    write_block_types = (BlockTypes.Span,)
     strip_numbers_threshold: Annotated[
         float,
         "The fraction of lines or tokens in a block that must be numeric to consider them as line numbers.",
@@ -11,6 +11,8 @@ class ListProcessor(BaseProcessor):
     A processor for merging lists across pages and columns
     """
     block_types = (BlockTypes.ListGroup,)
+    read_block_types = (BlockTypes.Line, BlockTypes.Span)
+    write_block_types = (BlockTypes.ListItem,)
     ignored_block_types: Annotated[
         Tuple[BlockTypes],
         "The list of block types to ignore when merging lists.",
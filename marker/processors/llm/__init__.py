@@ -56,6 +56,7 @@ class BaseLLMProcessor(BaseProcessor):
         "Whether to disable the tqdm progress bar.",
     ] = False
     block_types = None
+    read_block_types = (BlockTypes.Line, BlockTypes.Span)  # Prompts include the extracted text
 
     def __init__(self, llm_service: BaseService, config=None):
         super().__init__(config)
@@ -30,6 +30,7 @@ class LLMMathBlockProcessor(BaseLLMComplexBlockProcessor):
         BlockTypes.SectionHeader,
         BlockTypes.Footnote,
     )  # Seconday, can also contain math
+    write_block_types = additional_block_types
 
     text_math_rewriting_prompt = """You are a text correction expert specializing in accurately reproducing text from images.
 You will receive an image of a text block and extracted text corresponding to the text in the image.
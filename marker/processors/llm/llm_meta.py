@@ -1,10 +1,13 @@
 from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Set
 
 from marker.logger import get_logger
 from tqdm import tqdm
 
+from marker.processors import BaseProcessor
+from marker.processors.graph import ProcessorGraph
 from marker.processors.llm import BaseLLMSimpleBlockProcessor, BaseLLMProcessor
+from marker.schema import BlockTypes
 from marker.schema.document import Document
 from marker.services import BaseService
 
@@ -25,6 +28,12 @@ class LLMSimpleBlockMetaProcessor(BaseLLMProcessor):
         super().__init__(llm_service, config)
         self.processors = processor_lst
 
+    def reads(self) -> Set[BlockTypes] | None:
+        return combined_block_types([processor.reads() for processor in self.processors])
+
+    def writes(self) -> Set[BlockTypes] | None:
+        return combined_block_types([processor.writes() for processor in self.processors])
+
     def __call__(self, document: Document):
         if not self.use_llm or self.llm_service is None:
             return
@@ -71,3 +80,43 @@ class LLMSimpleBlockMetaProcessor(BaseLLMProcessor):
             prompt_data["block"],
             prompt_data["schema"],
         )
+
+
+def combined_block_types(types: List[Set[BlockTypes] | None]) -> Set[BlockTypes] | None:
+    if any(t is None for t in types):
+        return None
+    return set().union(*types)
+
+
+class LLMComplexMetaProcessor(BaseProcessor):
+    """
+    Runs a sequence of LLM processors concurrently, so the LLM service stays busy between them.
+    A processor only waits for the earlier processors that touch the same block types, so the original order is
+    kept wherever it matters.
+    """
+
+    def __init__(self, processor_lst: List[BaseProcessor], config=None):
+        super().__init__(config)
+        self.processors = processor_lst
+        self.graph = ProcessorGraph(processor_lst)
+        self.adds_blocks = any(processor.adds_blocks for processor in processor_lst)
+
+    def reads(self) -> Set[BlockTypes] | None:
+        return combined_block_types([processor.reads() for processor in self.processors])
+
+    def writes(self) -> Set[BlockTypes] | None:
+        return combined_block_types([processor.writes() for processor in self.processors])
+
+    def __call__(
+        self,
+        document: Document,
+        document_for: Callable[[BaseProcessor], Document] | None = None,
+    ):
+        # document_for picks the document each processor runs on, when they differ, like in windowed conversion
+        if document_for is None:
+            document_for = lambda processor: document  # noqa: E731
+
+        self.graph.run(
+            lambda processor: processor(document_for(processor)),
+            max_workers=len(self.processors),
+        )
@@ -15,6 +15,7 @@ logger = get_logger()
 
 
 class LLMSectionHeaderProcessor(BaseLLMComplexBlockProcessor):
+    block_types = (BlockTypes.SectionHeader,)
     page_prompt = """You're a text correction expert specializing in accurately analyzing complex PDF documents. You will be given a list of all of the section headers from a document, along with their page number and approximate dimensions.  The headers will be formatted like below, and will be presented in order.
 
 ```json
@@ -19,6 +19,7 @@ class LLMTableMergeProcessor(BaseLLMComplexBlockProcessor):
         Tuple[BlockTypes],
         "The block types to process.",
     ] = (BlockTypes.Table, BlockTypes.TableOfContents)
+    write_block_types = (BlockTypes.TableCell,)
     table_height_threshold: Annotated[
         float,
         "The minimum height ratio relative to the page for the first table in a pair to be considered for merging.",
@@ -11,6 +11,7 @@ class OrderProcessor(BaseProcessor):
     A processor for sorting the blocks in order if needed.  This can help when the layout image was sliced.
     """
     block_types = tuple()
+    write_block_types = (BlockTypes.Page,)
 
     def __call__(self, document: Document):
         for page in document.pages:
@@ -9,6 +9,7 @@ class PageHeaderProcessor(BaseProcessor):
     A processor for moving PageHeaders to the top
     """
     block_types = (BlockTypes.PageHeader,)
+    write_block_types = (BlockTypes.Page,)
 
     def __call__(self, document: Document):
         for page in document.pages:
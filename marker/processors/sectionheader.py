@@ -18,6 +18,7 @@ class SectionHeaderProcessor(BaseProcessor):
     A processor for recognizing section headers in the document.
     """
     block_types = (BlockTypes.SectionHeader, )
+    read_block_types = (BlockTypes.Line, BlockTypes.Span)
     level_count: Annotated[
         int,
         "The number of levels to use for headings.",
@@ -31,6 +31,8 @@ class TableProcessor(BaseProcessor):
     """
 
     block_types = (BlockTypes.Table, BlockTypes.TableOfContents, BlockTypes.Form)
+    write_block_types = (BlockTypes.Page, BlockTypes.TableCell, BlockTypes.Line, BlockTypes.Span)
+    adds_blocks = True
     table_rec_batch_size: Annotated[
         int,
         "The batch size to use for the table recognition model.",
@@ -83,7 +85,7 @@ class TableProcessor(BaseProcessor):
         self.detection_model = detection_model
 
     def __call__(self, document: Document):
-        filepath = document.filepath  # Path to original pdf file
+        filepath = document.source  # Path to, or bytes of, the original pdf file
 
         table_data = []
         for page in document.pages:
@@ -93,7 +95,7 @@ class TableProcessor(BaseProcessor):
                 image = block.get_image(document, highres=True)
                 image_poly = block.polygon.rescale(
                     (page.polygon.width, page.polygon.height),
-                    page.get_image(highres=True).size,
+                    page.get_image_size(highres=True),
                 )
 
                 table_data.append(
@@ -102,7 +104,7 @@ class TableProcessor(BaseProcessor):
                         "page_id": page.page_id,
                         "table_image": image,
                         "table_bbox": image_poly.bbox,
-                        "img_size": page.get_image(highres=True).size,
+                        "img_size": page.get_image_size(highres=True),
                         "ocr_block": any(
                             [
                                 page.text_extraction_method in ["surya"],
@@ -145,7 +147,7 @@ class TableProcessor(BaseProcessor):
                 for cell in cells:
                     # Rescale the cell polygon to the page size
                     cell_polygon = PolygonBox(polygon=cell.polygon).rescale(
-                        page.get_image(highres=True).size, page.polygon.size
+                        page.get_image_size(highres=True), page.polygon.size
                     )
 
                     # Rescale cell polygon to be relative to the page instead of the table
@@ -454,7 +456,7 @@ class TableProcessor(BaseProcessor):
                 assert all("bbox" in t for t in text), "All text lines must have a bbox"
                 table_cells[k].text_lines = text
 
-    def assign_pdftext_lines(self, extract_blocks: list, filepath: str):
+    def assign_pdftext_lines(self, extract_blocks: list, filepath: str | bytes):
         table_inputs = []
         unique_pages = list(set([t["page_id"] for t in extract_blocks]))
         if len(unique_pages) == 0:
@@ -16,6 +16,7 @@ class TextProcessor(BaseProcessor):
 
     block_types = (BlockTypes.Text, BlockTypes.TextInlineMath)
     ignored_block_types = (BlockTypes.PageHeader, BlockTypes.PageFooter)
+    read_block_types = (BlockTypes.Line, BlockTypes.Span)
     column_gap_ratio: Annotated[
         float,
         "The minimum ratio of the page width to the column gap to consider a column break.",
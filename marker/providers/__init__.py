@@ -1,8 +1,11 @@
+import math
+import uuid
+import weakref
 from copy import deepcopy
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
 from PIL import Image
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from pdftext.schema import Reference
 
@@ -11,8 +14,9 @@ from marker.schema.polygon import PolygonBox
 from marker.schema.text import Span
 from marker.schema.text.char import Char
 from marker.schema.text.line import Line
-from marker.settings import settings
+from marker.schema.text.store import CharSpanView
 from marker.util import assign_config
+from marker.utils.cache import ImageLRUCache, page_image_cache
 
 configure_logging()
 
@@ -20,7 +24,10 @@ configure_logging()
 class ProviderOutput(BaseModel):
     line: Line
     spans: List[Span]
-    chars: Optional[List[List[Char]]] = None
+    chars: Optional[List[List[Char] | CharSpanView]] = None
+    block_idx: Optional[int] = None  # The text block the line came from, when the provider groups lines into blocks
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     @property
     def raw_text(self):
@@ -48,20 +55,96 @@ class ProviderOutput(BaseModel):
 ProviderPageLines = Dict[int, List[ProviderOutput]]
 
 
+class PageImageSource:
+    """
+    A lazy handle for rendering page images from a provider.  Images are only rendered when first requested,
+    and are held in a process-wide LRU cache instead of on the page itself.
+    """
+
+    def __init__(
+        self,
+        provider: "BaseProvider",
+        lowres_dpi: int,
+        highres_dpi: int,
+        cache: ImageLRUCache = page_image_cache,
+    ):
+        self.provider = provider
+        self.lowres_dpi = lowres_dpi
+        self.highres_dpi = highres_dpi
+        self.cache = cache
+        self.key = uuid.uuid4().hex
+        # Drop this source's images from the shared cache once the document is gone
+        weakref.finalize(self, cache.evict_owner, self.key)
+
+    def __deepcopy__(self, memo):
+        # Copies of a document share the same source and cached images
+        return self
+
+    def _dpi(self, highres: bool) -> int:
+        return self.highres_dpi if highres else self.lowres_dpi
+
+    def get_image(self, page_id: int, highres: bool = False) -> Image.Image:
+        return self.cache.get_or_render(
+            (self.key, page_id, highres),
+            lambda: self.provider.get_images([page_id], self._dpi(highres))[0],
+        )
+
+    def get_images(self, page_ids: List[int], highres: bool = False) -> List[Image.Image]:
+        """
+        Get several page images, rendering the uncached ones in a single provider call, which avoids reopening the
+        file once per page.  The images are returned as well as cached, so callers don't depend on them staying in
+        the cache.
+        """
+        images = {page_id: self.cache.get((self.key, page_id, highres)) for page_id in page_ids}
+        missing = [page_id for page_id, image in images.items() if image is None]
+        if missing:
+            rendered = self.provider.get_images(missing, self._dpi(highres))
+            for page_id, image in zip(missing, rendered):
+                self.cache.put((self.key, page_id, highres), image)
+                images[page_id] = image
+        return [images[page_id] for page_id in page_ids]
+
+    def get_image_size(self, page_id: int, highres: bool = False) -> Tuple[int, int]:
+        image = self.cache.get((self.key, page_id, highres))
+        if image is not None:
+            return image.size
+        return self.provider.get_image_size(page_id, self._dpi(highres))
+
+
+# The document name used for inputs that were never on disk
+IN_MEMORY_FILENAME = "document.pdf"
+
+
 class BaseProvider:
-    def __init__(self, filepath: str, config: Optional[BaseModel | dict] = None):
+    # Whether the provider can read the file contents as bytes, instead of from a path
+    accepts_bytes: bool = False
+
+    def __init__(self, filepath: str | bytes, config: Optional[BaseModel | dict] = None):
         assign_config(self, config)
         self.filepath = filepath
 
+    @property
+    def filename(self) -> str:
+        return self.filepath if isinstance(self.filepath, str) else IN_MEMORY_FILENAME
+
     def __len__(self):
         pass
 
     def get_images(self, idxs: List[int], dpi: int) -> List[Image.Image]:
         pass
 
+    def get_image_size(self, idx: int, dpi: int) -> Tuple[int, int]:
+        # The size get_images renders the page at, without rendering it
+        bbox = self.get_page_bbox(idx)
+        return math.ceil(bbox.width * dpi / 72), math.ceil(bbox.height * dpi / 72)
+
     def get_page_bbox(self, idx: int) -> PolygonBox | None:
         pass
 
+    def extract_pages(self, idxs: List[int]):
+        # Providers that defer reading the text layer load it here, before the pages are built
+        pass
+
     def get_page_lines(self, idx: int) -> List[Line]:
         pass
 
@@ -73,24 +156,6 @@ class BaseProvider:
 
     @staticmethod
     def get_font_css():
-        from weasyprint import CSS
-        from weasyprint.text.fonts import FontConfiguration
-
-        font_config = FontConfiguration()
-        css = CSS(
-            string=f"""
-            @font-face {{
-                font-family: GoNotoCurrent-Regular;
-                src: url({settings.FONT_PATH});
-                font-display: swap;
-            }}
-            body {{
-                font-family: {settings.FONT_NAME.split(".")[0]}, sans-serif;
-                font-variant-ligatures: none;
-                font-feature-settings: "liga" 0;
-                text-rendering: optimizeLegibility;
-            }}
-            """,
-            font_config=font_config,
-        )
-        return css
+        from marker.providers.html_render import font_css, stylesheet
+
+        return stylesheet(font_css())
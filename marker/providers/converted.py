@@ -0,0 +1,65 @@
+from typing import Annotated, Optional
+
+from marker.providers.html_render import font_css, html_to_pdf
+from marker.providers.pdf import PdfProvider
+from marker.util import assign_config
+from marker.utils.cache import DiskCache
+
+
+class ConvertedProvider(PdfProvider):
+    """
+    A provider for files that are converted to HTML, then rendered to a PDF with weasyprint.  The PDF stays in
+    memory, and rendered PDFs can be cached on disk, so repeated documents skip the render.
+    """
+
+    accepts_bytes = False
+    page_css: str = ""  # Stylesheet for the rendered pages, the font stylesheet is always added
+    use_base_url: bool = False  # Resolve relative links in the HTML against the input file
+
+    conversion_workers: Annotated[
+        int,
+        "The number of processes that render HTML to PDF.  Workers keep weasyprint and fonts loaded between documents.",
+        "Default is 0, which renders in-process.",
+    ] = 0
+    conversion_cache_dir: Annotated[
+        Optional[str],
+        "Directory to cache rendered PDFs in, keyed on the converted HTML.  Default is None, which disables the cache.",
+    ] = None
+    conversion_cache_size_mb: Annotated[
+        int,
+        "The maximum size of the rendered PDF cache on disk, in megabytes.",
+    ] = 1024
+
+    def __init__(self, filepath: str, config=None):
+        # Config is needed before the PDF provider is initialized, to convert the file
+        assign_config(self, config)
+        self.source_filepath = filepath
+
+        try:
+            pdf = self.convert_to_pdf(filepath)
+        except Exception as e:
+            raise RuntimeError(f"Failed to convert {filepath} to PDF: {e}") from e
+
+        super().__init__(pdf, config)
+
+    @property
+    def filename(self) -> str:
+        return self.source_filepath
+
+    def convert_to_html(self, filepath: str) -> str:
+        raise NotImplementedError
+
+    def convert_to_pdf(self, filepath: str) -> bytes:
+        html = self.convert_to_html(filepath)
+        stylesheets = [self.page_css, font_css()] if self.page_css else [font_css()]
+        cache = None
+        if self.conversion_cache_dir is not None:
+            cache = DiskCache(self.conversion_cache_dir, self.conversion_cache_size_mb * 1024 * 1024)
+
+        return html_to_pdf(
+            html,
+            stylesheets,
+            base_url=filepath if self.use_base_url else None,
+            workers=self.conversion_workers,
+            cache=cache,
+        )
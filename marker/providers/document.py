@@ -1,13 +1,12 @@
 import base64
-import os
 import re
-import tempfile
 from io import BytesIO
 
 from PIL import Image
 from marker.logger import get_logger
 
-from marker.providers.pdf import PdfProvider
+from marker.providers.converted import ConvertedProvider
+from marker.providers.dom import DomProvider
 
 logger = get_logger()
 
@@ -49,38 +48,21 @@ td {
 """
 
 
-class DocumentProvider(PdfProvider):
-    def __init__(self, filepath: str, config=None):
-        temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        self.temp_pdf_path = temp_pdf.name
-        temp_pdf.close()
+def docx_to_html(filepath: str | bytes) -> str:
+    import mammoth
 
-        # Convert DOCX to PDF
-        try:
-            self.convert_docx_to_pdf(filepath)
-        except Exception as e:
-            raise RuntimeError(f"Failed to convert {filepath} to PDF: {e}")
+    if isinstance(filepath, bytes):
+        return mammoth.convert_to_html(BytesIO(filepath)).value
 
-        # Initialize the PDF provider with the temp pdf path
-        super().__init__(self.temp_pdf_path, config)
+    with open(filepath, "rb") as docx_file:
+        return mammoth.convert_to_html(docx_file).value
 
-    def __del__(self):
-        if os.path.exists(self.temp_pdf_path):
-            os.remove(self.temp_pdf_path)
 
-    def convert_docx_to_pdf(self, filepath: str):
-        from weasyprint import CSS, HTML
-        import mammoth
+class DocumentProvider(ConvertedProvider):
+    page_css = css
 
-        with open(filepath, "rb") as docx_file:
-            # we convert the docx to HTML
-            result = mammoth.convert_to_html(docx_file)
-            html = result.value
-
-            # We convert the HTML into a PDF
-            HTML(string=self._preprocess_base64_images(html)).write_pdf(
-                self.temp_pdf_path, stylesheets=[CSS(string=css), self.get_font_css()]
-            )
+    def convert_to_html(self, filepath: str) -> str:
+        return self._preprocess_base64_images(docx_to_html(filepath))
 
     @staticmethod
     def _preprocess_base64_images(html_content):
@@ -102,3 +84,10 @@ class DocumentProvider(PdfProvider):
                 return ""  # we ditch broken images as that breaks the PDF creation down the line
 
         return re.sub(pattern, convert_image, html_content)
+
+
+class StructuredDocumentProvider(DomProvider):
+    accepts_bytes = True
+
+    def convert_to_html(self, filepath: str | bytes) -> str:
+        return docx_to_html(filepath)
@@ -0,0 +1,312 @@
+import base64
+import binascii
+import html
+import math
+import os
+from io import BytesIO
+from typing import Annotated, Callable, Iterator, List, Tuple
+from urllib.parse import unquote, urlparse
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import Comment, Declaration, Doctype, ProcessingInstruction
+from PIL import Image
+
+from marker.logger import get_logger
+from marker.providers.structured import StructuredCell, StructuredProvider
+from marker.schema import BlockTypes
+from marker.schema.groups.page import PageGroup
+from marker.schema.polygon import PolygonBox
+from marker.schema.registry import get_block_class
+
+logger = get_logger()
+
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+LIST_TAGS = {"ul", "ol"}
+IMAGE_TAGS = {"img", "image"}
+SKIPPED_TAGS = {"head", "title", "meta", "link", "script", "style", "noscript", "template", "button", "input", "form"}
+# Tags that hold blocks, instead of inline text
+BLOCK_TAGS = HEADING_TAGS | LIST_TAGS | IMAGE_TAGS | {
+    "p", "table", "pre", "figcaption", "hr", "div", "section", "article", "main", "header", "footer", "aside", "nav",
+    "figure", "blockquote", "body", "html", "dl", "dt", "dd", "li", "center", "address", "details", "summary",
+}
+
+# A block to place on a page, with its height and a function that adds it at a bbox
+DomElement = Tuple[float, Callable[[PageGroup, List[float]], None]]
+
+
+class DomProvider(StructuredProvider):
+    """
+    A provider for documents that convert to HTML.  Headings, paragraphs, lists, tables, code and images in the DOM
+    are mapped to blocks directly, and flowed onto synthetic pages, instead of rendering the HTML to a PDF and
+    recovering the structure with the layout model.
+    """
+
+    page_width: float = 595  # A4 in points, to match the rendered providers
+    page_height: float = 842
+    page_margin: float = 56
+    line_height: float = 14
+    chars_per_line: int = 95
+    block_spacing: float = 6
+    max_image_height: Annotated[
+        float,
+        "The tallest an image is laid out on a page, in points.  Only affects the synthetic block positions.",
+    ] = 400
+
+    def convert_to_html(self, filepath: str | bytes) -> str:
+        raise NotImplementedError
+
+    def build_pages(self) -> Iterator[PageGroup]:
+        soup = BeautifulSoup(self.convert_to_html(self.filepath), "html.parser")
+        content_bbox = [self.page_margin, self.page_margin, self.page_width - self.page_margin, self.page_height - self.page_margin]
+
+        page_id = 0
+        page = self.new_page(page_id, [0, 0, self.page_width, self.page_height])
+        y = content_bbox[1]
+        for height, add in self.iter_elements(soup):
+            height = min(height, content_bbox[3] - content_bbox[1])
+            if y + height > content_bbox[3] and page.children:
+                yield page
+                page_id += 1
+                page = self.new_page(page_id, [0, 0, self.page_width, self.page_height])
+                y = content_bbox[1]
+
+            add(page, [content_bbox[0], y, content_bbox[2], y + height])
+            y += height + self.block_spacing
+        yield page
+
+    def text_height(self, text: str) -> float:
+        lines = sum(max(1, math.ceil(len(line) / self.chars_per_line)) for line in text.split("\n"))
+        return lines * self.line_height
+
+    def iter_elements(self, element: Tag, blockquote_level: int = 0) -> Iterator[DomElement]:
+        inline = []
+        for child in element.children:
+            if isinstance(child, (Comment, Declaration, Doctype, ProcessingInstruction)):
+                continue
+            if isinstance(child, NavigableString):
+                inline.append(html.escape(str(child)))
+                continue
+            if not isinstance(child, Tag) or child.name in SKIPPED_TAGS:
+                continue
+
+            if child.name not in BLOCK_TAGS and child.find(BLOCK_TAGS) is None:
+                inline.append(str(child))
+                continue
+
+            yield from self.text_element("".join(inline), blockquote_level)
+            inline = []
+
+            if child.name in HEADING_TAGS:
+                yield from self.heading_element(child)
+            elif child.name == "p" and child.find(BLOCK_TAGS - IMAGE_TAGS) is None:
+                images = [image.extract() for image in child.find_all(IMAGE_TAGS)]
+                yield from self.text_element(child.decode_contents(), blockquote_level)
+                for image in images:
+                    yield from self.image_element(image)
+            elif child.name in LIST_TAGS:
+                yield from self.list_element(child)
+            elif child.name == "table":
+                yield from self.table_element(child)
+            elif child.name in IMAGE_TAGS:
+                yield from self.image_element(child)
+            elif child.name == "pre":
+                yield from self.code_element(child)
+            elif child.name == "figcaption":
+                yield from self.caption_element(child.decode_contents())
+            elif child.name == "hr":
+                continue
+            else:
+                level = blockquote_level + 1 if child.name == "blockquote" else blockquote_level
+                yield from self.iter_elements(child, level)
+
+        yield from self.text_element("".join(inline), blockquote_level)
+
+    def text_element(self, content: str, blockquote_level: int = 0) -> Iterator[DomElement]:
+        text = BeautifulSoup(content, "html.parser").get_text(" ", strip=True)
+        if not text:
+            return
+
+        content = " ".join(content.split())
+        block_html = "<blockquote>" * blockquote_level + f"<p>{content}</p>" + "</blockquote>" * blockquote_level
+
+        def add(page: PageGroup, bbox: List[float]):
+            TextClass = get_block_class(BlockTypes.Text)
+            self.add_block(page, TextClass(polygon=PolygonBox.from_bbox(bbox), page_id=page.page_id, html=block_html))
+
+        yield self.text_height(text), add
+
+    def heading_element(self, tag: Tag) -> Iterator[DomElement]:
+        text = tag.get_text(" ", strip=True)
+        if not text:
+            return
+
+        level = int(tag.name[1])
+        block_html = f"<h{level}>{' '.join(tag.decode_contents().split())}</h{level}>"
+
+        def add(page: PageGroup, bbox: List[float]):
+            SectionHeaderClass = get_block_class(BlockTypes.SectionHeader)
+            self.add_block(page, SectionHeaderClass(
+                polygon=PolygonBox.from_bbox(bbox),
+                page_id=page.page_id,
+                heading_level=level,
+                html=block_html,
+            ))
+
+        yield self.text_height(text) + self.line_height, add
+
+    def caption_element(self, content: str) -> Iterator[DomElement]:
+        text = BeautifulSoup(content, "html.parser").get_text(" ", strip=True)
+        if not text:
+            return
+
+        block_html = f"<p>{' '.join(content.split())}</p>"
+
+        def add(page: PageGroup, bbox: List[float]):
+            CaptionClass = get_block_class(BlockTypes.Caption)
+            self.add_block(page, CaptionClass(polygon=PolygonBox.from_bbox(bbox), page_id=page.page_id, html=block_html))
+
+        yield self.text_height(text), add
+
+    def code_element(self, tag: Tag) -> Iterator[DomElement]:
+        code = tag.get_text().strip("\n")
+        if not code.strip():
+            return
+
+        def add(page: PageGroup, bbox: List[float]):
+            CodeClass = get_block_class(BlockTypes.Code)
+            self.add_block(page, CodeClass(polygon=PolygonBox.from_bbox(bbox), page_id=page.page_id, code=code))
+
+        yield len(code.split("\n")) * self.line_height, add
+
+    def list_items(self, tag: Tag, level: int = 0) -> List[Tuple[int, str, str]]:
+        items = []
+        for li in tag.find_all("li", recursive=False):
+            nested = [nested.extract() for nested in li.find_all(LIST_TAGS)]
+            text = li.get_text(" ", strip=True)
+            if text:
+                items.append((level, " ".join(li.decode_contents().split()), text))
+            for nested_list in nested:
+                items.extend(self.list_items(nested_list, level + 1))
+        return items
+
+    def list_element(self, tag: Tag) -> Iterator[DomElement]:
+        items = self.list_items(tag)
+        if not items:
+            return
+
+        heights = [self.text_height(text) for _, _, text in items]
+
+        def add(page: PageGroup, bbox: List[float]):
+            ListGroupClass = get_block_class(BlockTypes.ListGroup)
+            ListItemClass = get_block_class(BlockTypes.ListItem)
+            group = self.add_block(page, ListGroupClass(polygon=PolygonBox.from_bbox(bbox), page_id=page.page_id))
+
+            # Items share the group height in proportion to their text, since the group may have been clamped to the page
+            scale = (bbox[3] - bbox[1]) / sum(heights)
+            y = bbox[1]
+            for (level, item_html, _), height in zip(items, heights):
+                item_bbox = [bbox[0] + level * 18, y, bbox[2], y + height * scale]
+                self.add_block(page, ListItemClass(
+                    polygon=PolygonBox.from_bbox(item_bbox),
+                    page_id=page.page_id,
+                    html=item_html,
+                    list_indent_level=level,
+                ), parent=group)
+                y = item_bbox[3]
+
+        yield sum(heights), add
+
+    def table_cells(self, tag: Tag) -> List[StructuredCell]:
+        rows = [row for row in tag.find_all("tr") if row.find_parent("table") is tag]
+        occupied = set()
+        cells = []
+        for row_id, row in enumerate(rows):
+            col_id = 0
+            for cell in row.find_all(["td", "th"], recursive=False):
+                while (row_id, col_id) in occupied:
+                    col_id += 1
+
+                rowspan = max(1, min(parse_span(cell.get("rowspan")), len(rows) - row_id))
+                colspan = max(1, parse_span(cell.get("colspan")))
+                occupied.update(
+                    (r, c) for r in range(row_id, row_id + rowspan) for c in range(col_id, col_id + colspan)
+                )
+                text = cell.get_text("\n", strip=True)
+                cells.append(StructuredCell(
+                    row_id=row_id,
+                    col_id=col_id,
+                    text_lines=[html.escape(line) for line in text.split("\n") if line.strip()],
+                    rowspan=rowspan,
+                    colspan=colspan,
+                    is_header=cell.name == "th",
+                ))
+                col_id += colspan
+        return cells
+
+    def table_element(self, tag: Tag) -> Iterator[DomElement]:
+        caption = tag.find("caption")
+        if caption is not None and caption.find_parent("table") is tag:
+            yield from self.caption_element(caption.decode_contents())
+
+        cells = self.table_cells(tag)
+        if not cells:
+            return
+
+        row_count = max(cell.row_id + cell.rowspan for cell in cells)
+
+        def add(page: PageGroup, bbox: List[float]):
+            self.add_table(page, bbox, cells)
+
+        yield row_count * self.line_height * 1.5, add
+
+    def image_element(self, tag: Tag) -> Iterator[DomElement]:
+        src = tag.get("src") or tag.get("xlink:href") or tag.get("href")
+        image = self.load_image(src) if src else None
+        if image is None:
+            return
+
+        content_width = self.page_width - 2 * self.page_margin
+        width = min(content_width, image.width * 0.75)  # CSS pixels to points
+        height = min(self.max_image_height, image.height * width / image.width)
+
+        def add(page: PageGroup, bbox: List[float]):
+            PictureClass = get_block_class(BlockTypes.Picture)
+            self.add_block(page, PictureClass(
+                polygon=PolygonBox.from_bbox([bbox[0], bbox[1], bbox[0] + width, bbox[3]]),
+                page_id=page.page_id,
+                lowres_image=image,
+                highres_image=image,
+            ))
+
+        yield height, add
+
+    def load_image(self, src: str) -> Image.Image | None:
+        """
+        Load an image from a data URI, or from a local file next to the input.  Remote images are skipped.
+        """
+        try:
+            if src.startswith("data:"):
+                _, data = src.split(",", 1)
+                image = Image.open(BytesIO(base64.b64decode(data)))
+            else:
+                if urlparse(src).scheme or not isinstance(self.filepath, str):
+                    return None
+                path = os.path.join(os.path.dirname(self.filepath), unquote(src))
+                if not os.path.isfile(path):
+                    return None
+                image = Image.open(path)
+            image.load()
+        except (ValueError, binascii.Error, OSError) as e:
+            logger.warning(f"Could not load image {src[:64]}: {e}")
+            return None
+
+        if image.width == 0 or image.height == 0:
+            return None
+        return image.convert("RGB")
+
+
+def parse_span(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 1
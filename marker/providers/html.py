@@ -1,32 +1,24 @@
-import os
-import tempfile
+from marker.providers.converted import ConvertedProvider
+from marker.providers.dom import DomProvider
 
-from marker.providers.pdf import PdfProvider
 
+def read_html(filepath: str | bytes) -> str:
+    if isinstance(filepath, bytes):
+        return filepath.decode("utf-8")
 
-class HTMLProvider(PdfProvider):
-    def __init__(self, filepath: str, config=None):
-        temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        self.temp_pdf_path = temp_pdf.name
-        temp_pdf.close()
+    with open(filepath, "r", encoding="utf-8") as f:
+        return f.read()
 
-        # Convert HTML to PDF
-        try:
-            self.convert_html_to_pdf(filepath)
-        except Exception as e:
-            raise RuntimeError(f"Failed to convert {filepath} to PDF: {e}")
 
-        # Initialize the PDF provider with the temp pdf path
-        super().__init__(self.temp_pdf_path, config)
+class HTMLProvider(ConvertedProvider):
+    use_base_url = True
 
-    def __del__(self):
-        if os.path.exists(self.temp_pdf_path):
-            os.remove(self.temp_pdf_path)
+    def convert_to_html(self, filepath: str) -> str:
+        return read_html(filepath)
 
-    def convert_html_to_pdf(self, filepath: str):
-        from weasyprint import HTML
 
-        font_css = self.get_font_css()
-        HTML(filename=filepath, encoding="utf-8").write_pdf(
-            self.temp_pdf_path, stylesheets=[font_css]
-        )
+class StructuredHTMLProvider(DomProvider):
+    accepts_bytes = True
+
+    def convert_to_html(self, filepath: str | bytes) -> str:
+        return read_html(filepath)
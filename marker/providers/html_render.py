@@ -0,0 +1,96 @@
+import hashlib
+import json
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from typing import Optional, Sequence, Tuple
+
+from marker.providers.pdf_render import get_render_executor
+from marker.settings import settings
+from marker.utils.cache import DiskCache
+
+
+def font_css() -> str:
+    return f"""
+            @font-face {{
+                font-family: GoNotoCurrent-Regular;
+                src: url({settings.FONT_PATH});
+                font-display: swap;
+            }}
+            body {{
+                font-family: {settings.FONT_NAME.split(".")[0]}, sans-serif;
+                font-variant-ligatures: none;
+                font-feature-settings: "liga" 0;
+                text-rendering: optimizeLegibility;
+            }}
+            """
+
+
+@lru_cache(maxsize=1)
+def font_config():
+    # Loading fonts is a large part of a small render, so one configuration is kept for the whole process
+    from weasyprint.text.fonts import FontConfiguration
+
+    return FontConfiguration()
+
+
+@lru_cache(maxsize=32)
+def stylesheet(css: str):
+    from weasyprint import CSS
+
+    return CSS(string=css, font_config=font_config())
+
+
+def render_html(html: str, stylesheets: Tuple[str, ...], base_url: Optional[str] = None) -> bytes:
+    """
+    Render HTML to PDF bytes.  Parsed stylesheets and fonts stay loaded, so later documents in the same process skip
+    that work.
+    """
+    from weasyprint import HTML
+
+    return HTML(string=html, base_url=base_url).write_pdf(
+        stylesheets=[stylesheet(css) for css in stylesheets]
+    )
+
+
+def render_cache_key(html: str, stylesheets: Sequence[str], base_url: Optional[str]) -> str:
+    try:
+        weasyprint_version = version("weasyprint")
+    except PackageNotFoundError:
+        weasyprint_version = None
+
+    key_data = json.dumps(
+        {
+            "html": hashlib.sha256(html.encode()).hexdigest(),
+            "stylesheets": list(stylesheets),
+            "base_url": base_url,
+            "weasyprint": weasyprint_version,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(key_data.encode()).hexdigest()
+
+
+def html_to_pdf(
+    html: str,
+    stylesheets: Sequence[str],
+    base_url: Optional[str] = None,
+    workers: int = 0,
+    cache: Optional[DiskCache] = None,
+) -> bytes:
+    """
+    Convert HTML to PDF bytes, reusing a cached PDF for HTML that was rendered before.  With workers, the render runs
+    in the shared pool of warm worker processes instead of in this process.
+    """
+    stylesheets = tuple(stylesheets)
+    key = render_cache_key(html, stylesheets, base_url) if cache is not None else None
+    if key is not None and (pdf := cache.get(key)) is not None:
+        return pdf
+
+    if workers > 0:
+        pdf = get_render_executor(workers).submit(render_html, html, stylesheets, base_url).result()
+    else:
+        pdf = render_html(html, stylesheets, base_url)
+
+    if key is not None:
+        cache.put(key, pdf)
+    return pdf
@@ -1,4 +1,5 @@
-from typing import List, Annotated
+import io
+from typing import List, Annotated, Tuple
 from PIL import Image
 
 from marker.providers import ProviderPageLines, BaseProvider
@@ -8,37 +9,83 @@ from pdftext.schema import Reference
 
 
 class ImageProvider(BaseProvider):
+    """
+    A provider for image files, with one page per frame, so multi-page TIFFs work.  Only the frame headers are read
+    upfront.  Frames are decoded when their page image is requested and aren't kept, and scans above the requested
+    DPI are downsampled to it.
+    """
+
+    accepts_bytes = True
     page_range: Annotated[
         List[int],
         "The range of pages to process.",
         "Default is None, which will process all pages.",
     ] = None
+    image_dpi: Annotated[
+        int,
+        "The resolution to assume for images that don't record one.",
+    ] = 72
 
-    image_count: int = 1
-
-    def __init__(self, filepath: str, config=None):
+    def __init__(self, filepath: str | bytes, config=None):
         super().__init__(filepath, config)
 
-        self.images = [Image.open(filepath)]
-        self.page_lines: ProviderPageLines = {i: [] for i in range(self.image_count)}
+        with self.open_image() as image:
+            self.image_count = getattr(image, "n_frames", 1)
+            if self.page_range is None:
+                self.page_range = range(self.image_count)
 
-        if self.page_range is None:
-            self.page_range = range(self.image_count)
+            assert max(self.page_range) < self.image_count and min(self.page_range) >= 0, (
+                f"Invalid page range, values must be between 0 and {self.image_count - 1}.  Min of provided page range is {min(self.page_range)} and max is {max(self.page_range)}."
+            )
 
-        assert max(self.page_range) < self.image_count and min(self.page_range) >= 0, (
-            f"Invalid page range, values must be between 0 and {len(self.doc) - 1}.  Min of provided page range is {min(self.page_range)} and max is {max(self.page_range)}."
-        )
+            # Seeking to a frame reads its header, the pixels are only decoded in get_images
+            self.frame_dpis = {}
+            self.frame_sizes = {}
+            self.page_bboxes = {}
+            for i in self.page_range:
+                image.seek(i)
+                dpi = self.frame_dpi(image)
+                self.frame_dpis[i] = dpi
+                self.frame_sizes[i] = image.size
+                self.page_bboxes[i] = [0, 0, image.size[0] * 72 / dpi, image.size[1] * 72 / dpi]
 
-        self.page_bboxes = {
-            i: [0, 0, self.images[i].size[0], self.images[i].size[1]]
-            for i in self.page_range
-        }
+        self.page_lines: ProviderPageLines = {i: [] for i in self.page_range}
 
     def __len__(self):
         return self.image_count
 
+    def open_image(self) -> Image.Image:
+        if isinstance(self.filepath, bytes):
+            return Image.open(io.BytesIO(self.filepath))
+        return Image.open(self.filepath)
+
+    def frame_dpi(self, image: Image.Image) -> float:
+        dpi = image.info.get("dpi")
+        if dpi and dpi[0] and float(dpi[0]) > 1:
+            return float(dpi[0])
+        return self.image_dpi
+
+    def get_image_size(self, idx: int, dpi: int) -> Tuple[int, int]:
+        # Images are never upsampled, only scans above the requested DPI are made smaller
+        scale = min(1.0, dpi / self.frame_dpis[idx])
+        width, height = self.frame_sizes[idx]
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
     def get_images(self, idxs: List[int], dpi: int) -> List[Image.Image]:
-        return [self.images[i] for i in idxs]
+        images = []
+        with self.open_image() as image:
+            for idx in idxs:
+                image.seek(idx)
+                size = self.get_image_size(idx, dpi)
+                if size != image.size:
+                    # JPEGs can decode straight to a smaller size
+                    image.draft("RGB", size)
+
+                frame = image.convert("RGB")
+                if frame.size != size:
+                    frame = frame.resize(size, Image.Resampling.LANCZOS)
+                images.append(frame)
+        return images
 
     def get_page_bbox(self, idx: int) -> PolygonBox | None:
         bbox = self.page_bboxes[idx]
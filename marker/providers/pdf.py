@@ -1,26 +1,26 @@
 import contextlib
-import ctypes
 import logging
 import re
-from typing import Annotated, Dict, List, Optional, Set
+from typing import Annotated, Dict, List, Optional, Set, Tuple
 
 import pypdfium2 as pdfium
-import pypdfium2.raw as pdfium_c
 from ftfy import fix_text
-from pdftext.extraction import dictionary_output
-from pdftext.schema import Reference
-from pdftext.pdf.utils import flatten as flatten_pdf_page
+from pdftext.pdf.links import merge_links
+from pdftext.schema import Page, PageReference, Reference
 
 from PIL import Image
-from pypdfium2 import PdfiumError, PdfDocument
+from pypdfium2 import PdfDocument
 
 from marker.providers import BaseProvider, ProviderOutput, Char, ProviderPageLines
+from marker.providers.pdf_render import render_page, render_pages_parallel
+from marker.providers.pdf_scan import PageScan, finalize_pages, scan_document, scan_pages_parallel
 from marker.providers.utils import alphanum_ratio
 from marker.schema import BlockTypes
 from marker.schema.polygon import PolygonBox
 from marker.schema.registry import get_block_class
 from marker.schema.text.line import Line
 from marker.schema.text.span import Span
+from marker.schema.text.store import CharStore
 
 # Ignore pypdfium2 warning about form flattening
 logging.getLogger("pypdfium2").setLevel(logging.ERROR)
@@ -28,9 +28,11 @@ logging.getLogger("pypdfium2").setLevel(logging.ERROR)
 
 class PdfProvider(BaseProvider):
     """
-    A provider for PDF files.
+    A provider for PDF files.  The PDF can be a path or the file contents as bytes, which are never written to disk.
     """
 
+    accepts_bytes = True
+
     page_range: Annotated[
         List[int],
         "The range of pages to process.",
@@ -38,7 +40,20 @@ class PdfProvider(BaseProvider):
     ] = None
     pdftext_workers: Annotated[
         int,
-        "The number of workers to use for pdftext.",
+        "The number of processes to scan pages and extract text with.",
+    ] = 4
+    pdftext_min_pages_per_worker: Annotated[
+        int,
+        "The minimum number of pages each scan process gets, smaller documents are scanned in-process.",
+    ] = 10
+    render_workers: Annotated[
+        int,
+        "The number of processes to render page images with.  Each process opens its own copy of the PDF.",
+        "Default is 1, which renders in-process.",
+    ] = 1
+    render_min_pages_per_worker: Annotated[
+        int,
+        "The minimum number of pages each render process gets, smaller requests are rendered in-process.",
     ] = 4
     flatten_pdf: Annotated[
         bool,
@@ -80,11 +95,24 @@ class PdfProvider(BaseProvider):
         bool,
         "Whether to keep character-level information in the output.",
     ] = False
+    compact_chars: Annotated[
+        bool,
+        "When keeping characters, store them in a columnar per-page store instead of as individual blocks.",
+        "This uses much less memory on dense pages.",
+    ] = False
+    defer_text_extraction: Annotated[
+        bool,
+        "Only extract the text of pages when `extract_pages` is called for them, instead of the whole page range upfront.",
+        "Used when converting in page windows, so the text held depends on the window size.",
+    ] = False
 
-    def __init__(self, filepath: str, config=None):
+    def __init__(self, filepath: str | bytes, config=None):
         super().__init__(filepath, config)
 
         self.filepath = filepath
+        self.page_bboxes: Dict[int, List[float]] = {}
+        # Links can point to pages in other windows, so references are collected across extractions
+        self.page_references = PageReference()
 
         with self.get_doc() as doc:
             self.page_count = len(doc)
@@ -103,8 +131,8 @@ class PdfProvider(BaseProvider):
             if self.force_ocr:
                 # Manually assign page bboxes, since we can't get them from pdftext
                 self.page_bboxes = {i: doc[i].get_bbox() for i in self.page_range}
-            else:
-                self.page_lines = self.pdftext_extraction(doc)
+            elif not self.defer_text_extraction:
+                self.page_lines.update(self.pdftext_extraction(doc, list(self.page_range)))
 
     @contextlib.contextmanager
     def get_doc(self):
@@ -199,21 +227,51 @@ class PdfProvider(BaseProvider):
             text = text.replace(space, " ")
         return text
 
-    def pdftext_extraction(self, doc: PdfDocument) -> ProviderPageLines:
+    def extract_pages(self, idxs: List[int]):
+        """
+        Extract the text of pages that haven't been extracted yet, when `defer_text_extraction` is set.  A link from
+        these pages back to an earlier page only gets an anchor on that page if it hasn't been built yet.
+        """
+        page_ids = [idx for idx in idxs if idx not in self.page_bboxes]
+        if self.force_ocr or not page_ids:
+            return
+
+        with self.get_doc() as doc:
+            self.page_lines.update(self.pdftext_extraction(doc, page_ids))
+
+    def scan_pages(
+        self, doc: PdfDocument, page_ids: List[int] | None = None
+    ) -> Tuple[List[Page], Dict[int, PageScan]]:
+        """
+        Classify pages and extract their text in one pass, split across processes for long documents.  Defaults
+        to the whole page range.
+        """
+        if page_ids is None:
+            page_ids = list(self.page_range)
+        workers = min(self.pdftext_workers, len(page_ids) // max(1, self.pdftext_min_pages_per_worker))
+        if workers > 1:
+            pages, scans = scan_pages_parallel(
+                self.filepath, page_ids, self.flatten_pdf, self.strip_existing_ocr, workers
+            )
+        else:
+            pages, scans = scan_document(doc, page_ids, self.flatten_pdf, self.strip_existing_ocr)
+
+        # Links can point across pages, so they are added once all pages are back, before the pages are finalized
+        if not self.disable_links:
+            for page in pages:
+                merge_links(page, doc, self.page_references)
+            for page in pages:
+                page["refs"] = self.page_references.get_refs(page["page"])
+        finalize_pages(pages, self.keep_chars)
+        return pages, {scan.page_id: scan for scan in scans}
+
+    def pdftext_extraction(self, doc: PdfDocument, page_ids: List[int]) -> ProviderPageLines:
         page_lines: ProviderPageLines = {}
-        page_char_blocks = dictionary_output(
-            self.filepath,
-            page_range=self.page_range,
-            keep_chars=self.keep_chars,
-            workers=self.pdftext_workers,
-            flatten_pdf=self.flatten_pdf,
-            quote_loosebox=False,
-            disable_links=self.disable_links,
-        )
-        self.page_bboxes = {
+        page_char_blocks, page_scans = self.scan_pages(doc, page_ids)
+        self.page_bboxes.update({
             i: [0, 0, page["width"], page["height"]]
-            for i, page in zip(self.page_range, page_char_blocks)
-        }
+            for i, page in zip(page_ids, page_char_blocks)
+        })
 
         SpanClass: Span = get_block_class(BlockTypes.Span)
         LineClass: Line = get_block_class(BlockTypes.Line)
@@ -222,10 +280,12 @@ class PdfProvider(BaseProvider):
         for page in page_char_blocks:
             page_id = page["page"]
             lines: List[ProviderOutput] = []
-            if not self.check_page(page_id, doc):
+            if not self.check_page(page_scans[page_id]):
                 continue
 
-            for block in page["blocks"]:
+            char_store = CharStore(page_id) if self.compact_chars else None
+
+            for block_idx, block in enumerate(page["blocks"]):
                 for line in block["lines"]:
                     spans: List[Span] = []
                     chars: List[List[Char]] = []
@@ -265,7 +325,15 @@ class PdfProvider(BaseProvider):
                             )
                         )
 
-                        if self.keep_chars:
+                        if self.keep_chars and char_store is not None:
+                            chars.append(
+                                char_store.add(
+                                    [c["char"] for c in span["chars"]],
+                                    [c["bbox"] for c in span["chars"]],
+                                    [c["char_idx"] for c in span["chars"]],
+                                )
+                            )
+                        elif self.keep_chars:
                             span_chars = [
                                 CharClass(
                                     text=c["char"],
@@ -292,8 +360,12 @@ class PdfProvider(BaseProvider):
                             line=LineClass(polygon=polygon, page_id=page_id),
                             spans=spans,
                             chars=chars,
+                            block_idx=block_idx,
                         )
                     )
+            if char_store is not None:
+                char_store.finalize()
+
             if self.check_line_spans(lines):
                 page_lines[page_id] = lines
 
@@ -318,61 +390,21 @@ class PdfProvider(BaseProvider):
             return False
         return True
 
-    def check_page(self, page_id: int, doc: PdfDocument) -> bool:
-        page = doc.get_page(page_id)
-        page_bbox = PolygonBox.from_bbox(page.get_bbox())
-        try:
-            page_objs = list(
-                page.get_objects(
-                    filter=[pdfium_c.FPDF_PAGEOBJ_TEXT, pdfium_c.FPDF_PAGEOBJ_IMAGE]
-                )
-            )
-        except PdfiumError:
-            # Happens when pdfium fails to get the number of page objects
-            return False
-
+    def check_page(self, scan: PageScan) -> bool:
         # if we do not see any text objects in the pdf, we can skip this page
-        if not any([obj.type == pdfium_c.FPDF_PAGEOBJ_TEXT for obj in page_objs]):
+        if not scan.readable or not scan.has_text:
             return False
 
         if self.strip_existing_ocr:
-            # If any text objects on the page are in invisible render mode, skip this page
-            for text_obj in filter(
-                lambda obj: obj.type == pdfium_c.FPDF_PAGEOBJ_TEXT, page_objs
-            ):
-                if pdfium_c.FPDFTextObj_GetTextRenderMode(text_obj) in [
-                    pdfium_c.FPDF_TEXTRENDERMODE_INVISIBLE,
-                    pdfium_c.FPDF_TEXTRENDERMODE_UNKNOWN,
-                ]:
-                    return False
-
-            non_embedded_fonts = []
-            empty_fonts = []
-            font_map = {}
-            for text_obj in filter(
-                lambda obj: obj.type == pdfium_c.FPDF_PAGEOBJ_TEXT, page_objs
-            ):
-                font = pdfium_c.FPDFTextObj_GetFont(text_obj)
-                font_name = self._get_fontname(font)
-
-                # we also skip pages without embedded fonts and fonts without names
-                non_embedded_fonts.append(pdfium_c.FPDFFont_GetIsEmbedded(font) == 0)
-                empty_fonts.append(
-                    "glyphless" in font_name.lower()
-                )  # Add font name check back in when we bump pypdfium2
-                if font_name not in font_map:
-                    font_map[font_name or "Unknown"] = font
-
-            if all(non_embedded_fonts) or all(empty_fonts):
+            # Skip pages with text in invisible render mode, and pages without embedded or named fonts
+            if scan.invisible_text:
+                return False
+            if not scan.fonts_embedded or not scan.fonts_named:
                 return False
 
             # if we see very large images covering most of the page, we can skip this page
-            for img_obj in filter(
-                lambda obj: obj.type == pdfium_c.FPDF_PAGEOBJ_IMAGE, page_objs
-            ):
-                img_bbox = PolygonBox.from_bbox(img_obj.get_pos())
-                if page_bbox.intersection_pct(img_bbox) >= self.image_threshold:
-                    return False
+            if scan.image_coverage >= self.image_threshold:
+                return False
 
         return True
 
@@ -404,15 +436,15 @@ class PdfProvider(BaseProvider):
     def _render_image(
         pdf: pdfium.PdfDocument, idx: int, dpi: int, flatten_page: bool
     ) -> Image.Image:
-        page = pdf[idx]
-        if flatten_page:
-            flatten_pdf_page(page)
-            page = pdf[idx]
-        image = page.render(scale=dpi / 72, draw_annots=False).to_pil()
-        image = image.convert("RGB")
-        return image
+        return render_page(pdf, idx, dpi, flatten_page)
 
     def get_images(self, idxs: List[int], dpi: int) -> List[Image.Image]:
+        workers = min(self.render_workers, len(idxs) // max(1, self.render_min_pages_per_worker))
+        if workers > 1:
+            return render_pages_parallel(
+                self.filepath, list(idxs), dpi, self.flatten_pdf, workers
+            )
+
         with self.get_doc() as doc:
             images = [
                 self._render_image(doc, idx, dpi, self.flatten_pdf) for idx in idxs
@@ -429,24 +461,3 @@ class PdfProvider(BaseProvider):
 
     def get_page_refs(self, idx: int) -> List[Reference]:
         return self.page_refs[idx]
-
-    @staticmethod
-    def _get_fontname(font) -> str:
-        font_name = ""
-        buffer_size = 256
-
-        try:
-            font_name_buffer = ctypes.create_string_buffer(buffer_size)
-            length = pdfium_c.FPDFFont_GetBaseFontName(
-                font, font_name_buffer, buffer_size
-            )
-            if length < buffer_size:
-                font_name = font_name_buffer.value.decode("utf-8")
-            else:
-                font_name_buffer = ctypes.create_string_buffer(length)
-                pdfium_c.FPDFFont_GetBaseFontName(font, font_name_buffer, length)
-                font_name = font_name_buffer.value.decode("utf-8")
-        except Exception:
-            pass
-
-        return font_name
@@ -0,0 +1,117 @@
+import atexit
+import math
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Dict, List, Tuple
+
+import pypdfium2 as pdfium
+from pdftext.pdf.utils import flatten as flatten_pdf_page
+from PIL import Image
+
+# (page index, width, height, byte offset) for each page in a shared memory block
+PageLayout = Tuple[int, int, int, int]
+
+_executors: Dict[int, ProcessPoolExecutor] = {}
+
+
+def render_page(
+    pdf: pdfium.PdfDocument, idx: int, dpi: int, flatten_page: bool
+) -> Image.Image:
+    page = pdf[idx]
+    if flatten_page:
+        flatten_pdf_page(page)
+        page = pdf[idx]
+    image = page.render(scale=dpi / 72, draw_annots=False).to_pil()
+    image = image.convert("RGB")
+    return image
+
+
+def _render_worker(
+    filepath: str, idxs: List[int], dpi: int, flatten_pdf: bool
+) -> Tuple[str, List[PageLayout]]:
+    # Each worker opens its own document, since pdfium handles can't be shared across threads or processes
+    doc = pdfium.PdfDocument(filepath)
+    try:
+        if flatten_pdf:
+            doc.init_forms()
+        images = [render_page(doc, idx, dpi, flatten_pdf) for idx in idxs]
+    finally:
+        doc.close()
+
+    # Pixels go back through shared memory, which avoids pickling every image
+    total_bytes = sum(image.width * image.height * 3 for image in images)
+    shm = shared_memory.SharedMemory(create=True, size=max(total_bytes, 1))
+    layout = []
+    offset = 0
+    for idx, image in zip(idxs, images):
+        data = image.tobytes()
+        shm.buf[offset : offset + len(data)] = data
+        layout.append((idx, image.width, image.height, offset))
+        offset += len(data)
+
+    name = shm.name
+    shm.close()
+    return name, layout
+
+
+def _read_images(name: str, layout: List[PageLayout]) -> Dict[int, Image.Image]:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        images = {}
+        for idx, width, height, offset in layout:
+            size = width * height * 3
+            # frombytes copies the pixels, so the block can be released right away
+            images[idx] = Image.frombytes(
+                "RGB", (width, height), bytes(shm.buf[offset : offset + size])
+            )
+    finally:
+        shm.close()
+        shm.unlink()
+    return images
+
+
+def get_render_executor(workers: int) -> ProcessPoolExecutor:
+    # Pools are reused across documents, so worker startup is only paid once per process
+    if workers not in _executors:
+        _executors[workers] = ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context("spawn")
+        )
+    return _executors[workers]
+
+
+@atexit.register
+def shutdown_render_executors():
+    for executor in _executors.values():
+        executor.shutdown(wait=False, cancel_futures=True)
+    _executors.clear()
+
+
+def render_pages_parallel(
+    filepath: str, idxs: List[int], dpi: int, flatten_pdf: bool, workers: int
+) -> List[Image.Image]:
+    """
+    Render pages across a pool of worker processes, splitting the pages into one contiguous chunk per worker.
+    """
+    executor = get_render_executor(workers)
+    chunk_size = math.ceil(len(idxs) / workers)
+    futures = [
+        executor.submit(
+            _render_worker, filepath, idxs[i : i + chunk_size], dpi, flatten_pdf
+        )
+        for i in range(0, len(idxs), chunk_size)
+    ]
+
+    results, error = [], None
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            error = error or e
+
+    # Always read back the finished chunks, so their shared memory is released even if another chunk failed
+    images = {}
+    for name, layout in results:
+        images.update(_read_images(name, layout))
+    if error is not None:
+        raise error
+    return [images[idx] for idx in idxs]
@@ -0,0 +1,174 @@
+import ctypes
+import math
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+from pdftext.pdf.pages import get_pages
+from pdftext.postprocessing import handle_hyphens, postprocess_text
+from pdftext.schema import Page
+from pypdfium2 import PdfiumError
+
+from marker.providers.pdf_render import get_render_executor
+from marker.schema.polygon import PolygonBox
+
+
+@dataclass
+class PageScan:
+    """
+    What one pass over a page's objects found, used to decide whether its text layer can be trusted.
+    """
+
+    page_id: int
+    readable: bool = True  # False when pdfium can't enumerate the page objects
+    has_text: bool = False
+    invisible_text: bool = False
+    fonts_embedded: bool = True  # At least one font is embedded
+    fonts_named: bool = True  # At least one font is not a glyphless OCR font
+    image_coverage: float = 0  # The largest share of the page covered by one image
+
+
+def get_font_name(font) -> str:
+    font_name = ""
+    buffer_size = 256
+
+    try:
+        font_name_buffer = ctypes.create_string_buffer(buffer_size)
+        length = pdfium_c.FPDFFont_GetBaseFontName(font, font_name_buffer, buffer_size)
+        if length < buffer_size:
+            font_name = font_name_buffer.value.decode("utf-8")
+        else:
+            font_name_buffer = ctypes.create_string_buffer(length)
+            pdfium_c.FPDFFont_GetBaseFontName(font, font_name_buffer, length)
+            font_name = font_name_buffer.value.decode("utf-8")
+    except Exception:
+        pass
+
+    return font_name
+
+
+def classify_page(doc: pdfium.PdfDocument, page_id: int, inspect_fonts: bool) -> PageScan:
+    scan = PageScan(page_id=page_id)
+    page = doc.get_page(page_id)
+    try:
+        page_objs = list(
+            page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_TEXT, pdfium_c.FPDF_PAGEOBJ_IMAGE])
+        )
+    except PdfiumError:
+        # Happens when pdfium fails to get the number of page objects
+        scan.readable = False
+        return scan
+
+    text_objs = [obj for obj in page_objs if obj.type == pdfium_c.FPDF_PAGEOBJ_TEXT]
+    scan.has_text = len(text_objs) > 0
+    # Render modes and fonts go through ctypes, so they are only read when they will be used
+    if not scan.has_text or not inspect_fonts:
+        return scan
+
+    scan.invisible_text = any(
+        pdfium_c.FPDFTextObj_GetTextRenderMode(obj)
+        in [pdfium_c.FPDF_TEXTRENDERMODE_INVISIBLE, pdfium_c.FPDF_TEXTRENDERMODE_UNKNOWN]
+        for obj in text_objs
+    )
+
+    embedded, named = [], []
+    for text_obj in text_objs:
+        font = pdfium_c.FPDFTextObj_GetFont(text_obj)
+        embedded.append(pdfium_c.FPDFFont_GetIsEmbedded(font) != 0)
+        # Add font name check back in when we bump pypdfium2
+        named.append("glyphless" not in get_font_name(font).lower())
+    scan.fonts_embedded = any(embedded)
+    scan.fonts_named = any(named)
+
+    page_bbox = PolygonBox.from_bbox(page.get_bbox())
+    for img_obj in page_objs:
+        if img_obj.type == pdfium_c.FPDF_PAGEOBJ_IMAGE:
+            img_bbox = PolygonBox.from_bbox(img_obj.get_pos())
+            scan.image_coverage = max(scan.image_coverage, page_bbox.intersection_pct(img_bbox))
+    return scan
+
+
+def scan_document(
+    doc: pdfium.PdfDocument,
+    page_ids: List[int],
+    flatten_pdf: bool,
+    inspect_fonts: bool,
+) -> Tuple[List[Page], List[PageScan]]:
+    """
+    Classify each page and extract its text in the same pass, so every page is opened once per document handle.
+    """
+    pages, scans = [], []
+    for page_id in page_ids:
+        # Classify before pdftext flattens the page, flattening adds form text to the page objects
+        scans.append(classify_page(doc, page_id, inspect_fonts))
+        pages.extend(get_pages(doc, [page_id], flatten_pdf=flatten_pdf, quote_loosebox=False))
+    return pages, scans
+
+
+def finalize_pages(pages: List[Page], keep_chars: bool) -> List[Page]:
+    """
+    Apply the post-processing pdftext's `dictionary_output` does to raw pages: bboxes become lists, span text is
+    cleaned and soft hyphens are marked, and rotated pages swap their width and height.  Links need the raw pages,
+    so they have to be added before this.
+    """
+    for page in pages:
+        for block in page["blocks"]:
+            for key in list(block.keys()):
+                if key not in ["lines", "bbox"]:
+                    del block[key]
+            block["bbox"] = block["bbox"].bbox
+            for line in block["lines"]:
+                for key in list(line.keys()):
+                    if key not in ["spans", "bbox"]:
+                        del line[key]
+                line["bbox"] = line["bbox"].bbox
+                for span in line["spans"]:
+                    span["bbox"] = span["bbox"].bbox
+                    span["text"] = handle_hyphens(postprocess_text(span["text"]), keep_hyphens=True)
+                    if not keep_chars:
+                        span.pop("chars", None)
+                    else:
+                        for char in span["chars"]:
+                            char["bbox"] = char["bbox"].bbox
+
+        if page["rotation"] in (90, 270):
+            page["width"], page["height"] = page["height"], page["width"]
+            page["bbox"] = [page["bbox"][2], page["bbox"][3], page["bbox"][0], page["bbox"][1]]
+    return pages
+
+
+def _scan_worker(
+    filepath: str, page_ids: List[int], flatten_pdf: bool, inspect_fonts: bool
+) -> Tuple[List[Page], List[PageScan]]:
+    # Each worker opens its own document, since pdfium handles can't be shared across threads or processes
+    doc = pdfium.PdfDocument(filepath)
+    try:
+        if flatten_pdf:
+            doc.init_forms()
+        return scan_document(doc, page_ids, flatten_pdf, inspect_fonts)
+    finally:
+        doc.close()
+
+
+def scan_pages_parallel(
+    filepath: str, page_ids: List[int], flatten_pdf: bool, inspect_fonts: bool, workers: int
+) -> Tuple[List[Page], List[PageScan]]:
+    """
+    Scan pages across the provider's pool of worker processes, one contiguous chunk per worker.
+    """
+    executor = get_render_executor(workers)
+    chunk_size = math.ceil(len(page_ids) / workers)
+    futures = [
+        executor.submit(
+            _scan_worker, filepath, page_ids[i : i + chunk_size], flatten_pdf, inspect_fonts
+        )
+        for i in range(0, len(page_ids), chunk_size)
+    ]
+
+    pages, scans = [], []
+    for future in futures:
+        chunk_pages, chunk_scans = future.result()
+        pages.extend(chunk_pages)
+        scans.extend(chunk_scans)
+    return pages, scans
@@ -1,10 +1,7 @@
 import base64
-import os
-import tempfile
-import traceback
 
 from marker.logger import get_logger
-from marker.providers.pdf import PdfProvider
+from marker.providers.converted import ConvertedProvider
 
 logger = get_logger()
 
@@ -39,30 +36,11 @@ img {
 """
 
 
-class PowerPointProvider(PdfProvider):
+class PowerPointProvider(ConvertedProvider):
+    page_css = css
     include_slide_number: bool = False
 
-    def __init__(self, filepath: str, config=None):
-        temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        self.temp_pdf_path = temp_pdf.name
-        temp_pdf.close()
-
-        # Convert PPTX to PDF
-        try:
-            self.convert_pptx_to_pdf(filepath)
-        except Exception as e:
-            print(traceback.format_exc())
-            raise ValueError(f"Error converting PPTX to PDF: {e}")
-
-        # Initalize the PDF provider with the temp pdf path
-        super().__init__(self.temp_pdf_path, config)
-
-    def __del__(self):
-        if os.path.exists(self.temp_pdf_path):
-            os.remove(self.temp_pdf_path)
-
-    def convert_pptx_to_pdf(self, filepath):
-        from weasyprint import CSS, HTML
+    def convert_to_html(self, filepath: str) -> str:
         from pptx import Presentation
         from pptx.enum.shapes import MSO_SHAPE_TYPE
 
@@ -102,12 +80,7 @@ class PowerPointProvider(PdfProvider):
 
             html_parts.append("</section>")
 
-        html = "\n".join(html_parts)
-
-        # We convert the HTML into a PDF
-        HTML(string=html).write_pdf(
-            self.temp_pdf_path, stylesheets=[CSS(string=css), self.get_font_css()]
-        )
+        return "\n".join(html_parts)
 
     def _handle_group(self, group_shape) -> str:
         """
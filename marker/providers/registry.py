@@ -3,13 +3,13 @@ import filetype.match as file_match
 from bs4 import BeautifulSoup
 from filetype.types import archive, document, IMAGE
 
-from marker.providers.document import DocumentProvider
-from marker.providers.epub import EpubProvider
-from marker.providers.html import HTMLProvider
+from marker.providers.document import DocumentProvider, StructuredDocumentProvider
+from marker.providers.epub import EpubProvider, StructuredEpubProvider
+from marker.providers.html import HTMLProvider, StructuredHTMLProvider
 from marker.providers.image import ImageProvider
 from marker.providers.pdf import PdfProvider
 from marker.providers.powerpoint import PowerPointProvider
-from marker.providers.spreadsheet import SpreadSheetProvider
+from marker.providers.spreadsheet import SpreadSheetProvider, StructuredSpreadSheetProvider
 
 DOCTYPE_MATCHERS = {
     "image": IMAGE,
@@ -24,6 +24,14 @@ DOCTYPE_MATCHERS = {
     "ppt": [document.Pptx],
 }
 
+# Providers that read the document structure directly, used in place of rendering when structured input is enabled
+STRUCTURED_PROVIDERS = {
+    DocumentProvider: StructuredDocumentProvider,
+    EpubProvider: StructuredEpubProvider,
+    HTMLProvider: StructuredHTMLProvider,
+    SpreadSheetProvider: StructuredSpreadSheetProvider,
+}
+
 
 def load_matchers(doctype: str):
     return [cls() for cls in DOCTYPE_MATCHERS[doctype]]
@@ -56,7 +64,15 @@ def provider_from_ext(filepath: str):
     return PdfProvider
 
 
-def provider_from_filepath(filepath: str):
+def provider_from_filepath(filepath: str | bytes, structured: bool = False):
+    provider_cls = detect_provider(filepath)
+    if structured:
+        return STRUCTURED_PROVIDERS.get(provider_cls, provider_cls)
+    return provider_cls
+
+
+def detect_provider(filepath: str | bytes):
+    # The matchers read the file header, which works the same on a path or on the file contents
     if filetype.image_match(filepath) is not None:
         return ImageProvider
     if file_match(filepath, load_matchers("pdf")) is not None:
@@ -71,13 +87,19 @@ def provider_from_filepath(filepath: str):
         return PowerPointProvider
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            soup = BeautifulSoup(f.read(), "html.parser")
-            # Check if there are any HTML tags
-            if bool(soup.find()):
-                return HTMLProvider
+        if isinstance(filepath, bytes):
+            text = filepath.decode("utf-8")
+        else:
+            with open(filepath, "r", encoding="utf-8") as f:
+                text = f.read()
+        soup = BeautifulSoup(text, "html.parser")
+        # Check if there are any HTML tags
+        if bool(soup.find()):
+            return HTMLProvider
     except Exception:
         pass
 
     # Fallback if we incorrectly detect the file type
+    if isinstance(filepath, bytes):
+        return PdfProvider
     return provider_from_ext(filepath)
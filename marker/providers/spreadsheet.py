@@ -1,7 +1,16 @@
-import os
-import tempfile
+import datetime
+import html
+import io
+import zipfile
+from typing import Annotated, Dict, Iterator, List, Tuple
+from xml.etree import ElementTree
 
-from marker.providers.pdf import PdfProvider
+from marker.providers.converted import ConvertedProvider
+from marker.providers.structured import StructuredCell, StructuredProvider
+from marker.schema import BlockTypes
+from marker.schema.groups.page import PageGroup
+from marker.schema.polygon import PolygonBox
+from marker.schema.registry import get_block_class
 
 css = '''
 @page {
@@ -28,27 +37,10 @@ td {
 '''
 
 
-class SpreadSheetProvider(PdfProvider):
-    def __init__(self, filepath: str, config=None):
-        temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix=f".pdf")
-        self.temp_pdf_path = temp_pdf.name
-        temp_pdf.close()
+class SpreadSheetProvider(ConvertedProvider):
+    page_css = css
 
-        # Convert XLSX to PDF
-        try:
-            self.convert_xlsx_to_pdf(filepath)
-        except Exception as e:
-            raise RuntimeError(f"Failed to convert {filepath} to PDF: {e}")
-
-        # Initialize the PDF provider with the temp pdf path
-        super().__init__(self.temp_pdf_path, config)
-
-    def __del__(self):
-        if os.path.exists(self.temp_pdf_path):
-            os.remove(self.temp_pdf_path)
-
-    def convert_xlsx_to_pdf(self, filepath: str):
-        from weasyprint import CSS, HTML
+    def convert_to_html(self, filepath: str) -> str:
         from openpyxl import load_workbook
 
         html = ""
@@ -59,12 +51,7 @@ class SpreadSheetProvider(PdfProvider):
                 html += f'<div><h1>{sheet_name}</h1>' + self._excel_to_html_table(sheet) + '</div>'
         else:
             raise ValueError("Invalid XLSX file")
-
-        # We convert the HTML into a PDF
-        HTML(string=html).write_pdf(
-            self.temp_pdf_path,
-            stylesheets=[CSS(string=css), self.get_font_css()]
-        )
+        return html
 
     @staticmethod
     def _get_merged_cell_ranges(sheet):
@@ -113,3 +100,178 @@ class SpreadSheetProvider(PdfProvider):
             html += '</tr>'
         html += '</table>'
         return html
+
+
+# (min_col, min_row, max_col, max_row), 1-indexed and inclusive like openpyxl
+CellRange = Tuple[int, int, int, int]
+
+
+def format_cell_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime.datetime) and value.time() == datetime.time():
+        return value.date().isoformat()
+    return str(value)
+
+
+def sheet_xml_paths(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """
+    Map each sheet name to the path of its XML in the workbook archive.
+    """
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels}
+
+    paths = {}
+    for sheet in workbook.iter():
+        if not sheet.tag.endswith("}sheet"):
+            continue
+        rel_id = next((v for k, v in sheet.attrib.items() if k.endswith("}id")), None)
+        target = targets.get(rel_id)
+        if target is None:
+            continue
+        paths[sheet.get("name")] = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    return paths
+
+
+def sheet_merged_ranges(archive: zipfile.ZipFile, path: str) -> List[CellRange]:
+    """
+    Read the merged ranges of one sheet.  Read-only worksheets don't load them, so they come from the sheet XML,
+    which is parsed incrementally and dropped row by row.
+    """
+    from openpyxl.utils.cell import range_boundaries
+
+    ranges = []
+    with archive.open(path) as f:
+        for _, element in ElementTree.iterparse(f):
+            if element.tag.endswith("}mergeCell"):
+                ranges.append(range_boundaries(element.get("ref")))
+            elif element.tag.endswith("}row"):
+                element.clear()
+    return ranges
+
+
+class StructuredSpreadSheetProvider(StructuredProvider):
+    """
+    Reads spreadsheets directly into table blocks, one sheet at a time with openpyxl in read-only mode.  Cell values,
+    rowspans and colspans come from the workbook, so nothing is rendered, and no layout, OCR or table recognition runs.
+    """
+
+    accepts_bytes = True
+    rows_per_page: Annotated[
+        int,
+        "The number of spreadsheet rows on each page.  Longer sheets are split over several pages, so large workbooks",
+        "can be streamed in page windows.",
+    ] = 200
+    cell_width: float = 72  # Synthetic cell size in points, only used for block polygons
+    row_height: float = 18
+    header_height: float = 36
+    min_page_width: float = 612
+
+    def open_source(self):
+        return io.BytesIO(self.filepath) if isinstance(self.filepath, bytes) else self.filepath
+
+    def build_pages(self) -> Iterator[PageGroup]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(self.open_source(), read_only=True, data_only=True)
+        page_id = 0
+        try:
+            with zipfile.ZipFile(self.open_source()) as archive:
+                xml_paths = sheet_xml_paths(archive)
+                for sheet_name in workbook.sheetnames:
+                    sheet = workbook[sheet_name]
+                    if not hasattr(sheet, "iter_rows"):
+                        # Chartsheets have no cells
+                        continue
+
+                    merged = sheet_merged_ranges(archive, xml_paths[sheet_name]) if sheet_name in xml_paths else []
+                    rows = []
+                    is_first_page = True
+                    for row_idx, values in enumerate(sheet.iter_rows(min_row=1, min_col=1, values_only=True), 1):
+                        rows.append((row_idx, values))
+                        if len(rows) == self.rows_per_page:
+                            yield self.build_sheet_page(page_id, sheet_name, rows, merged, is_first_page)
+                            page_id += 1
+                            rows = []
+                            is_first_page = False
+
+                    if rows or is_first_page:
+                        yield self.build_sheet_page(page_id, sheet_name, rows, merged, is_first_page)
+                        page_id += 1
+        finally:
+            workbook.close()
+
+    def build_sheet_page(
+        self,
+        page_id: int,
+        sheet_name: str,
+        rows: List[Tuple[int, tuple]],
+        merged: List[CellRange],
+        is_first_page: bool,
+    ) -> PageGroup:
+        rows = [(row_idx, [format_cell_value(v) for v in values]) for row_idx, values in rows]
+        while rows and not any(rows[-1][1]):
+            rows.pop()
+
+        # Merges anchored in this page, with rowspans cut at the page end.  Cells covered by a merge anchored on an
+        # earlier page are still emitted, so every page is a complete table.
+        spans = {}
+        if rows:
+            first_row, last_row = rows[0][0], rows[-1][0]
+            for min_col, min_row, max_col, max_row in merged:
+                if first_row <= min_row <= last_row:
+                    spans[(min_row, min_col)] = (min(max_row, last_row) - min_row + 1, max_col - min_col + 1)
+        covered = {
+            (r, c)
+            for (row_idx, col_idx), (rowspan, colspan) in spans.items()
+            for r in range(row_idx, row_idx + rowspan)
+            for c in range(col_idx, col_idx + colspan)
+        } - spans.keys()
+
+        col_count = max(
+            [max((i + 1 for i, text in enumerate(values) if text), default=0) for _, values in rows]
+            + [col_idx + colspan - 1 for (_, col_idx), (_, colspan) in spans.items()],
+            default=0,
+        )
+
+        top = self.header_height if is_first_page else 0
+        page_width = max(self.min_page_width, col_count * self.cell_width)
+        page = self.new_page(page_id, [0, 0, page_width, top + len(rows) * self.row_height])
+
+        if is_first_page:
+            SectionHeaderClass = get_block_class(BlockTypes.SectionHeader)
+            self.add_block(page, SectionHeaderClass(
+                polygon=PolygonBox.from_bbox([0, 0, page_width, self.header_height]),
+                page_id=page_id,
+                heading_level=1,
+                html=f"<h1>{html.escape(sheet_name)}</h1>",
+            ))
+
+        if not rows or col_count == 0:
+            return page
+
+        first_row = rows[0][0]
+        cells = []
+        for row_idx, values in rows:
+            for col_idx in range(1, col_count + 1):
+                if (row_idx, col_idx) in covered:
+                    continue
+
+                rowspan, colspan = spans.get((row_idx, col_idx), (1, 1))
+                text = values[col_idx - 1] if col_idx <= len(values) else ""
+                cells.append(StructuredCell(
+                    row_id=row_idx - first_row,
+                    col_id=col_idx - 1,
+                    text_lines=[html.escape(line) for line in text.split("\n")] if text else [],
+                    rowspan=rowspan,
+                    colspan=colspan,
+                    is_header=row_idx == 1,
+                ))
+
+        self.add_table(page, [0, top, col_count * self.cell_width, page.polygon.bbox[3]], cells)
+        return page
@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import Annotated, Dict, Iterable, Iterator, List, Optional
+
+from PIL import Image
+from pdftext.schema import Reference
+
+from marker.providers import BaseProvider, PageImageSource
+from marker.schema import BlockTypes
+from marker.schema.blocks import Block
+from marker.schema.document import Document
+from marker.schema.groups.page import PageGroup
+from marker.schema.polygon import PolygonBox
+from marker.schema.registry import get_block_class
+from marker.schema.text.line import Line
+
+
+@dataclass
+class StructuredCell:
+    row_id: int
+    col_id: int
+    text_lines: List[str]
+    rowspan: int = 1
+    colspan: int = 1
+    is_header: bool = False
+
+
+class StructuredProvider(BaseProvider):
+    """
+    A provider for files whose structure can be read directly, like spreadsheets or HTML.  Pages are built with their
+    blocks already in place, so the converter skips layout, OCR and the processors, and nothing is rendered.
+    """
+
+    page_range: Annotated[
+        List[int],
+        "The range of pages to process.",
+        "Default is None, which will process all pages.",
+    ] = None
+
+    def __init__(self, filepath: str | bytes, config=None):
+        super().__init__(filepath, config)
+        # Pages are read as they are built, so the page count is only known once the file has been read
+        self.page_bboxes: Dict[int, List[float]] = {}
+
+    def __len__(self):
+        return len(self.page_bboxes)
+
+    def build_pages(self) -> Iterator[PageGroup]:
+        raise NotImplementedError
+
+    def iter_pages(self) -> Iterator[PageGroup]:
+        page_range = set(self.page_range) if self.page_range is not None else None
+        for page in self.build_pages():
+            self.page_bboxes[page.page_id] = page.polygon.bbox
+            if page_range is None or page.page_id in page_range:
+                yield page
+
+    def build_document(self, pages: Optional[Iterable[PageGroup]] = None) -> Document:
+        if pages is None:
+            pages = self.iter_pages()
+        pages = list(pages)
+
+        # Structured pages have no text layer to render, the images only back `get_image` calls
+        image_source = PageImageSource(self, 72, 72)
+        for page in pages:
+            page.set_image_source(image_source)
+
+        DocumentClass: Document = get_block_class(BlockTypes.Document)
+        document = DocumentClass(filepath=self.filename, pages=pages)
+        document.set_source(self.filepath)
+        return document
+
+    @staticmethod
+    def new_page(page_id: int, bbox: List[float]) -> PageGroup:
+        PageGroupClass: PageGroup = get_block_class(BlockTypes.Page)
+        return PageGroupClass(page_id=page_id, polygon=PolygonBox.from_bbox(bbox))
+
+    @staticmethod
+    def add_block(page: PageGroup, block: Block, parent: Block | None = None) -> Block:
+        block.source = "structured"
+        page.add_full_block(block)
+        (parent or page).add_structure(block)
+        return block
+
+    def add_table(self, page: PageGroup, bbox: List[float], cells: List[StructuredCell]) -> Block:
+        """
+        Add a table with its cells, laid out on an even grid over `bbox`.
+        """
+        TableClass = get_block_class(BlockTypes.Table)
+        TableCellClass = get_block_class(BlockTypes.TableCell)
+        table = self.add_block(page, TableClass(polygon=PolygonBox.from_bbox(bbox), page_id=page.page_id))
+
+        row_count = max((cell.row_id + cell.rowspan for cell in cells), default=1)
+        col_count = max((cell.col_id + cell.colspan for cell in cells), default=1)
+        cell_width = (bbox[2] - bbox[0]) / col_count
+        cell_height = (bbox[3] - bbox[1]) / row_count
+        for cell in cells:
+            x0 = bbox[0] + cell.col_id * cell_width
+            y0 = bbox[1] + cell.row_id * cell_height
+            self.add_block(page, TableCellClass(
+                polygon=PolygonBox.from_bbox([x0, y0, x0 + cell.colspan * cell_width, y0 + cell.rowspan * cell_height]),
+                page_id=page.page_id,
+                rowspan=cell.rowspan,
+                colspan=cell.colspan,
+                row_id=cell.row_id,
+                col_id=cell.col_id,
+                is_header=cell.is_header,
+                text_lines=cell.text_lines,
+            ), parent=table)
+        return table
+
+    def get_images(self, idxs: List[int], dpi: int) -> List[Image.Image]:
+        return [Image.new("RGB", self.get_image_size(idx, dpi), "white") for idx in idxs]
+
+    def get_page_bbox(self, idx: int) -> PolygonBox | None:
+        bbox = self.page_bboxes.get(idx)
+        return PolygonBox.from_bbox(bbox) if bbox is not None else None
+
+    def get_page_lines(self, idx: int) -> List[Line]:
+        return []
+
+    def get_page_refs(self, idx: int) -> List[Reference]:
+        return []
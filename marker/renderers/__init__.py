@@ -46,23 +46,31 @@ class BaseRenderer:
         # Children are in reading order
         raise NotImplementedError
 
-    def extract_image(self, document: Document, image_id, to_base64=False):
-        image_block = document.get_block(image_id)
-        cropped = image_block.get_image(
-            document, highres=self.image_extraction_mode == "highres"
+    def crop_image(self, document: Document, image_id):
+        # Crops are shared between renderers when the document is rendered into several formats
+        highres = self.image_extraction_mode == "highres"
+        return document.cached(
+            ("image", str(image_id), highres),
+            lambda: document.get_block(image_id).get_image(document, highres=highres),
         )
 
-        if to_base64:
+    def extract_image(self, document: Document, image_id, to_base64=False):
+        cropped = self.crop_image(document, image_id)
+        if not to_base64:
+            return cropped
+
+        def encode():
             image_buffer = io.BytesIO()
             # RGBA to RGB
-            if not cropped.mode == "RGB":
-                cropped = cropped.convert("RGB")
-
-            cropped.save(image_buffer, format=settings.OUTPUT_IMAGE_FORMAT)
-            cropped = base64.b64encode(image_buffer.getvalue()).decode(
+            image = cropped if cropped.mode == "RGB" else cropped.convert("RGB")
+            image.save(image_buffer, format=settings.OUTPUT_IMAGE_FORMAT)
+            return base64.b64encode(image_buffer.getvalue()).decode(
                 settings.OUTPUT_ENCODING
             )
-        return cropped
+
+        return document.cached(
+            ("image_base64", str(image_id), self.image_extraction_mode), encode
+        )
 
     @staticmethod
     def merge_consecutive_math(html, tag="math"):
@@ -112,6 +120,8 @@ class BaseRenderer:
                     "block_metadata": block_metadata.model_dump(),
                 }
             )
+            if document.profile is not None:
+                page_stats[-1]["stage_times"] = document.profile.page_dict(page.page_id)
         return page_stats
 
     def generate_document_metadata(self, document: Document, document_output):
@@ -121,6 +131,8 @@ class BaseRenderer:
         }
         if document.debug_data_path is not None:
             metadata["debug_data_path"] = document.debug_data_path
+        if document.profile is not None:
+            metadata["pipeline_profile"] = document.profile.to_dict()
 
         return metadata
 
@@ -41,11 +41,7 @@ class HTMLRenderer(BaseRenderer):
     ] = False
 
     def extract_image(self, document, image_id):
-        image_block = document.get_block(image_id)
-        cropped = image_block.get_image(
-            document, highres=self.image_extraction_mode == "highres"
-        )
-        return cropped
+        return self.crop_image(document, image_id)
 
     def insert_block_id(self, soup, block_id: BlockId):
         """
@@ -98,12 +98,10 @@ class OCRJSONRenderer(BaseRenderer):
                     )
                     children = []
                     for span in spans:
-                        if not span.structure:
+                        span_chars = span.get_chars(document)
+                        if not span_chars:
                             continue
 
-                        span_chars = [
-                            document.get_block(char_id) for char_id in span.structure
-                        ]
                         children.extend(
                             [
                                 OCRJSONCharOutput(
@@ -17,6 +17,8 @@ class BlockMetadata(BaseModel):
     llm_request_count: int = 0
     llm_error_count: int = 0
     llm_tokens_used: int = 0
+    llm_cache_hits: int = 0
+    llm_cache_misses: int = 0
     previous_text: str = ""
     previous_type: str = ""
     previous_order: int = 0
@@ -42,11 +44,20 @@ class BlockId(BaseModel):
     page_id: int
     block_id: Optional[int] = None
     block_type: BlockTypes | None = None
+    _str_cache: Optional[Tuple] = None  # (page_id, block_id, block_type, str), since ids are hashed constantly
 
     def __str__(self):
+        key = (self.page_id, self.block_id, self.block_type)
+        cached = self._str_cache
+        if cached is not None and cached[:3] == key:
+            return cached[3]
+
         if self.block_type is None or self.block_id is None:
-            return f"/page/{self.page_id}"
-        return f"/page/{self.page_id}/{self.block_type.name}/{self.block_id}"
+            value = f"/page/{self.page_id}"
+        else:
+            value = f"/page/{self.page_id}/{self.block_type.name}/{self.block_id}"
+        self._str_cache = (*key, value)
+        return value
 
     def __hash__(self):
         return hash(str(self))
@@ -94,21 +105,35 @@ class Block(BaseModel):
     replace_output_newlines: bool = (
         False  # Whether to replace newlines with spaces in output
     )
-    source: Literal["layout", "heuristics", "processor"] = "layout"
+    source: Literal["layout", "heuristics", "processor", "structured"] = "layout"
     top_k: Optional[Dict[BlockTypes, float]] = None
     metadata: BlockMetadata | None = None
     lowres_image: Image.Image | None = None
     highres_image: Image.Image | None = None
     removed: bool = False  # Has block been replaced by new block?
     _metadata: Optional[dict] = None
+    _id_cache: Optional[BlockId] = None
+    _structure_index: Optional[Tuple[list, Dict[BlockId, int]]] = None  # (structure list, block id -> position)
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     @property
     def id(self) -> BlockId:
-        return BlockId(
+        cached = self._id_cache
+        if (
+            cached is not None
+            and cached.page_id == self.page_id
+            and cached.block_id == self.block_id
+            and cached.block_type == self.block_type
+        ):
+            return cached
+
+        # The fields were already validated on the block
+        block_id = BlockId.model_construct(
             page_id=self.page_id, block_id=self.block_id, block_type=self.block_type
         )
+        self._id_cache = block_id
+        return block_id
 
     @classmethod
     def from_block(cls, block: Block) -> Block:
@@ -147,6 +172,29 @@ class Block(BaseModel):
             image = page_image.crop(bbox)
         return image
 
+    def structure_index(self, block_id: BlockId) -> int:
+        """
+        The position of `block_id` in the structure, equivalent to `structure.index(block_id)`.
+        Positions are cached, and the cache is rebuilt whenever the structure was replaced or edited in place.
+        """
+        if self.structure is None:
+            raise ValueError(f"{block_id} is not in structure")
+
+        cached = self._structure_index
+        if cached is not None and cached[0] is self.structure:
+            idx = cached[1].get(block_id)
+            if idx is not None and idx < len(self.structure) and self.structure[idx] == block_id:
+                return idx
+
+        positions = {}
+        for i, item in enumerate(self.structure):
+            positions.setdefault(item, i)
+        self._structure_index = (self.structure, positions)
+
+        if block_id not in positions:
+            raise ValueError(f"{block_id} is not in structure")
+        return positions[block_id]
+
     def structure_blocks(self, document_page: Document | PageGroup) -> List[Block]:
         if self.structure is None:
             return []
@@ -161,7 +209,7 @@ class Block(BaseModel):
         if ignored_block_types is None:
             ignored_block_types = []
 
-        structure_idx = self.structure.index(block.id)
+        structure_idx = self.structure_index(block.id)
         if structure_idx == 0:
             return None
 
@@ -180,7 +228,7 @@ class Block(BaseModel):
 
         structure_idx = 0
         if block is not None:
-            structure_idx = self.structure.index(block.id) + 1
+            structure_idx = self.structure_index(block.id) + 1
 
         for next_block_id in self.structure[structure_idx:]:
             if next_block_id.block_type not in ignored_block_types:
@@ -193,17 +241,30 @@ class Block(BaseModel):
             self.structure = [block.id]
         else:
             self.structure.append(block.id)
+            cached = self._structure_index
+            if cached is not None and cached[0] is self.structure:
+                cached[1].setdefault(block.id, len(self.structure) - 1)
 
     def update_structure_item(self, old_id: BlockId, new_id: BlockId):
-        if self.structure is not None:
-            for i, item in enumerate(self.structure):
-                if item == old_id:
-                    self.structure[i] = new_id
-                    break
+        if self.structure is None:
+            return
+
+        try:
+            idx = self.structure_index(old_id)
+        except ValueError:
+            return
+
+        self.structure[idx] = new_id
+        positions = self._structure_index[1]
+        del positions[old_id]
+        if new_id in positions and positions[new_id] < idx:
+            return  # new_id already appears earlier, which is the position index() returns
+        positions[new_id] = idx
 
     def remove_structure_items(self, block_ids: List[BlockId]):
         if self.structure is not None:
-            self.structure = [item for item in self.structure if item not in block_ids]
+            removed = set(block_ids)
+            self.structure = [item for item in self.structure if item not in removed]
 
     def raw_text(self, document: Document) -> str:
         from marker.schema.text.line import Line
@@ -273,11 +334,7 @@ class Block(BaseModel):
         return blocks
 
     def replace_block(self, block: Block, new_block: Block):
-        if self.structure is not None:
-            for i, item in enumerate(self.structure):
-                if item == block.id:
-                    self.structure[i] = new_block.id
-                    break
+        self.update_structure_item(block.id, new_block.id)
 
     def render(
         self,
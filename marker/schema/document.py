@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import List, Sequence, Optional
+import pickle
+import zlib
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Optional
 
 from pydantic import BaseModel
 
@@ -28,6 +31,24 @@ class Document(BaseModel):
     block_type: BlockTypes = BlockTypes.Document
     table_of_contents: List[TocItem] | None = None
     debug_data_path: str | None = None  # Path that debug data was saved to
+    _render_cache: Optional[Dict[Hashable, Any]] = None  # Only set while rendering with several renderers
+    _page_index: Optional[Dict[int, int]] = None  # page_id -> position in pages
+    _profile: Optional[Any] = None  # PipelineProfile with per-stage timings, set when profiling is enabled
+    _source: Optional[str | bytes] = None  # The path or bytes the document was read from, when not filepath
+
+    @property
+    def source(self) -> str | bytes:
+        return self._source if self._source is not None else self.filepath
+
+    def set_source(self, source: str | bytes):
+        self._source = source
+
+    @property
+    def profile(self):
+        return self._profile
+
+    def set_profile(self, profile):
+        self._profile = profile
 
     def get_block(self, block_id: BlockId):
         page = self.get_page(block_id.page_id)
@@ -36,11 +57,31 @@ class Document(BaseModel):
             return block
         return None
 
+    def page_index(self, page_id) -> int | None:
+        # Positions are cached, and rebuilt whenever the cached position no longer holds the page
+        cached = self._page_index
+        if cached is not None:
+            idx = cached.get(page_id)
+            if idx is not None and idx < len(self.pages) and self.pages[idx].page_id == page_id:
+                return idx
+
+        positions = {}
+        for i, page in enumerate(self.pages):
+            positions.setdefault(page.page_id, i)
+        self._page_index = positions
+        return positions.get(page_id)
+
     def get_page(self, page_id):
-        for page in self.pages:
-            if page.page_id == page_id:
-                return page
-        return None
+        idx = self.page_index(page_id)
+        if idx is None:
+            return None
+        return self.pages[idx]
+
+    def _page_position(self, page: PageGroup) -> int:
+        idx = self.page_index(page.page_id)
+        if idx is not None and self.pages[idx] is page:
+            return idx
+        return self.pages.index(page)
 
     def get_next_block(
         self, block: Block, ignored_block_types: List[BlockTypes] = None
@@ -56,14 +97,14 @@ class Document(BaseModel):
             return next_block
 
         # If no block found, search subsequent pages
-        for page in self.pages[self.pages.index(page) + 1 :]:
+        for page in self.pages[self._page_position(page) + 1 :]:
             next_block = page.get_next_block(None, ignored_block_types)
             if next_block:
                 return next_block
         return None
 
     def get_next_page(self, page: PageGroup):
-        page_idx = self.pages.index(page)
+        page_idx = self._page_position(page)
         if page_idx + 1 < len(self.pages):
             return self.pages[page_idx + 1]
         return None
@@ -79,7 +120,7 @@ class Document(BaseModel):
         return prev_page.get_block(prev_page.structure[-1])
 
     def get_prev_page(self, page: PageGroup):
-        page_idx = self.pages.index(page)
+        page_idx = self._page_position(page)
         if page_idx > 0:
             return self.pages[page_idx - 1]
         return None
@@ -92,7 +133,50 @@ class Document(BaseModel):
             template += f"<content-ref src='{c.id}'></content-ref>"
         return template
 
+    def dumps(self) -> bytes:
+        """
+        Serialize the document into compressed bytes.  Page images and the source file are left out, they are reattached from the provider when loading.
+        """
+        pages = []
+        for page in self.pages:
+            page_copy = page.model_copy(update={"lowres_image": None, "highres_image": None})
+            page_copy._image_source = None
+            pages.append(page_copy)
+
+        document = self.model_copy(update={"pages": pages})
+        document._render_cache = None
+        document._profile = None
+        document._source = None
+        return zlib.compress(pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @classmethod
+    def loads(cls, data: bytes) -> Document:
+        return pickle.loads(zlib.decompress(data))
+
+    @contextmanager
+    def render_cache(self):
+        """
+        Share rendered output and extracted images between renderers.  The document must not be modified inside this block.
+        """
+        self._render_cache = {}
+        try:
+            yield self
+        finally:
+            self._render_cache = None
+
+    def cached(self, key: Hashable, compute: Callable[[], Any]):
+        if self._render_cache is None:
+            return compute()
+
+        if key not in self._render_cache:
+            self._render_cache[key] = compute()
+        return self._render_cache[key]
+
     def render(self, block_config: Optional[dict] = None):
+        cache_key = ("render", tuple(sorted((block_config or {}).items())))
+        return self.cached(cache_key, lambda: self._render(block_config))
+
+    def _render(self, block_config: Optional[dict] = None):
         child_content = []
         section_hierarchy = None
         for page in self.pages:
@@ -7,13 +7,15 @@ from PIL import Image, ImageDraw
 from pdftext.schema import Reference
 from pydantic import computed_field
 
-from marker.providers import ProviderOutput
+from marker.providers import PageImageSource, ProviderOutput
 from marker.schema import BlockTypes
 from marker.schema.blocks import Block, BlockId, Text
 from marker.schema.blocks.base import BlockMetadata
 from marker.schema.groups.base import Group
 from marker.schema.polygon import PolygonBox
+from marker.schema.text.store import CharSpanView
 from marker.util import matrix_intersection_area, sort_text_lines
+from marker.utils import geometry
 
 LINE_MAPPING_TYPE = List[Tuple[int, ProviderOutput]]
 
@@ -35,6 +37,58 @@ class PageGroup(Group):
     block_description: str = "A single page in the document."
     refs: List[Reference] | None = None
     ocr_errors_detected: bool = False
+    _image_source: Optional[PageImageSource] = None  # Renders images lazily when none are stored on the page
+
+    def set_image_source(self, image_source: PageImageSource):
+        self._image_source = image_source
+
+    @staticmethod
+    def get_images(
+        pages: Sequence["PageGroup"],
+        highres: bool = False,
+        remove_blocks: Sequence[BlockTypes] | None = None,
+    ) -> List[Image.Image]:
+        """
+        Get the images of several pages, batch rendering lazy images with one provider call per image source.
+        """
+        images = {}
+        sources = defaultdict(list)
+        for page in pages:
+            image = page.highres_image if highres else page.lowres_image
+            if image is None and page._image_source is not None:
+                sources[page._image_source].append(page.page_id)
+            else:
+                images[page.page_id] = image
+
+        for source, page_ids in sources.items():
+            images.update(zip(page_ids, source.get_images(page_ids, highres)))
+
+        return [page.prepare_image(images[page.page_id], remove_blocks) for page in pages]
+
+    @staticmethod
+    def image_chunks(pages: Sequence["PageGroup"], highres: bool = False) -> List[List["PageGroup"]]:
+        """
+        Split pages into chunks whose lazy images fit in the image cache together, so each chunk is rendered once,
+        and only one chunk of images is held at a time.
+        """
+        chunks, chunk, chunk_bytes = [], [], 0
+        for page in pages:
+            source = page._image_source
+            if source is None:
+                chunk.append(page)
+                continue
+
+            width, height = page.get_image_size(highres)
+            page_bytes = width * height * 3
+            if chunk and chunk_bytes + page_bytes > source.cache.max_bytes:
+                chunks.append(chunk)
+                chunk, chunk_bytes = [], 0
+            chunk.append(page)
+            chunk_bytes += page_bytes
+
+        if chunk:
+            chunks.append(chunk)
+        return chunks
 
     def incr_block_id(self):
         if self.block_id is None:
@@ -56,7 +110,22 @@ class PageGroup(Group):
         **kwargs,
     ):
         image = self.highres_image if highres else self.lowres_image
+        if image is None and self._image_source is not None:
+            image = self._image_source.get_image(self.page_id, highres)
+        return self.prepare_image(image, remove_blocks)
+
+    def get_image_size(self, highres: bool = False) -> Tuple[int, int]:
+        """
+        The size of the page image, without rendering it when it is lazy.
+        """
+        image = self.highres_image if highres else self.lowres_image
+        if isinstance(image, Image.Image):
+            return image.size
+        if self._image_source is not None:
+            return self._image_source.get_image_size(self.page_id, highres)
+        return self.get_image(highres=highres).size
 
+    def prepare_image(self, image, remove_blocks: Sequence[BlockTypes] | None = None):
         # Check if RGB, convert if needed
         if isinstance(image, Image.Image) and image.mode != "RGB":
             image = image.convert("RGB")
@@ -92,7 +161,7 @@ class PageGroup(Group):
 
         structure_idx = 0
         if block is not None:
-            structure_idx = self.structure.index(block.id) + 1
+            structure_idx = self.structure_index(block.id) + 1
 
         # Iterate over blocks following the given block
         for next_block_id in self.structure[structure_idx:]:
@@ -102,7 +171,7 @@ class PageGroup(Group):
         return None  # No valid next block found
 
     def get_prev_block(self, block: Block):
-        block_idx = self.structure.index(block.id)
+        block_idx = self.structure_index(block.id)
         if block_idx > 0:
             return self.get_block(self.structure[block_idx - 1])
         return None
@@ -254,7 +323,7 @@ class PageGroup(Group):
                     min_dist_idx = existing_block.id
 
             if min_dist_idx is not None:
-                existing_idx = self.structure.index(min_dist_idx)
+                existing_idx = self.structure_index(min_dist_idx)
                 self.structure.insert(existing_idx + 1, block.id)
             else:
                 self.structure.append(block.id)
@@ -299,8 +368,14 @@ class PageGroup(Group):
                     if len(provider_output.chars) == 0:
                         continue
 
+                    span_chars = provider_output.chars[span_idx]
+                    if isinstance(span_chars, CharSpanView):
+                        # Compact chars stay in the provider's store, instead of becoming blocks
+                        span.set_chars(span_chars)
+                        continue
+
                     # Loop through characters associated with the span
-                    for char in provider_output.chars[span_idx]:
+                    for char in span_chars:
                         char.page_id = self.page_id
                         self.add_full_block(char)
                         span.add_structure(char)
@@ -332,21 +407,19 @@ class PageGroup(Group):
                 assigned_line_idxs.add(line_idx)
 
         # If no intersection, assign by distance
-        for line_idx in set(provider_line_idxs).difference(assigned_line_idxs):
-            min_dist = None
-            min_dist_idx = None
-            provider_output: ProviderOutput = provider_outputs[line_idx]
-            line = provider_output.line
-            for block in valid_blocks:
-                # We want to assign to blocks closer in y than x
-                dist = line.polygon.center_distance(block.polygon, x_weight=5)
-                if min_dist_idx is None or dist < min_dist:
-                    min_dist = dist
-                    min_dist_idx = block.id
-
-            if min_dist_idx is not None and min_dist < self.maximum_assignment_distance:
-                block_lines[min_dist_idx].append((line_idx, provider_output))
-                assigned_line_idxs.add(line_idx)
+        unassigned_line_idxs = sorted(set(provider_line_idxs).difference(assigned_line_idxs))
+        if unassigned_line_idxs and valid_blocks:
+            # We want to assign to blocks closer in y than x
+            distances = geometry.center_distance(
+                geometry.bboxes_array([provider_outputs[i].line.polygon for i in unassigned_line_idxs]),
+                geometry.bboxes_array([block.polygon for block in valid_blocks]),
+                x_weight=5,
+            )
+            for line_idx, line_distances in zip(unassigned_line_idxs, distances):
+                min_idx = int(np.argmin(line_distances))
+                if line_distances[min_idx] < self.maximum_assignment_distance:
+                    block_lines[valid_blocks[min_idx].id].append((line_idx, provider_outputs[line_idx]))
+                    assigned_line_idxs.add(line_idx)
 
         # This creates new blocks to hold anything too far away
         new_blocks = self.identify_missing_blocks(
@@ -4,6 +4,7 @@ from typing import List, Literal, Optional
 
 from marker.schema import BlockTypes
 from marker.schema.blocks import Block
+from marker.schema.text.store import CharSpanView
 from marker.util import unwrap_math
 
 
@@ -42,6 +43,20 @@ class Span(Block):
     has_subscript: bool = False
     url: Optional[str] = None
     html: Optional[str] = None
+    _chars: Optional[CharSpanView] = None  # Characters held in the page's compact char store
+
+    def set_chars(self, chars: CharSpanView):
+        self._chars = chars
+
+    def get_chars(self, document) -> list:
+        """
+        The characters in the span, from the compact char store if it was used, otherwise from the span's structure.
+        """
+        if self._chars is not None:
+            return list(self._chars)
+        if not self.structure:
+            return []
+        return [document.get_block(char_id) for char_id in self.structure]
 
     @property
     def bold(self):
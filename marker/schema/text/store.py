@@ -0,0 +1,143 @@
+from typing import Iterator, List, Sequence
+
+import numpy as np
+
+from marker.schema import BlockTypes
+from marker.schema.blocks import BlockId
+from marker.schema.polygon import PolygonBox
+
+
+class CharStore:
+    """
+    Columnar storage for the characters on one page.  Bounding boxes and character indices live in NumPy arrays
+    and the text in a single string table, instead of one `Char` block per character.
+    Characters are appended span by span, then the store is frozen into arrays with `finalize`.
+    """
+
+    def __init__(self, page_id: int):
+        self.page_id = page_id
+        self.text = ""
+        self.text_offsets = np.zeros(1, dtype=np.int32)
+        self.bboxes = np.zeros((0, 4), dtype=np.float32)
+        self.idxs = np.zeros(0, dtype=np.int32)
+        self._pending_text: List[str] = []
+        self._pending_bboxes: List[List[float]] = []
+        self._pending_idxs: List[int] = []
+
+    def __len__(self):
+        return len(self.idxs) + len(self._pending_idxs)
+
+    def add(self, texts: Sequence[str], bboxes: Sequence[List[float]], idxs: Sequence[int]) -> "CharSpanView":
+        start = len(self)
+        self._pending_text.extend(texts)
+        self._pending_bboxes.extend(bboxes)
+        self._pending_idxs.extend(idxs)
+        return CharSpanView(self, start, len(self))
+
+    def finalize(self):
+        if not self._pending_idxs:
+            return
+
+        lengths = np.fromiter((len(t) for t in self._pending_text), dtype=np.int32, count=len(self._pending_text))
+        offsets = self.text_offsets[-1] + np.cumsum(lengths, dtype=np.int32)
+        self.text += "".join(self._pending_text)
+        self.text_offsets = np.concatenate([self.text_offsets, offsets])
+        self.bboxes = np.concatenate([self.bboxes, np.asarray(self._pending_bboxes, dtype=np.float32).reshape(-1, 4)])
+        self.idxs = np.concatenate([self.idxs, np.asarray(self._pending_idxs, dtype=np.int32)])
+
+        self._pending_text, self._pending_bboxes, self._pending_idxs = [], [], []
+
+    def char_text(self, i: int) -> str:
+        return self.text[self.text_offsets[i]:self.text_offsets[i + 1]]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.text) + self.text_offsets.nbytes + self.bboxes.nbytes + self.idxs.nbytes
+
+
+class CharView:
+    """
+    A read-only view of one character in a `CharStore`, with the same accessors as a `Char` block.
+    The polygon is only built when it is accessed.
+    """
+
+    __slots__ = ("store", "position")
+    block_type = BlockTypes.Char
+    removed = False
+
+    def __init__(self, store: CharStore, position: int):
+        self.store = store
+        self.position = position
+
+    @property
+    def page_id(self) -> int:
+        return self.store.page_id
+
+    @property
+    def id(self) -> BlockId:
+        # Stored characters aren't blocks on the page, so their ids aren't valid for document.get_block
+        return BlockId(page_id=self.page_id, block_id=self.position, block_type=self.block_type)
+
+    @property
+    def text(self) -> str:
+        return self.store.char_text(self.position)
+
+    @property
+    def idx(self) -> int:
+        return int(self.store.idxs[self.position])
+
+    @property
+    def bbox(self) -> List[float]:
+        return self.store.bboxes[self.position].tolist()
+
+    @property
+    def polygon(self) -> PolygonBox:
+        return PolygonBox.from_bbox(self.bbox, ensure_nonzero_area=True)
+
+
+class CharSpanView:
+    """
+    The contiguous run of characters in a `CharStore` that belong to one span.
+    Views are immutable, so copying a span shares its characters instead of duplicating the store.
+    """
+
+    __slots__ = ("store", "start", "end")
+
+    def __init__(self, store: CharStore, start: int, end: int):
+        self.store = store
+        self.start = start
+        self.end = end
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __iter__(self) -> Iterator[CharView]:
+        for position in range(self.start, self.end):
+            yield CharView(self.store, position)
+
+    def __getitem__(self, i: int) -> CharView:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return CharView(self.store, self.start + i)
+
+    @property
+    def text(self) -> str:
+        return self.store.text[self.store.text_offsets[self.start]:self.store.text_offsets[self.end]]
+
+    @property
+    def bboxes(self) -> np.ndarray:
+        return self.store.bboxes[self.start:self.end]
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __getstate__(self):
+        return self.store, self.start, self.end
+
+    def __setstate__(self, state):
+        self.store, self.start, self.end = state
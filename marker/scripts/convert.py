@@ -32,7 +32,7 @@ from marker.config.parser import ConfigParser
 from marker.config.printer import CustomClickPrinter
 from marker.logger import configure_logging, get_logger
 from marker.models import create_model_dict
-from marker.output import output_exists, save_output
+from marker.output import output_exists, save_outputs
 from marker.utils.gpu import GPUManager
 
 configure_logging()
@@ -67,7 +67,10 @@ def process_single_pdf(args):
 
     out_folder = config_parser.get_output_folder(fpath)
     base_name = config_parser.get_base_filename(fpath)
-    if cli_options.get("skip_existing") and output_exists(out_folder, base_name):
+    output_formats = config_parser.get_output_formats()
+    if cli_options.get("skip_existing") and output_exists(
+        out_folder, base_name, output_formats
+    ):
         return page_count
 
     converter_cls = config_parser.get_converter_cls()
@@ -81,12 +84,15 @@ def process_single_pdf(args):
             config=config_dict,
             artifact_dict=model_refs,
             processor_list=config_parser.get_processors(),
-            renderer=config_parser.get_renderer(),
+            renderer=config_parser.get_renderers(),
             llm_service=config_parser.get_llm_service(),
         )
-        rendered = converter(fpath)
+        if len(output_formats) > 1:
+            rendered = converter.render_all(fpath)
+        else:
+            rendered = [converter(fpath)]
         out_folder = config_parser.get_output_folder(fpath)
-        save_output(rendered, out_folder, base_name)
+        save_outputs(rendered, output_formats, out_folder, base_name)
         page_count = converter.page_count
 
         if cli_options.get("debug_print"):
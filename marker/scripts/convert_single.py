@@ -13,7 +13,7 @@ from marker.config.parser import ConfigParser
 from marker.config.printer import CustomClickPrinter
 from marker.logger import configure_logging, get_logger
 from marker.models import create_model_dict
-from marker.output import save_output
+from marker.output import save_outputs
 
 configure_logging()
 logger = get_logger()
@@ -32,12 +32,18 @@ def convert_single_cli(fpath: str, **kwargs):
         config=config_parser.generate_config_dict(),
         artifact_dict=models,
         processor_list=config_parser.get_processors(),
-        renderer=config_parser.get_renderer(),
+        renderer=config_parser.get_renderers(),
         llm_service=config_parser.get_llm_service(),
     )
-    rendered = converter(fpath)
+    output_formats = config_parser.get_output_formats()
+    if len(output_formats) > 1:
+        rendered = converter.render_all(fpath)
+    else:
+        rendered = [converter(fpath)]
     out_folder = config_parser.get_output_folder(fpath)
-    save_output(rendered, out_folder, config_parser.get_base_filename(fpath))
+    save_outputs(
+        rendered, output_formats, out_folder, config_parser.get_base_filename(fpath)
+    )
 
-    logger.info(f"Saved markdown to {out_folder}")
+    logger.info(f"Saved {', '.join(output_formats)} to {out_folder}")
     logger.info(f"Total time: {time.time() - start}")
@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+from marker.logger import get_logger
+
+logger = get_logger()
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    complete = "complete"
+    failed = "failed"
+
+
+class QueueFullError(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    name: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.queued
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    result_path: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "name": self.name,
+            "status": self.status.value,
+            "pages_done": self.pages_done,
+            "pages_total": self.pages_total,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """
+    An in-process job queue.  Jobs run on a bounded thread pool, off the server event loop, and submissions are
+    rejected once `max_queue_depth` jobs are waiting or running.
+    """
+
+    def __init__(self, max_workers: int, max_queue_depth: int, max_finished_jobs: int = 100):
+        self.max_queue_depth = max_queue_depth
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="marker-job")
+
+    @property
+    def depth(self) -> int:
+        return sum(
+            1 for job in self.jobs.values() if job.status in (JobStatus.queued, JobStatus.running)
+        )
+
+    def submit(self, name: str, fn: Callable[[Job], str], on_finish: Callable[[Job], None] | None = None) -> Job:
+        """
+        Queue `fn`, which receives the job to report progress on and returns the path of the result.
+        """
+        with self._lock:
+            if self.depth >= self.max_queue_depth:
+                raise QueueFullError(f"Job queue is full, {self.depth} jobs are pending.")
+            job = Job(name=name)
+            self.jobs[job.id] = job
+            self._prune()
+
+        self._executor.submit(self._run, job, fn, on_finish)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def _run(self, job: Job, fn: Callable[[Job], str], on_finish: Callable[[Job], None] | None):
+        job.status = JobStatus.running
+        try:
+            job.result_path = fn(job)
+            job.status = JobStatus.complete
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = JobStatus.failed
+        finally:
+            job.finished_at = time.time()
+            if on_finish is not None:
+                on_finish(job)
+
+    def _prune(self):
+        # Forget the oldest finished jobs, so the job table doesn't grow forever
+        finished = sorted(
+            (job for job in self.jobs.values() if job.finished_at is not None),
+            key=lambda job: job.finished_at,
+        )
+        for job in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+            if job.result_path is not None and os.path.exists(job.result_path):
+                os.remove(job.result_path)
+            del self.jobs[job.id]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -4,23 +4,28 @@ import click
 import os
 
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import HTMLResponse
 from enum import Enum
 
 from marker.config.parser import ConfigParser
-from marker.output import text_from_rendered
+from marker.output import merge_rendered, save_outputs, text_from_rendered
+from marker.scripts.jobs import Job, JobQueue, JobStatus, QueueFullError
 
 import base64
+import json
+import tempfile
 from contextlib import asynccontextmanager
 from typing import Optional, Annotated
 import io
 
 from fastapi import FastAPI, Form, File, UploadFile
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 import zipfile
 import shutil
 from marker.converters.pdf import PdfConverter
 from marker.models import create_model_dict
+from marker.utils.batching import create_batching_model_dict
 from marker.settings import settings
 
 app_data = {}
@@ -28,14 +33,37 @@ app_data = {}
 
 UPLOAD_DIRECTORY = "./uploads"
 os.makedirs(UPLOAD_DIRECTORY, exist_ok=True)
+JOB_RESULT_DIRECTORY = os.path.join(UPLOAD_DIRECTORY, "jobs")
+os.makedirs(JOB_RESULT_DIRECTORY, exist_ok=True)
+
+
+def _zip_directory(src_dir: str, zip_path: str):
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        # Add all files from the output directory
+        for root, dirs, files in os.walk(src_dir):
+            for file_item in files:
+                file_path = os.path.join(root, file_item)
+                arcname = os.path.relpath(file_path, src_dir)
+                zipf.write(file_path, arcname)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    app_data["models"] = create_model_dict()
+    # Concurrent conversions share model batches, instead of each running small batches of their own
+    app_data["models"] = create_batching_model_dict(
+        create_model_dict(),
+        max_wait_ms=settings.MODEL_BATCH_MAX_WAIT_MS,
+        max_batch_items=settings.MODEL_BATCH_MAX_ITEMS,
+    )
+    app_data["jobs"] = JobQueue(
+        max_workers=settings.JOB_WORKERS, max_queue_depth=settings.JOB_MAX_QUEUE_DEPTH
+    )
 
     yield
 
+    if "jobs" in app_data:
+        app_data["jobs"].shutdown()
+        del app_data["jobs"]
     if "models" in app_data:
         del app_data["models"]
 
@@ -155,16 +183,23 @@ async def _convert_pdf(params: CommonParams):
         config_dict = config_parser.generate_config_dict()
         config_dict["pdftext_workers"] = 1
         converter_cls = PdfConverter
+        output_formats = config_parser.get_output_formats()
         converter = converter_cls(
             config=config_dict,
-            artifact_dict=app_data["models"],
+            artifact_dict=dict(app_data["models"]),
             processor_list=config_parser.get_processors(),
-            renderer=config_parser.get_renderer(),
+            renderer=config_parser.get_renderers(),
             llm_service=config_parser.get_llm_service(),
         )
-        rendered = converter(params.filepath)
-        text, _, images = text_from_rendered(rendered)
-        metadata = rendered.metadata
+        # Every requested format is rendered from a single conversion
+        # Convert off the event loop, so concurrent requests can be batched together
+        rendered_outputs = await run_in_threadpool(converter.render_all, params.filepath)
+        outputs, images = {}, {}
+        for output_format, rendered in zip(output_formats, rendered_outputs):
+            outputs[output_format], _, format_images = text_from_rendered(rendered)
+            images.update(format_images)
+        text = outputs[output_formats[0]] if len(output_formats) == 1 else outputs
+        metadata = rendered_outputs[0].metadata
     except Exception as e:
         traceback.print_exc()
         return {
@@ -238,15 +273,11 @@ async def convert_pdf_upload(
         ..., description="The PDF file to convert.", media_type="application/pdf"
     ),
 ):
-    # Save uploaded file
-    upload_path = os.path.join(UPLOAD_DIRECTORY, file.filename)
-    with open(upload_path, "wb+") as upload_file:
-        file_contents = await file.read()
-        upload_file.write(file_contents)
+    # The upload is converted from memory, it is never written to disk
+    file_contents = await file.read()
 
     # Create temporary output directory for processing
     import datetime
-    import tempfile
     
     filename_base = os.path.splitext(file.filename)[0]  # Remove extension
     date_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -257,7 +288,7 @@ async def convert_pdf_upload(
 
     # Process PDF with custom output directory
     params = CommonParams(
-        filepath=upload_path,
+        filepath=file.filename,
         page_range=page_range,
         force_ocr=force_ocr,
         paginate_output=paginate_output,
@@ -266,114 +297,98 @@ async def convert_pdf_upload(
     
         # Process the PDF
     try:
-        # Handle "all" format by generating all formats
-        if output_format == OutputFormat.all:
-            formats_to_generate = ["markdown", "json", "html", "chunks"]
-        else:
-            formats_to_generate = [output_format.value]
-        
-        # Generate each requested format
-        for format_type in formats_to_generate:
-            # Build comprehensive options dict preserving current working defaults
-            options = {
-                "output_dir": temp_output_dir,
-                "output_format": format_type,
-                # Current working defaults preserved
-                "page_range": page_range,
-                "force_ocr": force_ocr,
-                "paginate_output": paginate_output,
-            }
-            
-            # === INPUT & OCR PROCESSING ===
-            # Note: config_json is handled by ConfigParser.generate_config_dict()
-            if config_json:
-                options["config_json"] = config_json
-            if strip_existing_ocr:
-                options["strip_existing_ocr"] = strip_existing_ocr
-            if ocr_languages and ocr_languages != "en":
-                options["ocr_languages"] = ocr_languages
-            if skip_existing:
-                options["skip_existing"] = skip_existing
-                
-            # === CONTENT PROCESSING & QUALITY ===
-            # NOTE: LLM features disabled by default - will support local models in future
-            if use_llm:
-                options["use_llm"] = use_llm
-                # Pass llm_service if not disabled
-                if llm_service and llm_service.value != "disabled":
-                    options["llm_service"] = llm_service.value
-                if block_correction_prompt:
-                    options["block_correction_prompt"] = block_correction_prompt
-                if redo_inline_math:
-                    options["redo_inline_math"] = redo_inline_math
-                if max_context_length != 32000:
-                    options["max_context_length"] = max_context_length
-                    
-            if keep_page_headers_footers:
-                options["keep_page_headers_footers"] = keep_page_headers_footers
-            if debug:
-                options["debug"] = debug
-                
-            # === SPECIALIZED PROCESSING ===
-            if page_schema and use_llm:
-                # Structured extraction requires LLM
-                options["page_schema"] = page_schema
-            if processors:
-                options["processors"] = processors
-                
-            # === OUTPUT CUSTOMIZATION ===
-            if not extract_images:
-                options["disable_image_extraction"] = True
-            if bad_span_types:
-                options["bad_span_types"] = bad_span_types
-                
-            # === RTX 5090 PERFORMANCE OPTIMIZATION ===
-            if torch_device != "cuda":
-                options["torch_device"] = torch_device
-            if table_rec_batch_size != 48:
-                options["table_rec_batch_size"] = table_rec_batch_size
-            if detection_batch_size != 32:
-                options["detection_batch_size"] = detection_batch_size  
-            if recognition_batch_size != 64:
-                options["recognition_batch_size"] = recognition_batch_size
-            if disable_multiprocessing:
-                options["disable_multiprocessing"] = disable_multiprocessing
-                
-            config_parser = ConfigParser(options)
-            
-            config_dict = config_parser.generate_config_dict()
-            config_dict["pdftext_workers"] = 1
-            converter = PdfConverter(
-                config=config_dict,
-                artifact_dict=app_data["models"],
-                processor_list=config_parser.get_processors(),
-                renderer=config_parser.get_renderer(),
-                llm_service=config_parser.get_llm_service(),
-            )
-            rendered = converter(upload_path)
-            
-            # Save with format-specific filename
-            from marker.output import save_output
-            if output_format == OutputFormat.all:
-                format_filename = f"{filename_base}_{format_type}"
-            else:
-                format_filename = filename_base
-            save_output(rendered, temp_output_dir, format_filename)
-        
+        # Build comprehensive options dict preserving current working defaults
+        options = {
+            "output_dir": temp_output_dir,
+            "output_format": output_format.value,
+            # Current working defaults preserved
+            "page_range": page_range,
+            "force_ocr": force_ocr,
+            "paginate_output": paginate_output,
+        }
+
+        # === INPUT & OCR PROCESSING ===
+        # Note: config_json is handled by ConfigParser.generate_config_dict()
+        if config_json:
+            options["config_json"] = config_json
+        if strip_existing_ocr:
+            options["strip_existing_ocr"] = strip_existing_ocr
+        if ocr_languages and ocr_languages != "en":
+            options["ocr_languages"] = ocr_languages
+        if skip_existing:
+            options["skip_existing"] = skip_existing
+
+        # === CONTENT PROCESSING & QUALITY ===
+        # NOTE: LLM features disabled by default - will support local models in future
+        if use_llm:
+            options["use_llm"] = use_llm
+            # Pass llm_service if not disabled
+            if llm_service and llm_service.value != "disabled":
+                options["llm_service"] = llm_service.value
+            if block_correction_prompt:
+                options["block_correction_prompt"] = block_correction_prompt
+            if redo_inline_math:
+                options["redo_inline_math"] = redo_inline_math
+            if max_context_length != 32000:
+                options["max_context_length"] = max_context_length
+
+        if keep_page_headers_footers:
+            options["keep_page_headers_footers"] = keep_page_headers_footers
+        if debug:
+            options["debug"] = debug
+
+        # === SPECIALIZED PROCESSING ===
+        if page_schema and use_llm:
+            # Structured extraction requires LLM
+            options["page_schema"] = page_schema
+        if processors:
+            options["processors"] = processors
+
+        # === OUTPUT CUSTOMIZATION ===
+        if not extract_images:
+            options["disable_image_extraction"] = True
+        if bad_span_types:
+            options["bad_span_types"] = bad_span_types
+
+        # === RTX 5090 PERFORMANCE OPTIMIZATION ===
+        if torch_device != "cuda":
+            options["torch_device"] = torch_device
+        if table_rec_batch_size != 48:
+            options["table_rec_batch_size"] = table_rec_batch_size
+        if detection_batch_size != 32:
+            options["detection_batch_size"] = detection_batch_size
+        if recognition_batch_size != 64:
+            options["recognition_batch_size"] = recognition_batch_size
+        if disable_multiprocessing:
+            options["disable_multiprocessing"] = disable_multiprocessing
+
+        config_parser = ConfigParser(options)
+
+        config_dict = config_parser.generate_config_dict()
+        config_dict["pdftext_workers"] = 1
+        converter = PdfConverter(
+            config=config_dict,
+            artifact_dict=dict(app_data["models"]),
+            processor_list=config_parser.get_processors(),
+            renderer=config_parser.get_renderers(),
+            llm_service=config_parser.get_llm_service(),
+        )
+
+        # The document is built once, and every requested format is rendered from it
+        rendered_outputs = await run_in_threadpool(converter.render_all, file_contents)
+        save_outputs(
+            rendered_outputs,
+            config_parser.get_output_formats(),
+            temp_output_dir,
+            filename_base,
+        )
+
         # Create zip file for download
         zip_filename = f"{job_name}.zip"
         zip_path = os.path.join(UPLOAD_DIRECTORY, zip_filename)
-        
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Add all files from the output directory
-            for root, dirs, files in os.walk(temp_output_dir):
-                for file_item in files:
-                    file_path = os.path.join(root, file_item)
-                    arcname = os.path.relpath(file_path, temp_output_dir)
-                    zipf.write(file_path, arcname)
+        _zip_directory(temp_output_dir, zip_path)
         
         # Clean up
-        os.remove(upload_path)
         shutil.rmtree(temp_output_dir)
         
         # Return file for download
@@ -386,8 +401,6 @@ async def convert_pdf_upload(
         
     except Exception as e:
         # Clean up on error
-        if os.path.exists(upload_path):
-            os.remove(upload_path)
         if os.path.exists(temp_output_dir):
             shutil.rmtree(temp_output_dir)
         return {
@@ -396,6 +409,138 @@ async def convert_pdf_upload(
         }
 
 
+# Options clients can set through `options_json`, anything touching paths, debugging or code loading is left out
+JOB_OPTIONS = {
+    "use_llm",
+    "disable_image_extraction",
+    "disable_links",
+    "disable_ocr",
+    "disable_ocr_math",
+    "force_layout_block",
+    "html_tables_in_markdown",
+    "keep_page_headers_footers",
+    "redo_inline_math",
+    "strip_existing_ocr",
+    "structured_input",
+    "page_window_size",
+}
+
+
+def _run_conversion_job(job: Job, file_contents: bytes, filename_base: str, options: dict) -> str:
+    config_parser = ConfigParser(options)
+    config_dict = config_parser.generate_config_dict()
+    config_dict["pdftext_workers"] = 1
+    converter = PdfConverter(
+        config=config_dict,
+        artifact_dict=dict(app_data["models"]),
+        processor_list=config_parser.get_processors(),
+        renderer=config_parser.get_renderers(),
+        llm_service=config_parser.get_llm_service(),
+    )
+
+    output_formats = config_parser.get_output_formats()
+    if config_dict.get("page_window_size"):
+        # Windowed conversion reports progress as each window finishes, but cross-page processors only see a window
+        window_outputs = [[] for _ in output_formats]
+        for rendered_outputs in converter.stream_all(file_contents):
+            for outputs, rendered in zip(window_outputs, rendered_outputs):
+                outputs.append(rendered)
+            job.pages_done = converter.page_count
+            job.pages_total = converter.total_page_count
+        rendered_outputs = [merge_rendered(outputs) for outputs in window_outputs]
+    else:
+        rendered_outputs = converter.render_all(file_contents)
+        job.pages_done = job.pages_total = converter.page_count
+
+    temp_output_dir = tempfile.mkdtemp(prefix=f"marker_job_{job.id}_")
+    try:
+        save_outputs(
+            rendered_outputs,
+            output_formats,
+            temp_output_dir,
+            filename_base,
+        )
+        zip_path = os.path.join(JOB_RESULT_DIRECTORY, f"{job.id}.zip")
+        _zip_directory(temp_output_dir, zip_path)
+    finally:
+        shutil.rmtree(temp_output_dir)
+    return zip_path
+
+
+@app.post("/jobs")
+async def submit_job(
+    file: UploadFile = File(..., description="The document to convert."),
+    output_format: OutputFormat = Form(default=OutputFormat.markdown, description="Select output format"),
+    page_range: Optional[str] = Form(default="all", description="Page range: 'all' for all pages, or '1,2-5,10' for specific pages"),
+    force_ocr: Optional[bool] = Form(default=True, description="Force OCR for best accuracy with math and complex layouts"),
+    paginate_output: Optional[bool] = Form(default=True, description="Add page separators in output"),
+    options_json: Optional[str] = Form(default="", description="Additional conversion options as a JSON object, using the CLI option names.  Set page_window_size to convert in windows and get progress updates."),
+):
+    try:
+        options = json.loads(options_json) if options_json else {}
+    except json.JSONDecodeError as e:
+        return JSONResponse(status_code=400, content={"success": False, "error": f"Invalid options_json: {e}"})
+    if not isinstance(options, dict):
+        return JSONResponse(status_code=400, content={"success": False, "error": "options_json must be a JSON object"})
+    unsupported = sorted(set(options) - JOB_OPTIONS)
+    if unsupported:
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "error": f"Unsupported options: {', '.join(unsupported)}"},
+        )
+
+    options.update(
+        {
+            "output_format": output_format.value,
+            "page_range": page_range,
+            "force_ocr": force_ocr,
+            "paginate_output": paginate_output,
+        }
+    )
+
+    filename_base = os.path.splitext(file.filename)[0]
+    # Queued uploads are held in memory, the queue depth bounds how many there are
+    file_contents = await file.read()
+
+    try:
+        job = app_data["jobs"].submit(
+            file.filename,
+            lambda job: _run_conversion_job(job, file_contents, filename_base, options),
+        )
+    except QueueFullError as e:
+        # Backpressure, clients should retry once the queue drains
+        return JSONResponse(
+            status_code=429,
+            content={"success": False, "error": str(e)},
+            headers={"Retry-After": "10"},
+        )
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = app_data["jobs"].get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"success": False, "error": "Job not found"})
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = app_data["jobs"].get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"success": False, "error": "Job not found"})
+    if job.status != JobStatus.complete:
+        return JSONResponse(status_code=409, content={"success": False, **job.to_dict()})
+
+    # The zip is streamed back in chunks
+    return FileResponse(
+        path=job.result_path,
+        filename=f"{os.path.splitext(job.name)[0]}.zip",
+        media_type="application/zip",
+    )
+
+
 @click.command()
 @click.option("--port", type=int, default=8000, help="Port to run the server on")
 @click.option("--host", type=str, default="127.0.0.1", help="Host to run the server on")
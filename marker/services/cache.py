@@ -0,0 +1,103 @@
+import hashlib
+import json
+import threading
+from typing import List
+
+import PIL
+from pydantic import BaseModel
+
+from marker.logger import get_logger
+from marker.schema.blocks import Block
+from marker.services import BaseService
+from marker.util import get_config_values
+from marker.utils.cache import DiskCache, hash_image
+
+logger = get_logger()
+
+# Service settings that don't change the response, so they are left out of cache keys
+UNCACHED_CONFIG_KEYS = ("timeout", "retries", "retry", "api_key", "disable_tqdm")
+
+
+class CachedLLMService:
+    """
+    Wraps an LLM service with a content-addressed, on-disk response cache.  Responses are keyed on the service
+    and its model settings, the prompt, the image pixels and the response schema, so repeated requests skip the model.
+    Only successful responses are cached.
+    """
+
+    def __init__(self, service: BaseService, cache_dir: str, max_bytes: int):
+        self.service = service
+        self.cache = DiskCache(cache_dir, max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if "service" not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self.__dict__["service"], name)
+
+    def cache_key(
+        self,
+        prompt: str,
+        image: PIL.Image.Image | List[PIL.Image.Image] | None,
+        response_schema: type[BaseModel],
+    ) -> str:
+        images = image if isinstance(image, list) else [image] if image else []
+        service_config = {
+            k: v
+            for k, v in get_config_values(self.service).items()
+            if not any(part in k for part in UNCACHED_CONFIG_KEYS)
+        }
+        key_data = json.dumps(
+            {
+                "service": type(self.service).__name__,
+                "config": service_config,
+                "prompt": prompt,
+                "images": [hash_image(img) for img in images if img is not None],
+                "schema": response_schema.model_json_schema(),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def __call__(
+        self,
+        prompt: str,
+        image: PIL.Image.Image | List[PIL.Image.Image] | None,
+        block: Block | None,
+        response_schema: type[BaseModel],
+        max_retries: int | None = None,
+        timeout: int | None = None,
+    ):
+        key = self.cache_key(prompt, image, response_schema)
+        data = self.cache.get(key)
+        if data is not None:
+            try:
+                response = json.loads(data)
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring corrupt LLM cache entry {key}")
+            else:
+                self._count(block, hit=True)
+                return response
+
+        self._count(block, hit=False)
+        response = self.service(
+            prompt, image, block, response_schema, max_retries=max_retries, timeout=timeout
+        )
+        if response:
+            self.cache.put(key, json.dumps(response).encode())
+        return response
+
+    def _count(self, block: Block | None, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if block:
+            if hit:
+                block.update_metadata(llm_cache_hits=1)
+            else:
+                block.update_metadata(llm_cache_misses=1)
@@ -3,13 +3,14 @@ import time
 import traceback
 from typing import Annotated, List
 
+import httpx
 import PIL
-import requests
 from marker.logger import get_logger
 from pydantic import BaseModel
 
 from marker.schema.blocks import Block
 from marker.services import BaseService
+from marker.services.transport import get_llm_transport
 
 logger = get_logger()
 
@@ -111,13 +112,15 @@ class OllamaService(BaseService):
         # Adapted for Ollama's error patterns
         total_tries = max_retries + 1
         temperature = 0  # Not used by Ollama API, but kept for future
+        # Pooled keep-alive connections, with one concurrency limit shared by every LLM processor and conversion
+        transport = get_llm_transport()
         
         for attempt in range(1, total_tries + 1):
             try:
                 # ==================== API CALL ====================
-                response = requests.post(url, json=payload, headers=headers, timeout=timeout)
-                response.raise_for_status()
-                response_data = response.json()
+                response_data = transport.run(
+                    lambda: transport.post_json(url, payload, headers=headers, timeout=timeout)
+                )
                 
                 # ==================== TOKEN TRACKING ====================
                 # From GeminiService lines 79-83
@@ -141,8 +144,8 @@ class OllamaService(BaseService):
             # Adapted from GeminiService lines 85-120
             
             # Handle HTTP errors (parallel to Gemini's APIError handling)
-            except requests.exceptions.HTTPError as e:
-                status_code = e.response.status_code if e.response else None
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
                 
                 # Rate limiting / Server errors (parallel to Gemini's 429, 443, 503)
                 if status_code in [429, 500, 503]:
@@ -177,7 +180,7 @@ class OllamaService(BaseService):
                     break
             
             # Handle connection/network errors
-            except requests.exceptions.RequestException as e:
+            except httpx.RequestError as e:
                 if attempt < total_tries:
                     wait_time = attempt * self.retry_wait_time
                     logger.warning(
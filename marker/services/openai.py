@@ -11,6 +11,7 @@ from pydantic import BaseModel
 
 from marker.schema.blocks import Block
 from marker.services import BaseService
+from marker.services.transport import get_llm_transport
 
 logger = get_logger()
 
@@ -73,7 +74,8 @@ class OpenAIService(BaseService):
         if timeout is None:
             timeout = self.timeout
 
-        client = self.get_client()
+        transport = get_llm_transport()
+        client = self.get_async_client()
         image_data = self.format_image_for_llm(image)
 
         messages = [
@@ -89,15 +91,17 @@ class OpenAIService(BaseService):
         total_tries = max_retries + 1
         for tries in range(1, total_tries + 1):
             try:
-                response = client.beta.chat.completions.parse(
-                    extra_headers={
-                        "X-Title": "Marker",
-                        "HTTP-Referer": "https://github.com/datalab-to/marker",
-                    },
-                    model=self.openai_model,
-                    messages=messages,
-                    timeout=timeout,
-                    response_format=response_schema,
+                response = transport.run(
+                    lambda: client.beta.chat.completions.parse(
+                        extra_headers={
+                            "X-Title": "Marker",
+                            "HTTP-Referer": "https://github.com/datalab-to/marker",
+                        },
+                        model=self.openai_model,
+                        messages=messages,
+                        timeout=timeout,
+                        response_format=response_schema,
+                    )
                 )
                 response_text = response.choices[0].message.content
                 total_tokens = response.usage.total_tokens
@@ -126,5 +130,8 @@ class OpenAIService(BaseService):
 
         return {}
 
-    def get_client(self) -> openai.OpenAI:
-        return openai.OpenAI(api_key=self.openai_api_key, base_url=self.openai_base_url)
+    def get_async_client(self) -> openai.AsyncOpenAI:
+        # Shared by every request to the same endpoint, so connections are kept alive between blocks
+        return get_llm_transport().openai_client(
+            api_key=self.openai_api_key, base_url=self.openai_base_url
+        )
@@ -0,0 +1,107 @@
+import asyncio
+import atexit
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+import httpx
+
+from marker.settings import settings
+
+T = TypeVar("T")
+
+
+class LLMTransport:
+    """
+    A shared HTTP transport for LLM services.  Requests run on one background event loop, over a pooled keep-alive
+    connection, and a single semaphore caps the number in flight across every caller in the process.
+    Synchronous code calls `run`, async code on another event loop awaits `arun`.
+    """
+
+    def __init__(self, max_concurrency: int, max_connections: int, keepalive_expiry: float):
+        self.max_concurrency = max_concurrency
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True, name="marker-llm-transport")
+        self._thread.start()
+        self._semaphore = self._call_soon(lambda: asyncio.Semaphore(max_concurrency))
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        self._openai_clients: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _call_soon(self, fn: Callable[[], T]) -> T:
+        async def wrapper():
+            return fn()
+
+        return asyncio.run_coroutine_threadsafe(wrapper(), self._loop).result()
+
+    async def _limited(self, coro_fn: Callable[[], Awaitable[T]]) -> T:
+        async with self._semaphore:
+            return await coro_fn()
+
+    def run(self, coro_fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a request from synchronous code, blocking until it finishes.  `coro_fn` creates the request coroutine.
+        """
+        return asyncio.run_coroutine_threadsafe(self._limited(coro_fn), self._loop).result()
+
+    async def arun(self, coro_fn: Callable[[], Awaitable[T]]) -> T:
+        future = asyncio.run_coroutine_threadsafe(self._limited(coro_fn), self._loop)
+        return await asyncio.wrap_future(future)
+
+    async def post_json(self, url: str, payload: dict, headers: dict | None = None, timeout: float | None = None) -> dict:
+        response = await self.client.post(url, json=payload, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def openai_client(self, api_key: str, base_url: str, **kwargs):
+        """
+        An async OpenAI client that shares the pooled connections, reused for the same key and url.
+        """
+        import openai
+
+        key = (api_key, base_url, tuple(sorted(kwargs.items())))
+        with self._lock:
+            if key not in self._openai_clients:
+                self._openai_clients[key] = openai.AsyncOpenAI(
+                    api_key=api_key, base_url=base_url, http_client=self.client, **kwargs
+                )
+            return self._openai_clients[key]
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+_transport: LLMTransport | None = None
+_transport_lock = threading.Lock()
+
+
+def get_llm_transport() -> LLMTransport:
+    # One transport per process, so the concurrency limit holds across conversions
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = LLMTransport(
+                settings.LLM_MAX_CONCURRENCY,
+                settings.LLM_MAX_CONNECTIONS,
+                settings.LLM_KEEPALIVE_EXPIRY,
+            )
+        return _transport
+
+
+@atexit.register
+def close_llm_transport():
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+            _transport = None
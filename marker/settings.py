@@ -22,8 +22,22 @@ class Settings(BaseSettings):
     OUTPUT_ENCODING: str = "utf-8"
     OUTPUT_IMAGE_FORMAT: str = "JPEG"
 
+    # Caching
+    PAGE_IMAGE_CACHE_SIZE_MB: int = 2048  # Budget for lazily rendered page images, shared by the whole process
+
+    # Cross-document batching of model calls, used by the server
+    MODEL_BATCH_MAX_WAIT_MS: float = 20
+    MODEL_BATCH_MAX_ITEMS: int = 256
+
+    # Server job queue
+    JOB_WORKERS: int = 2
+    JOB_MAX_QUEUE_DEPTH: int = 16
+
     # LLM
     GOOGLE_API_KEY: Optional[str] = ""
+    LLM_MAX_CONCURRENCY: int = 8  # Requests in flight at once, across every processor and conversion in the process
+    LLM_MAX_CONNECTIONS: int = 16
+    LLM_KEEPALIVE_EXPIRY: float = 30  # Seconds an idle pooled connection is kept open
 
     # General models
     TORCH_DEVICE: Optional[str] = (
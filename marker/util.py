@@ -1,7 +1,7 @@
 import inspect
 import os
 from importlib import import_module
-from typing import List, Annotated
+from typing import Any, Dict, List, Annotated, get_origin
 import re
 
 import numpy as np
@@ -79,6 +79,16 @@ def assign_config(cls, config: BaseModel | dict | None):
             setattr(cls, split_k, dict_config[k])
 
 
+def get_config_values(obj) -> Dict[str, Any]:
+    # The current values of every Annotated config attribute on the object, including inherited ones
+    values = {}
+    for base in reversed(obj.__class__.__mro__):
+        for attr_name, annotation in getattr(base, "__annotations__", {}).items():
+            if get_origin(annotation) is Annotated:
+                values[attr_name] = getattr(obj, attr_name)
+    return values
+
+
 def parse_range_str(range_str: str) -> List[int]:
     range_lst = range_str.split(",")
     page_lst = []
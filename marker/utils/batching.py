@@ -0,0 +1,161 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from pydantic import BaseModel
+
+from marker.logger import get_logger
+
+logger = get_logger()
+
+# Keyword arguments that hold one value per input item, these are concatenated when requests are merged
+PER_ITEM_ARGS = ("images", "task_names", "polygons", "input_text", "bboxes")
+
+
+@dataclass
+class BatchRequest:
+    item_args: Dict[str, list]
+    positional: bool  # Whether the inputs were passed positionally, like the layout and ocr error models
+    shared_kwargs: Dict[str, Any]
+    count: int
+    future: Future = field(default_factory=Future)
+
+    @property
+    def group_key(self) -> Tuple:
+        # Only requests with identical non-item arguments can share a batch
+        return (
+            self.positional,
+            tuple(sorted((k, v is None) for k, v in self.item_args.items())),
+            repr(sorted(self.shared_kwargs.items())),
+        )
+
+
+def split_result(result: Any, start: int, end: int, total: int) -> Any:
+    if isinstance(result, list):
+        return result[start:end]
+    elif isinstance(result, BaseModel):
+        # Results like OCRErrorDetectionResult hold one list entry per input
+        update = {
+            k: v[start:end]
+            for k, v in result
+            if isinstance(v, list) and len(v) == total
+        }
+        return result.model_copy(update=update)
+    raise TypeError(f"Cannot split predictor result of type {type(result)}")
+
+
+class BatchingPredictor:
+    """
+    Wraps a surya predictor so that concurrent calls from different conversions are merged into full batches.
+    Requests wait up to `max_wait_ms` for others to arrive, then run together and get their own slice of the results.
+    Calls into the wrapped model are serialized, so it is never run from two threads at once.
+    """
+
+    def __init__(self, model, max_wait_ms: float = 20, max_batch_items: int = 256):
+        self.model = model
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_items = max_batch_items
+        self.disable_tqdm = True
+        self._requests: queue.Queue[BatchRequest] = queue.Queue()
+        self._model_lock = threading.Lock()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._dispatcher.start()
+
+    def __getattr__(self, name):
+        # Only called for attributes that aren't on the wrapper, like the model's processor or device
+        if "model" not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self.__dict__["model"], name)
+
+    def __call__(self, *args, **kwargs):
+        item_args = {k: v for k, v in kwargs.items() if k in PER_ITEM_ARGS}
+        shared_kwargs = {k: v for k, v in kwargs.items() if k not in PER_ITEM_ARGS}
+        positional = len(args) == 1
+        if positional:
+            item_args["inputs"] = args[0]
+
+        counts = {len(v) for v in item_args.values() if v is not None}
+        if len(args) > 1 or len(counts) != 1 or 0 in counts:
+            # Empty calls, and calls we can't split reliably, go straight to the model
+            return self._call_model(*args, **kwargs)
+
+        request = BatchRequest(
+            item_args=item_args,
+            positional=positional,
+            shared_kwargs=shared_kwargs,
+            count=counts.pop(),
+        )
+        self._requests.put(request)
+        return request.future.result()
+
+    def _call_model(self, *args, **kwargs):
+        # The wrapped model is never called from two threads at once
+        with self._model_lock:
+            self.model.disable_tqdm = self.disable_tqdm
+            return self.model(*args, **kwargs)
+
+    @staticmethod
+    def _merge_args(requests: List[BatchRequest]) -> Dict[str, Any]:
+        merged = {}
+        for name in requests[0].item_args:
+            values = [r.item_args[name] for r in requests]
+            merged[name] = None if any(v is None for v in values) else sum(values, [])
+        return merged
+
+    def _collect(self) -> List[BatchRequest]:
+        requests = [self._requests.get()]
+        deadline = time.monotonic() + self.max_wait
+        items = requests[0].count
+        while items < self.max_batch_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            requests.append(request)
+            items += request.count
+        return requests
+
+    def _dispatch_loop(self):
+        while True:
+            groups: Dict[Tuple, List[BatchRequest]] = {}
+            for request in self._collect():
+                groups.setdefault(request.group_key, []).append(request)
+
+            for requests in groups.values():
+                self._run_batch(requests)
+
+    def _run_batch(self, requests: List[BatchRequest]):
+        merged = self._merge_args(requests)
+        total = sum(r.count for r in requests)
+        try:
+            if requests[0].positional:
+                inputs = merged.pop("inputs")
+                result = self._call_model(inputs, **merged, **requests[0].shared_kwargs)
+            else:
+                result = self._call_model(**merged, **requests[0].shared_kwargs)
+        except Exception as e:
+            logger.error(f"Batched predictor call failed: {e}")
+            for request in requests:
+                request.future.set_exception(e)
+            return
+
+        start = 0
+        for request in requests:
+            end = start + request.count
+            request.future.set_result(split_result(result, start, end, total))
+            start = end
+
+
+def create_batching_model_dict(
+    model_dict: dict, max_wait_ms: float = 20, max_batch_items: int = 256
+) -> dict:
+    return {
+        k: BatchingPredictor(v, max_wait_ms=max_wait_ms, max_batch_items=max_batch_items)
+        for k, v in model_dict.items()
+    }
@@ -0,0 +1,185 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from PIL import Image
+
+from marker.settings import settings
+
+
+def image_nbytes(image: Image.Image) -> int:
+    return image.width * image.height * len(image.getbands())
+
+
+def hash_image(image: Image.Image) -> str:
+    # Raw pixels identify the image without paying for an encode on cache hits
+    digest = hashlib.sha256()
+    digest.update(f"{image.mode}:{image.width}x{image.height}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class ImageLRUCache:
+    """
+    A thread-safe, in-memory LRU cache for PIL images with a byte budget.
+    Keys are tuples whose first element identifies the owner, so all of an owner's images can be evicted at once.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._images: OrderedDict[Hashable, Image.Image] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._images)
+
+    def get(self, key: Hashable) -> Image.Image | None:
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def put(self, key: Hashable, image: Image.Image):
+        size = image_nbytes(image)
+        if size > self.max_bytes:
+            # Never cache images that would evict everything else
+            return
+
+        with self._lock:
+            if key in self._images:
+                self.current_bytes -= image_nbytes(self._images.pop(key))
+
+            self._images[key] = image
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.current_bytes -= image_nbytes(evicted)
+
+    def get_or_render(
+        self, key: Hashable, render: Callable[[], Image.Image]
+    ) -> Image.Image:
+        image = self.get(key)
+        if image is None:
+            image = render()
+            self.put(key, image)
+        return image
+
+    def evict_owner(self, owner: Hashable):
+        with self._lock:
+            for key in [k for k in self._images if k[0] == owner]:
+                self.current_bytes -= image_nbytes(self._images.pop(key))
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self.current_bytes = 0
+
+
+class DiskCache:
+    """
+    A size-capped, on-disk cache of byte blobs.  Reads refresh a file's modification time, so eviction drops the
+    least recently used entries first.  Writes are atomic, so several processes can share a cache directory.
+    """
+
+    suffix = ".bin"
+    # Eviction frees space below the budget, so a full cache isn't rescanned on every write
+    evict_target = 0.9
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # The directory size as of the last scan plus this process's writes, scanned on the first write
+        self.current_bytes: int | None = None
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes, evict: bool = True):
+        # Pass evict=False when storing many entries at once, then call evict once at the end
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self.current_bytes is None:
+                # The scan already sees the new file
+                self.current_bytes = self._scan_size()
+            else:
+                self.current_bytes += len(data) - replaced
+            over_budget = self.current_bytes > self.max_bytes
+        # One thread evicts at a time, the others keep writing instead of queueing up to rescan the directory
+        if evict and over_budget and self._evict_lock.acquire(blocking=False):
+            try:
+                self.evict()
+            finally:
+                self._evict_lock.release()
+
+    def _scan_size(self) -> int:
+        return sum(
+            entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.name.endswith(self.suffix)
+        )
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(self.suffix):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes * self.evict_target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # Already evicted by another process
+                total -= size
+
+        with self._lock:
+            self.current_bytes = total
+
+
+def hash_file(filepath: str | bytes, chunk_size: int = 1024 * 1024) -> str:
+    # In-memory files hash the same as the file on disk
+    if isinstance(filepath, bytes):
+        return hashlib.sha256(filepath).hexdigest()
+
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Shared by every document in the process, so memory stays bounded across concurrent conversions
+page_image_cache = ImageLRUCache(settings.PAGE_IMAGE_CACHE_SIZE_MB * 1024 * 1024)
@@ -0,0 +1,115 @@
+"""
+Batch versions of the PolygonBox operations, for hot loops that would otherwise build one validated PolygonBox per
+step.  Bounding boxes are (N, 4) arrays of x0, y0, x1, y1 and polygons are (N, 4, 2) arrays of corners, clockwise
+from the top left.  Each function matches the result of the PolygonBox method it is named after.
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+from marker.schema.polygon import PolygonBox
+
+# Direction each corner moves in when a polygon is expanded
+EXPAND_DIRECTIONS = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=np.float64)
+
+
+def bboxes_array(polygons: Sequence[PolygonBox]) -> np.ndarray:
+    if len(polygons) == 0:
+        return np.zeros((0, 4))
+    return corners_to_bboxes(corners_array(polygons))
+
+
+def corners_array(polygons: Sequence[PolygonBox]) -> np.ndarray:
+    if len(polygons) == 0:
+        return np.zeros((0, 4, 2))
+    return np.array([p.polygon for p in polygons], dtype=np.float64)
+
+
+def corners_to_bboxes(corners: np.ndarray) -> np.ndarray:
+    return np.concatenate([corners.min(axis=1), corners.max(axis=1)], axis=1)
+
+
+def to_polygons(corners: np.ndarray) -> List[PolygonBox]:
+    # Rescaling, clipping and expanding keep the corner ordering valid, so validation can be skipped
+    return [PolygonBox.model_construct(polygon=c) for c in corners.tolist()]
+
+
+def rescale(coords: np.ndarray, old_size, new_size) -> np.ndarray:
+    """
+    Rescale bounding boxes or polygons from `old_size` to `new_size`.
+    """
+    scale = np.array([new_size[0] / old_size[0], new_size[1] / old_size[1]])
+    return (coords.reshape(-1, 2) * scale).reshape(coords.shape)
+
+
+def fit_to_bounds(coords: np.ndarray, bounds) -> np.ndarray:
+    """
+    Clip bounding boxes or polygons to `bounds`, given as x0, y0, x1, y1.
+    """
+    points = coords.reshape(-1, 2)
+    points = np.stack(
+        [
+            np.clip(points[:, 0], bounds[0], bounds[2]),
+            np.clip(points[:, 1], bounds[1], bounds[3]),
+        ],
+        axis=1,
+    )
+    return points.reshape(coords.shape)
+
+
+def expand(corners: np.ndarray, x_margin, y_margin) -> np.ndarray:
+    """
+    Expand polygons by a fraction of their width and height.  The margins can be scalars or one value per polygon.
+    """
+    bboxes = corners_to_bboxes(corners)
+    x_offset = np.asarray(x_margin, dtype=np.float64) * (bboxes[:, 2] - bboxes[:, 0])
+    y_offset = np.asarray(y_margin, dtype=np.float64) * (bboxes[:, 3] - bboxes[:, 1])
+    offsets = np.stack([x_offset, y_offset], axis=-1)[:, np.newaxis, :]
+    return corners + EXPAND_DIRECTIONS * offsets
+
+
+def minimum_gap(bboxes1: np.ndarray, bboxes2: np.ndarray) -> np.ndarray:
+    """
+    The (N, M) matrix of the shortest distances between boxes, which is 0 for boxes that touch or overlap.
+    """
+    boxes1 = bboxes1[:, np.newaxis, :]
+    boxes2 = bboxes2[np.newaxis, :, :]
+    dx = np.maximum(0, np.maximum(boxes1[..., 0] - boxes2[..., 2], boxes2[..., 0] - boxes1[..., 2]))
+    dy = np.maximum(0, np.maximum(boxes1[..., 1] - boxes2[..., 3], boxes2[..., 1] - boxes1[..., 3]))
+    return np.hypot(dx, dy)
+
+
+def center_distance(
+    bboxes1: np.ndarray,
+    bboxes2: np.ndarray,
+    x_weight: float = 1,
+    y_weight: float = 1,
+    absolute: bool = False,
+) -> np.ndarray:
+    centers1 = ((bboxes1[:, :2] + bboxes1[:, 2:]) / 2)[:, np.newaxis, :]
+    centers2 = ((bboxes2[:, :2] + bboxes2[:, 2:]) / 2)[np.newaxis, :, :]
+    dx = centers1[..., 0] - centers2[..., 0]
+    dy = centers1[..., 1] - centers2[..., 1]
+    if absolute:
+        return np.abs(dx) * x_weight + np.abs(dy) * y_weight
+    return np.sqrt(dx**2 * x_weight + dy**2 * y_weight)
+
+
+def intersection_area(bboxes1: np.ndarray, bboxes2: np.ndarray) -> np.ndarray:
+    boxes1 = bboxes1[:, np.newaxis, :]
+    boxes2 = bboxes2[np.newaxis, :, :]
+    width = np.maximum(0, np.minimum(boxes1[..., 2], boxes2[..., 2]) - np.maximum(boxes1[..., 0], boxes2[..., 0]))
+    height = np.maximum(0, np.minimum(boxes1[..., 3], boxes2[..., 3]) - np.maximum(boxes1[..., 1], boxes2[..., 1]))
+    return width * height
+
+
+def intersection_pct(bboxes1: np.ndarray, bboxes2: np.ndarray) -> np.ndarray:
+    """
+    The (N, M) matrix of the fraction of each box in `bboxes1` covered by each box in `bboxes2`.
+    """
+    areas = (bboxes1[:, 2] - bboxes1[:, 0]) * (bboxes1[:, 3] - bboxes1[:, 1])
+    intersections = intersection_area(bboxes1, bboxes2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = intersections / areas[:, np.newaxis]
+    return np.where(areas[:, np.newaxis] == 0, 0, pct)
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import pickle
+import threading
+from typing import Any, Dict, List
+
+from PIL import Image
+from pydantic import BaseModel
+
+from marker.logger import get_logger
+from marker.utils.batching import PER_ITEM_ARGS, split_result
+from marker.utils.cache import DiskCache, hash_image
+
+logger = get_logger()
+
+# The models that run once per page or per line, where repeated pages are worth caching
+CACHED_MODELS = ("layout_model", "detection_model", "ocr_error_model", "recognition_model")
+
+
+def model_version(name: str) -> str:
+    from surya.settings import settings as surya_settings
+
+    checkpoints = {
+        k: getattr(surya_settings, k)
+        for k in dir(surya_settings)
+        if k.endswith("_CHECKPOINT")
+    }
+    return json.dumps({"model": name, "checkpoints": checkpoints}, sort_keys=True, default=str)
+
+
+def hash_item(value: Any) -> str:
+    if isinstance(value, Image.Image):
+        return hash_image(value)
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def strip_images(result: Any) -> Any:
+    # Results like detection heatmaps are large and unused, so they are left out of the cache
+    if isinstance(result, list):
+        return [strip_images(r) for r in result]
+    if isinstance(result, BaseModel):
+        update = {k: None for k, v in result if isinstance(v, Image.Image)}
+        return result.model_copy(update=update) if update else result
+    return result
+
+
+def merge_results(parts: List[Any]) -> Any:
+    """
+    Join single item results back into one result, the inverse of `split_result`.
+    """
+    if isinstance(parts[0], list):
+        return [item for part in parts for item in part]
+    elif isinstance(parts[0], BaseModel):
+        # Per-item fields were split into one entry per part
+        update = {
+            k: [item for part in parts for item in getattr(part, k)]
+            for k, v in parts[0]
+            if isinstance(v, list) and len(v) == 1
+        }
+        return parts[0].model_copy(update=update)
+    raise TypeError(f"Cannot merge predictor results of type {type(parts[0])}")
+
+
+class CachedPredictor:
+    """
+    Wraps a surya predictor with a persistent cache of per-item results.  Each input item, like a page image, is
+    keyed on its content, the other call arguments and the model checkpoints, so repeated pages skip inference.
+    Only the items that miss the cache are sent to the model.
+    """
+
+    def __init__(self, model, name: str, cache: DiskCache):
+        self.model = model
+        self.name = name
+        self.cache = cache
+        self.version = model_version(name)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if "model" not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self.__dict__["model"], name)
+
+    def __setattr__(self, name, value):
+        # Settings like disable_tqdm are meant for the wrapped model
+        if name in ("model", "name", "cache", "version", "hits", "misses", "_lock"):
+            super().__setattr__(name, value)
+        else:
+            setattr(self.model, name, value)
+
+    def item_keys(self, item_args: Dict[str, list], shared_kwargs: Dict[str, Any], count: int) -> List[str]:
+        # Batch sizes change how the model runs, not what it returns
+        shared = json.dumps(
+            {k: v for k, v in shared_kwargs.items() if not k.endswith("batch_size")},
+            sort_keys=True,
+            default=str,
+        )
+        keys = []
+        for i in range(count):
+            digest = hashlib.sha256()
+            digest.update(self.version.encode())
+            digest.update(shared.encode())
+            for name in sorted(item_args):
+                value = item_args[name]
+                digest.update(f"{name}:{hash_item(None if value is None else value[i])}".encode())
+            keys.append(digest.hexdigest())
+        return keys
+
+    def __call__(self, *args, **kwargs):
+        item_args = {k: v for k, v in kwargs.items() if k in PER_ITEM_ARGS}
+        shared_kwargs = {k: v for k, v in kwargs.items() if k not in PER_ITEM_ARGS}
+        positional = len(args) == 1
+        if positional:
+            item_args["inputs"] = args[0]
+
+        counts = {len(v) for v in item_args.values() if v is not None}
+        if len(args) > 1 or len(counts) != 1 or 0 in counts:
+            # Calls we can't split into items go straight to the model
+            return self.model(*args, **kwargs)
+
+        count = counts.pop()
+        keys = self.item_keys(item_args, shared_kwargs, count)
+        parts = [self._get(key) for key in keys]
+        missing = [i for i, part in enumerate(parts) if part is None]
+        with self._lock:
+            self.hits += count - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            miss_args = {
+                k: None if v is None else [v[i] for i in missing]
+                for k, v in item_args.items()
+            }
+            if positional:
+                result = self.model(miss_args.pop("inputs"), **miss_args, **shared_kwargs)
+            else:
+                result = self.model(**miss_args, **shared_kwargs)
+
+            for j, i in enumerate(missing):
+                parts[i] = split_result(result, j, j + 1, len(missing))
+                self.cache.put(
+                    keys[i],
+                    pickle.dumps(strip_images(parts[i]), protocol=pickle.HIGHEST_PROTOCOL),
+                    evict=False,
+                )
+            self.cache.evict()
+
+        return merge_results(parts)
+
+    def _get(self, key: str) -> Any:
+        data = self.cache.get(key)
+        if data is None:
+            return None
+        try:
+            return pickle.loads(data)
+        except Exception:
+            logger.warning(f"Ignoring corrupt model cache entry {key}")
+            return None
+
+
+def cache_models(artifact_dict: Dict[str, Any], cache_dir: str, max_bytes: int) -> Dict[str, Any]:
+    cache = DiskCache(cache_dir, max_bytes)
+    return {
+        k: CachedPredictor(v, k, cache) if k in CACHED_MODELS and v is not None else v
+        for k, v in artifact_dict.items()
+    }
@@ -0,0 +1,178 @@
+import math
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from marker.utils.batching import PER_ITEM_ARGS
+
+_active_profile: ContextVar[Optional["PipelineProfile"]] = ContextVar("active_profile", default=None)
+_active_stage: ContextVar[Optional["StageStats"]] = ContextVar("active_stage", default=None)
+
+
+def peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class ModelStats:
+    calls: int = 0
+    batches: int = 0
+    items: int = 0
+    max_batch_size: int = 0
+
+
+@dataclass
+class StageStats:
+    name: str
+    runs: int = 0
+    page_count: int = 0
+    wall_time: float = 0
+    cpu_time: float = 0
+    peak_rss_delta: int = 0
+    models: Dict[str, ModelStats] = field(default_factory=lambda: defaultdict(ModelStats))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "runs": self.runs,
+            "page_count": self.page_count,
+            "wall_time": round(self.wall_time, 4),
+            "cpu_time": round(self.cpu_time, 4),
+            "peak_rss_delta": self.peak_rss_delta,
+            "models": {name: vars(stats) for name, stats in self.models.items()},
+        }
+
+
+class PipelineProfile:
+    """
+    Records wall time, CPU time, peak RSS growth and model batches for each pipeline stage.
+    CPU time and RSS are process-wide, so they include other conversions running in the same process.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, StageStats] = {}
+        self.page_times: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        token = _active_profile.set(self)
+        try:
+            yield self
+        finally:
+            _active_profile.reset(token)
+
+    @contextmanager
+    def stage(self, name: str, page_ids: Iterable[int] = ()):
+        page_ids = list(page_ids)
+        with self._lock:
+            stats = self.stages.setdefault(name, StageStats(name=name))
+
+        rss_start = peak_rss_bytes()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        token = _active_stage.set(stats)
+        try:
+            yield stats
+        finally:
+            _active_stage.reset(token)
+            wall_time = time.perf_counter() - wall_start
+            with self._lock:
+                stats.runs += 1
+                stats.page_count += len(page_ids)
+                stats.wall_time += wall_time
+                stats.cpu_time += time.process_time() - cpu_start
+                stats.peak_rss_delta += peak_rss_bytes() - rss_start
+                # Stages run over many pages at once, so each page gets an even share of the time
+                for page_id in page_ids:
+                    self.page_times[page_id][name] += wall_time / len(page_ids)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stages": [stats.to_dict() for stats in self.stages.values()],
+            "total_wall_time": round(sum(s.wall_time for s in self.stages.values()), 4),
+        }
+
+    def page_dict(self, page_id: int) -> Dict[str, float]:
+        return {name: round(t, 4) for name, t in self.page_times.get(page_id, {}).items()}
+
+
+@contextmanager
+def profile_stage(name: str, page_ids: Iterable[int] = ()):
+    """
+    Record a stage on the active profile, if there is one.
+    """
+    profile = _active_profile.get()
+    if profile is None:
+        yield None
+        return
+
+    with profile.stage(name, page_ids) as stats:
+        yield stats
+
+
+def count_items(args, kwargs) -> int:
+    if args and isinstance(args[0], list):
+        return len(args[0])
+    for name in PER_ITEM_ARGS:
+        if isinstance(kwargs.get(name), list):
+            return len(kwargs[name])
+    return 0
+
+
+class ProfiledPredictor:
+    """
+    Wraps a model so its calls are counted against the active stage.
+    """
+
+    def __init__(self, model, name: str):
+        self.model = model
+        self.name = name
+
+    def __getattr__(self, name):
+        if "model" not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self.__dict__["model"], name)
+
+    def __setattr__(self, name, value):
+        # Settings like disable_tqdm are meant for the wrapped model
+        if name in ("model", "name"):
+            super().__setattr__(name, value)
+        else:
+            setattr(self.model, name, value)
+
+    def __call__(self, *args, **kwargs):
+        stats = _active_stage.get()
+        if stats is not None:
+            items = count_items(args, kwargs)
+            # Predictors name their batch size differently, like recognition_batch_size
+            batch_size = next(
+                (v for k, v in kwargs.items() if k.endswith("batch_size") and v), items
+            )
+            model_stats = stats.models[self.name]
+            model_stats.calls += 1
+            model_stats.items += items
+            model_stats.batches += math.ceil(items / batch_size) if items else 0
+            model_stats.max_batch_size = max(model_stats.max_batch_size, min(items, batch_size))
+        return self.model(*args, **kwargs)
+
+
+def profile_models(artifact_dict: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: ProfiledPredictor(v, k) if k.endswith("_model") and v is not None else v
+        for k, v in artifact_dict.items()
+    }
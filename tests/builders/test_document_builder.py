@@ -40,3 +40,16 @@ def test_document_builder_inline_eq(pdf_document):
     assert first_span.block_type == BlockTypes.Span
     assert first_span.text.strip() == "Subspace Adversarial Training"
     assert "bold" in first_span.formats
+
+
+@pytest.mark.filename("thinkpython.pdf")
+@pytest.mark.config({"page_range": [0]})
+def test_document_builder_lazy_images(pdf_document):
+    first_page = pdf_document.pages[0]
+    assert first_page.lowres_image is None
+    assert first_page.highres_image is None
+
+    lowres = first_page.get_image(highres=False)
+    highres = first_page.get_image(highres=True)
+    assert highres.size[0] > lowres.size[0]
+    assert first_page.get_image(highres=True).size == highres.size
@@ -0,0 +1,76 @@
+from marker.builders.fast_layout import FastLayoutEngine
+from marker.providers import ProviderOutput
+from marker.schema.polygon import PolygonBox
+from marker.schema.text.line import Line
+from marker.schema.text.span import Span
+
+PAGE_BBOX = [0, 0, 612, 792]
+
+
+def make_line(text, bbox, block_idx, font_size=10, formats=("plain",), cells=None):
+    # cells splits the line into separate spans, like table cells with whitespace between them
+    span_bboxes = cells or [bbox]
+    span_texts = text.split("|") if cells else [text]
+    spans = [
+        Span(
+            polygon=PolygonBox.from_bbox(span_bbox),
+            text=span_text,
+            font="Times",
+            font_weight=400,
+            font_size=font_size,
+            minimum_position=0,
+            maximum_position=len(span_text),
+            formats=list(formats),
+            page_id=0,
+        )
+        for span_text, span_bbox in zip(span_texts, span_bboxes)
+    ]
+    return ProviderOutput(
+        line=Line(polygon=PolygonBox.from_bbox(bbox), page_id=0),
+        spans=spans,
+        block_idx=block_idx,
+    )
+
+
+def paragraph(y, x0, x1, block_idx, count=8):
+    return [
+        make_line("Some body text that runs across the column " * 2, [x0, y + 12 * i, x1, y + 12 * i + 10], block_idx)
+        for i in range(count)
+    ]
+
+
+def test_fast_layout_two_columns():
+    lines = [make_line("A Document Title", [72, 60, 540, 80], 0, font_size=18)]
+    lines += paragraph(100, 72, 296, 1) + paragraph(200, 72, 296, 2)
+    lines += paragraph(100, 316, 540, 3) + paragraph(200, 316, 540, 4)
+    lines += [make_line("12", [300, 770, 312, 780], 5)]
+
+    results, confidences = FastLayoutEngine()([lines], [PAGE_BBOX])
+    boxes = sorted(results[0].bboxes, key=lambda b: b.position)
+    assert [b.label for b in boxes] == ["SectionHeader", "Text", "Text", "Text", "Text", "PageFooter"]
+    # The left column is read before the right one
+    assert [b.polygon[0][0] for b in boxes[1:5]] == [72, 72, 316, 316]
+    assert confidences[0] >= 0.75
+
+
+def test_fast_layout_tables_and_fallback():
+    lines = paragraph(72, 72, 540, 0)
+    for row in range(4):
+        y = 200 + row * 14
+        lines.append(
+            make_line(
+                "Name|1.0|2.0|3.0",
+                [72, y, 540, y + 10],
+                1 + row,
+                cells=[[72, y, 140, y + 10], [250, y, 280, y + 10], [350, y, 380, y + 10], [450, y, 480, y + 10]],
+            )
+        )
+    lines += paragraph(290, 72, 540, 5)
+
+    engine = FastLayoutEngine()
+    results, confidences = engine([lines, []], [PAGE_BBOX, PAGE_BBOX])
+    labels = [b.label for b in sorted(results[0].bboxes, key=lambda b: b.position)]
+    assert labels == ["Text", "Table", "Text"]
+
+    # Pages without a text layer always go to the layout model
+    assert confidences[1] == 0
@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from marker.utils.batching import BatchingPredictor
+
+
+class FakePredictor:
+    def __init__(self):
+        self.calls = []
+        self.disable_tqdm = False
+
+    def __call__(self, images, batch_size=None):
+        self.calls.append(len(images))
+        return [image * 2 for image in images]
+
+
+def test_batching_predictor_merges_concurrent_calls():
+    model = FakePredictor()
+    predictor = BatchingPredictor(model, max_wait_ms=200)
+
+    inputs = [[1, 2], [3], [4, 5, 6]]
+    with ThreadPoolExecutor(max_workers=len(inputs)) as executor:
+        results = list(executor.map(lambda x: predictor(x, batch_size=4), inputs))
+
+    assert results == [[2, 4], [6], [8, 10, 12]]
+    assert sum(model.calls) == 6
+    assert len(model.calls) < len(inputs)
+
+
+def test_batching_predictor_separates_kwargs():
+    model = FakePredictor()
+    predictor = BatchingPredictor(model, max_wait_ms=50)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(predictor, [1], batch_size=1)
+        second = executor.submit(predictor, [2], batch_size=2)
+        assert first.result() == [2]
+        assert second.result() == [4]
+
+    assert model.calls == [1, 1]
@@ -0,0 +1,67 @@
+from typing import List
+
+from PIL import Image
+from pydantic import BaseModel
+
+from marker.utils.cache import DiskCache
+from marker.utils.model_cache import CachedPredictor
+
+
+class FakeResult(BaseModel):
+    size: int
+    heatmap: Image.Image | None = None
+
+    model_config = {"arbitrary_types_allowed": True}
+
+
+class FakeLabels(BaseModel):
+    labels: List[str]
+
+
+class FakePredictor:
+    def __init__(self):
+        self.calls = []
+        self.disable_tqdm = False
+
+    def __call__(self, images, batch_size=None):
+        self.calls.append(len(images))
+        return [FakeResult(size=image.width, heatmap=image) for image in images]
+
+
+class FakeErrorPredictor:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, batch_size=None):
+        self.calls.append(len(texts))
+        return FakeLabels(labels=["bad" if "?" in text else "good" for text in texts])
+
+
+def test_cached_predictor_skips_repeated_pages(tmp_path):
+    model = FakePredictor()
+    predictor = CachedPredictor(model, "layout_model", DiskCache(str(tmp_path), 1024 * 1024))
+    pages = [Image.new("RGB", (10 + i, 10), "white") for i in range(3)]
+
+    assert [r.size for r in predictor(pages, batch_size=2)] == [10, 11, 12]
+    # Only the new page is sent to the model, results stay in input order
+    repeat = [pages[2], Image.new("RGB", (20, 10), "white"), pages[0]]
+    results = predictor(repeat, batch_size=8)
+    assert [r.size for r in results] == [12, 20, 10]
+    assert model.calls == [3, 1]
+    assert (predictor.hits, predictor.misses) == (2, 4)
+
+    # Cached results leave out images
+    assert results[0].heatmap is None
+    assert results[1].heatmap is not None
+
+    predictor.disable_tqdm = True
+    assert model.disable_tqdm
+
+
+def test_cached_predictor_result_models(tmp_path):
+    model = FakeErrorPredictor()
+    predictor = CachedPredictor(model, "ocr_error_model", DiskCache(str(tmp_path), 1024 * 1024))
+
+    assert predictor(["fine", "odd?"]).labels == ["good", "bad"]
+    assert predictor(["odd?", "new", "fine"]).labels == ["bad", "good", "good"]
+    assert model.calls == [2, 1]
@@ -73,3 +73,15 @@ def test_config_force_ocr():
 
     # Validate kwarg capturing
     assert config_dict["force_ocr"]
+
+
+def test_config_output_formats():
+    kwargs = capture_kwargs(["test", "--output_format", "json,markdown,json"])
+    parser = ConfigParser(kwargs)
+
+    assert parser.get_output_formats() == ["json", "markdown"]
+    assert parser.get_renderer() == "marker.renderers.json.JSONRenderer"
+    assert len(parser.get_renderers()) == 2
+
+    parser = ConfigParser({"output_format": "all"})
+    assert parser.get_output_formats() == ["markdown", "json", "html", "chunks"]
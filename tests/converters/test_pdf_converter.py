@@ -48,6 +48,17 @@ def test_xlsx_converter(pdf_converter: PdfConverter, temp_doc):
     assert "four" in markdown
 
 
+@pytest.mark.filename("single_sheet.xlsx")
+@pytest.mark.config({"structured_input": True})
+def test_xlsx_structured_converter(pdf_converter: PdfConverter, temp_doc):
+    markdown_output: MarkdownOutput = pdf_converter(temp_doc.name)
+    markdown = markdown_output.markdown
+
+    assert "# Sheet1" in markdown
+    assert "four" in markdown
+    assert markdown_output.metadata["page_stats"][0]["block_counts"]
+
+
 @pytest.mark.filename("china.html")
 @pytest.mark.config({"page_range": [10]})
 def test_html_converter(pdf_converter: PdfConverter, temp_doc):
@@ -58,6 +69,15 @@ def test_html_converter(pdf_converter: PdfConverter, temp_doc):
     assert "Republic of China" in markdown
 
 
+@pytest.mark.filename("gatsby.docx")
+@pytest.mark.config({"structured_input": True})
+def test_docx_structured_converter(pdf_converter: PdfConverter, temp_doc):
+    markdown_output: MarkdownOutput = pdf_converter(temp_doc.name)
+    markdown = markdown_output.markdown
+
+    assert "The Decline of the American Dream in the 1920s" in markdown
+
+
 @pytest.mark.filename("gatsby.docx")
 @pytest.mark.config({"page_range": [0]})
 def test_docx_converter(pdf_converter: PdfConverter, temp_doc):
@@ -103,3 +123,85 @@ def test_pdf_converter_bytes(pdf_converter: PdfConverter, temp_doc):
     # Some assertions for line joining across columns
     assert "remain similar across a wide range of choices." in markdown  # pg: 2
     assert "a new scheme for designing more robust and efficient" in markdown  # pg: 8
+
+
+@pytest.mark.config({"page_range": [0], "disable_ocr": True})
+def test_pdf_converter_in_memory(pdf_converter: PdfConverter, temp_doc):
+    with open(temp_doc.name, "rb") as f:
+        data = f.read()
+
+    # PDFs are read straight from memory, without a temporary file
+    with pdf_converter.resolve_input(memoryview(data)) as source:
+        assert source == data
+
+    document = pdf_converter.build_document(data)
+    assert document.filepath == "document.pdf"
+    assert document.source is data
+    assert "Subspace Adversarial Training" in pdf_converter(data).markdown
+
+
+@pytest.mark.output_format("markdown")
+@pytest.mark.config(
+    {"page_range": [0, 1, 2, 3], "disable_ocr": True, "page_window_size": 2}
+)
+def test_pdf_converter_stream(pdf_converter: PdfConverter, temp_doc):
+    outputs = list(pdf_converter.stream(temp_doc.name))
+
+    # The last page of the first window is carried over into the second
+    assert len(outputs) == 2
+    assert pdf_converter.page_count == 4
+
+    markdown = "".join(output.markdown for output in outputs)
+    assert "# Subspace Adversarial Training" in markdown
+    assert (
+        "AT solutions. However, these methods highly rely on specifically" in markdown
+    )  # pgs: 1-2
+
+
+@pytest.mark.config({"page_range": [0], "disable_ocr": True})
+def test_pdf_converter_render_all(model_dict, config, temp_doc):
+    converter = PdfConverter(
+        artifact_dict=model_dict,
+        renderer=[
+            "marker.renderers.markdown.MarkdownRenderer",
+            "marker.renderers.json.JSONRenderer",
+            "marker.renderers.html.HTMLRenderer",
+        ],
+        config=config,
+    )
+    markdown_output, json_output, html_output = converter.render_all(temp_doc.name)
+
+    assert converter.page_count == 1
+    assert "# Subspace Adversarial Training" in markdown_output.markdown
+    assert len(json_output.children) == 1
+    assert "Subspace Adversarial Training" in html_output.html
+    assert markdown_output.images.keys() == html_output.images.keys()
+
+
+@pytest.mark.config({"page_range": [0], "disable_ocr": True})
+def test_pdf_converter_document_cache(model_dict, config, temp_doc, tmp_path):
+    config = {**config, "document_cache_dir": str(tmp_path)}
+    converter = PdfConverter(artifact_dict=model_dict, config=config)
+    first_output = converter(temp_doc.name)
+    assert len(list(tmp_path.glob("*.bin"))) == 1
+
+    # The second conversion loads the built document from the cache
+    second_output = PdfConverter(artifact_dict=model_dict, config=config)(temp_doc.name)
+    assert second_output.markdown == first_output.markdown
+    assert second_output.images.keys() == first_output.images.keys()
+
+
+@pytest.mark.config({"page_range": [0], "disable_ocr": True, "profile_stages": True})
+def test_pdf_converter_profile_stages(model_dict, config, temp_doc):
+    converter = PdfConverter(artifact_dict=model_dict, config=config)
+    output = converter(temp_doc.name)
+
+    profile = output.metadata["pipeline_profile"]
+    stages = {stage["name"]: stage for stage in profile["stages"]}
+    assert {"DocumentBuilder", "LayoutBuilder", "LineBuilder", "StructureBuilder"} <= stages.keys()
+    assert "OcrBuilder" not in stages
+    assert stages["LayoutBuilder"]["models"]["layout_model"]["items"] == 1
+    assert all(stage["wall_time"] >= 0 for stage in stages.values())
+
+    page_times = output.metadata["page_stats"][0]["stage_times"]
+    assert page_times.keys() == stages.keys()
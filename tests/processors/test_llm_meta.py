@@ -0,0 +1,28 @@
+from marker.processors.llm.llm_meta import LLMComplexMetaProcessor
+from marker.schema import BlockTypes
+from tests.processors.utils import RecordingProcessor
+
+
+def test_complex_meta_processor_order():
+    log = []
+    text = RecordingProcessor("text", (BlockTypes.Text,), log)
+    # Would time out if the table processor had to wait for the text processor to finish first
+    tables = RecordingProcessor("tables", (BlockTypes.Table,), log)
+    text.wait_for = tables
+    table_merge = RecordingProcessor("table_merge", (BlockTypes.Table,), log)
+    page_correction = RecordingProcessor("page_correction", None, log)
+
+    meta = LLMComplexMetaProcessor([text, tables, table_merge, page_correction])
+    assert meta.graph.dependencies == [[], [], [1], [0, 1, 2]]
+    assert meta.writes() is None
+
+    meta("document")
+    assert log.index("tables") < log.index("text")
+    assert log.index("tables") < log.index("table_merge")
+    assert log[-1] == "page_correction"
+
+    # Processors can each be given their own document
+    log.clear()
+    meta("window", document_for=lambda p: "context" if p is table_merge else "window")
+    assert table_merge.document == "context"
+    assert tables.document == "window"
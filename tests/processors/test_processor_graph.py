@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from marker.processors.graph import ProcessorGraph
+from marker.schema import BlockTypes
+from tests.processors.utils import RecordingProcessor
+
+
+def test_processor_conflicts():
+    log = []
+    code = RecordingProcessor("code", (BlockTypes.Code,), log, read_block_types=(BlockTypes.Line,))
+    equation = RecordingProcessor("equation", (BlockTypes.Equation,), log)
+    line_merge = RecordingProcessor("line_merge", (BlockTypes.Text,), log, write_block_types=(BlockTypes.Line,))
+    order = RecordingProcessor("order", tuple(), log, write_block_types=(BlockTypes.Page,))
+    everything = RecordingProcessor("everything", None, log)
+
+    assert not code.conflicts_with(equation)
+    assert code.conflicts_with(line_merge)
+    # Every processor reads the page structure
+    assert order.conflicts_with(equation)
+    assert everything.conflicts_with(code)
+
+    code.adds_blocks = equation.adds_blocks = True
+    assert code.conflicts_with(equation)
+
+
+def test_processor_graph_runs_in_dependency_order():
+    log = []
+    processors = [
+        RecordingProcessor("order", tuple(), log, write_block_types=(BlockTypes.Page,)),
+        RecordingProcessor("line_merge", (BlockTypes.Text,), log, write_block_types=(BlockTypes.Line,)),
+        RecordingProcessor("code", (BlockTypes.Code,), log, read_block_types=(BlockTypes.Line,)),
+        RecordingProcessor("equation", (BlockTypes.Equation,), log),
+        RecordingProcessor("footnote", (BlockTypes.Footnote,), log),
+        RecordingProcessor("blank_page", None, log),
+    ]
+    graph = ProcessorGraph(processors)
+    assert graph.dependencies == [[], [0], [0, 1], [0], [0], [0, 1, 2, 3, 4]]
+
+    graph.run(lambda processor: processor("document"), max_workers=4)
+    assert log[0] == "order"
+    assert log.index("line_merge") < log.index("code")
+    assert log[-1] == "blank_page"
+
+    # A single worker runs the list in order
+    log.clear()
+    graph.run(lambda processor: processor("document"), max_workers=1)
+    assert log == [p.name for p in processors]
+
+
+def test_processor_graph_overlaps_independent_processors():
+    started = threading.Barrier(2, timeout=5)
+    processors = [
+        RecordingProcessor("code", (BlockTypes.Code,), []),
+        RecordingProcessor("equation", (BlockTypes.Equation,), []),
+    ]
+    # Only passes the barrier if both processors run at the same time
+    ProcessorGraph(processors).run(lambda processor: started.wait(), max_workers=2)
+
+
+def test_processor_graph_raises_errors():
+    def fail(processor):
+        raise ValueError(processor.name)
+
+    processors = [RecordingProcessor("code", (BlockTypes.Code,), [])]
+    with pytest.raises(ValueError, match="code"):
+        ProcessorGraph(processors).run(fail, max_workers=2)
@@ -0,0 +1,37 @@
+import threading
+
+from marker.processors import BaseProcessor
+
+
+class RecordingProcessor(BaseProcessor):
+    """
+    A processor that logs its name when it runs, for checking the order processors are scheduled in.
+    """
+
+    def __init__(
+        self,
+        name,
+        block_types,
+        log,
+        write_block_types=(),
+        read_block_types=(),
+        wait_for=None,
+        config=None,
+    ):
+        super().__init__(config)
+        self.name = name
+        self.block_types = block_types
+        self.write_block_types = write_block_types
+        self.read_block_types = read_block_types
+        self.log = log
+        self.wait_for = wait_for
+        self.document = None
+        self.done = threading.Event()
+
+    def __call__(self, document):
+        # Only finishes if the processor it waits on can run at the same time
+        if self.wait_for is not None:
+            assert self.wait_for.done.wait(timeout=5)
+        self.document = document
+        self.log.append(self.name)
+        self.done.set()
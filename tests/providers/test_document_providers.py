@@ -1,5 +1,10 @@
 import pytest
 
+from marker.providers import html_render
+from marker.providers.html import HTMLProvider, StructuredHTMLProvider
+from marker.providers.spreadsheet import StructuredSpreadSheetProvider
+from marker.schema import BlockTypes
+
 
 @pytest.mark.config({"page_range": [0]})
 @pytest.mark.filename("lambda.pptx")
@@ -55,4 +60,97 @@ def test_xlsx_provider(doc_provider):
     page_lines = doc_provider.get_page_lines(0)
 
     spans = page_lines[0].spans
-    assert spans[0].text == "Sheet1"
\ No newline at end of file
+    assert spans[0].text == "Sheet1"
+
+
+def test_converted_pdf_cache(tmp_path, monkeypatch):
+    html_path = tmp_path / "page.html"
+    html_path.write_text("<h1>Cached Heading</h1><p>Some text on the page.</p>", encoding="utf-8")
+
+    renders = []
+    render_html = html_render.render_html
+
+    def counting_render(*args):
+        renders.append(args)
+        return render_html(*args)
+
+    monkeypatch.setattr(html_render, "render_html", counting_render)
+    config = {"conversion_cache_dir": str(tmp_path / "cache")}
+    first = HTMLProvider(str(html_path), config)
+    second = HTMLProvider(str(html_path), config)
+
+    # The second provider reads the cached PDF instead of rendering again
+    assert len(renders) == 1
+    assert first.filepath == second.filepath
+    assert second.filename == str(html_path)
+    assert second.get_page_lines(0)[0].spans[0].text == "Cached Heading"
+
+
+def test_structured_xlsx_provider(tmp_path):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Totals"
+    sheet.append(["Region", "Q1", "Q2"])
+    sheet.append(["North", 1, 2])
+    sheet.append(["South", 3, 4])
+    sheet.append(["Both", 10])
+    sheet.merge_cells("B4:C4")
+    workbook.create_sheet("Empty")
+    path = tmp_path / "totals.xlsx"
+    workbook.save(path)
+
+    provider = StructuredSpreadSheetProvider(str(path), {"rows_per_page": 2})
+    pages = list(provider.iter_pages())
+
+    # Two pages for the first sheet's rows, and a heading only page for the empty sheet
+    assert len(pages) == 3
+    assert len(provider) == 3
+    assert pages[0].children[0].html == "<h1>Totals</h1>"
+    assert pages[2].children[0].html == "<h1>Empty</h1>"
+
+    cells = [block for block in pages[1].children if block.block_type == BlockTypes.TableCell]
+    merged = [cell for cell in cells if cell.text == "10"][0]
+    assert (merged.rowspan, merged.colspan) == (1, 2)
+    assert len(cells) == 5
+
+    header_cells = [block for block in pages[0].children if block.block_type == BlockTypes.TableCell and block.row_id == 0]
+    assert [cell.text for cell in header_cells] == ["Region", "Q1", "Q2"]
+    assert all(cell.is_header for cell in header_cells)
+
+
+def test_structured_html_provider(tmp_path):
+    html_path = tmp_path / "page.html"
+    html_path.write_text(
+        "<html><head><title>Skipped</title></head><body>"
+        "<h2>Results &amp; notes</h2><p>First <b>bold</b> paragraph.</p>"
+        "<ul><li>One</li><li>Two<ul><li>Nested</li></ul></li></ul>"
+        "<table><tr><th>A</th><th>B</th></tr><tr><td colspan='2'>Both</td></tr></table>"
+        "</body></html>",
+        encoding="utf-8",
+    )
+
+    provider = StructuredHTMLProvider(str(html_path))
+    document = provider.build_document()
+    blocks = document.pages[0].children
+
+    assert [block.block_type for block in blocks if block.block_type != BlockTypes.TableCell] == [
+        BlockTypes.SectionHeader,
+        BlockTypes.Text,
+        BlockTypes.ListGroup,
+        BlockTypes.ListItem,
+        BlockTypes.ListItem,
+        BlockTypes.ListItem,
+        BlockTypes.Table,
+    ]
+    assert blocks[0].heading_level == 2
+    assert blocks[1].html == "<p>First <b>bold</b> paragraph.</p>"
+    assert [block.list_indent_level for block in blocks if block.block_type == BlockTypes.ListItem] == [0, 0, 1]
+
+    cells = [block for block in blocks if block.block_type == BlockTypes.TableCell]
+    assert [(cell.row_id, cell.col_id, cell.colspan, cell.is_header) for cell in cells] == [
+        (0, 0, 1, True),
+        (0, 1, 1, True),
+        (1, 0, 2, False),
+    ]
@@ -1,3 +1,5 @@
+from PIL import Image
+
 from marker.providers.image import ImageProvider
 from marker.renderers.markdown import MarkdownOutput
 
@@ -10,6 +12,23 @@ def test_image_provider(config, temp_image):
     page_lines = provider.get_page_lines(0)
     assert len(page_lines) == 0
 
+
+def test_image_provider_multi_frame(tmp_path):
+    frames = [Image.new("L", (1200, 600), color) for color in (0, 128, 255)]
+    path = tmp_path / "scan.tiff"
+    frames[0].save(path, save_all=True, append_images=frames[1:], dpi=(600, 600))
+
+    provider = ImageProvider(str(path), {"page_range": [1, 2]})
+    assert len(provider) == 3
+    assert provider.get_page_bbox(1).bbox == [0, 0, 144, 72]
+
+    # Frames are downsampled to the requested DPI, and never upsampled past their own
+    images = provider.get_images([2, 1], 96)
+    assert [image.size for image in images] == [(192, 96), (192, 96)]
+    assert images[0].getpixel((0, 0)) == (255, 255, 255)
+    assert provider.get_images([1], 1200)[0].size == (1200, 600)
+
+
 def test_image_provider_conversion(pdf_converter, temp_image):
     markdown_output: MarkdownOutput = pdf_converter(temp_image.name)
     assert "Hello, World!" in markdown_output.markdown
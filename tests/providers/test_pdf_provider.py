@@ -1,4 +1,5 @@
 import pytest
+from ftfy import fix_text
 
 
 @pytest.mark.config({"page_range": [0]})
@@ -15,3 +16,98 @@ def test_pdf_provider(doc_provider):
     assert spans[0].text == "Subspace Adversarial Training"
     assert spans[0].font == "NimbusRomNo9L-Medi"
     assert spans[0].formats == ["plain"]
+
+
+@pytest.mark.config(
+    {"page_range": [0], "render_workers": 2, "render_min_pages_per_worker": 1}
+)
+def test_pdf_provider_parallel_render(doc_provider):
+    idxs = [3, 0, 1, 2]
+    parallel_images = doc_provider.get_images(idxs, 96)
+
+    doc_provider.render_workers = 1
+    serial_images = doc_provider.get_images(idxs, 96)
+
+    assert len(parallel_images) == len(idxs)
+    for parallel, serial in zip(parallel_images, serial_images):
+        assert parallel.size == serial.size
+        assert parallel.tobytes() == serial.tobytes()
+
+
+@pytest.mark.config({"page_range": [0], "keep_chars": True, "compact_chars": True})
+def test_pdf_provider_compact_chars(doc_provider):
+    page_lines = doc_provider.get_page_lines(0)
+    line = page_lines[0]
+    span_chars = line.chars[0]
+
+    assert len(span_chars) > 0
+    assert span_chars.text.replace(" ", "") == line.spans[0].text.replace(" ", "")
+    assert span_chars[0].block_type == span_chars[-1].block_type
+    assert span_chars.bboxes.shape == (len(span_chars), 4)
+    assert span_chars[0].polygon.bbox[0] >= line.line.polygon.bbox[0] - 1
+
+
+@pytest.mark.config(
+    {"page_range": [0, 1, 2, 3], "pdftext_workers": 2, "pdftext_min_pages_per_worker": 1}
+)
+def test_pdf_provider_parallel_scan(doc_provider, config):
+    serial_provider = type(doc_provider)(doc_provider.filepath, {**config, "pdftext_workers": 1})
+
+    assert doc_provider.page_bboxes == serial_provider.page_bboxes
+    for page_id in config["page_range"]:
+        parallel_lines = doc_provider.get_page_lines(page_id)
+        serial_lines = serial_provider.get_page_lines(page_id)
+        assert [s.text for line in parallel_lines for s in line.spans] == [
+            s.text for line in serial_lines for s in line.spans
+        ]
+        assert doc_provider.get_page_refs(page_id) == serial_provider.get_page_refs(page_id)
+
+
+@pytest.mark.config({"page_range": [0, 1, 2], "keep_chars": True})
+def test_pdf_provider_matches_dictionary_output(doc_provider, config):
+    from pdftext.extraction import dictionary_output
+
+    expected = dictionary_output(
+        doc_provider.filepath,
+        page_range=config["page_range"],
+        keep_chars=True,
+        flatten_pdf=doc_provider.flatten_pdf,
+        quote_loosebox=False,
+        disable_links=doc_provider.disable_links,
+    )
+    with doc_provider.get_doc() as doc:
+        pages, _ = doc_provider.scan_pages(doc)
+
+    assert pages == expected
+    assert doc_provider.page_bboxes == {
+        page["page"]: [0, 0, page["width"], page["height"]] for page in expected
+    }
+    for page in expected:
+        expected_text = []
+        for block in page["blocks"]:
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    if not span["text"]:
+                        continue
+                    text = doc_provider.normalize_spaces(fix_text(span["text"]))
+                    expected_text.append(text.strip() if span.get("superscript") else text)
+        lines = doc_provider.get_page_lines(page["page"])
+        assert [span.text for line in lines for span in line.spans] == expected_text
+
+
+@pytest.mark.config({"page_range": [0, 1, 2, 3]})
+def test_pdf_provider_deferred_extraction(doc_provider, config):
+    deferred_provider = type(doc_provider)(
+        doc_provider.filepath, {**config, "defer_text_extraction": True}
+    )
+    assert deferred_provider.page_bboxes == {}
+
+    deferred_provider.extract_pages([0, 1])
+    deferred_provider.extract_pages([1, 2, 3])
+    assert deferred_provider.page_bboxes == doc_provider.page_bboxes
+    for page_id in config["page_range"]:
+        deferred_lines = deferred_provider.get_page_lines(page_id)
+        lines = doc_provider.get_page_lines(page_id)
+        assert [s.text for line in deferred_lines for s in line.spans] == [
+            s.text for line in lines for s in line.spans
+        ]
@@ -0,0 +1,55 @@
+import copy
+import pickle
+
+from marker.schema import BlockTypes
+from marker.schema.polygon import PolygonBox
+from marker.schema.text import Span
+from marker.schema.text.store import CharStore
+
+
+def make_span(chars):
+    return Span(
+        polygon=PolygonBox.from_bbox([0, 0, 100, 10]),
+        text=chars.text,
+        font="Unknown",
+        font_weight=0,
+        font_size=0,
+        minimum_position=0,
+        maximum_position=0,
+        formats=["plain"],
+        page_id=0,
+    )
+
+
+def test_char_store_views():
+    store = CharStore(page_id=2)
+    first = store.add(["a", "b"], [[0, 0, 5, 10], [5, 0, 10, 10]], [0, 1])
+    second = store.add(["ﬁ", "c"], [[10, 0, 15, 10], [15, 0, 20, 10]], [2, 3])
+    store.finalize()
+
+    assert len(store) == 4
+    assert first.text == "ab"
+    assert second.text == "ﬁc"
+    assert [c.text for c in second] == ["ﬁ", "c"]
+    assert second[-1].idx == 3
+    assert second[0].bbox == [10, 0, 15, 10]
+    assert second[0].polygon.bbox == [10, 0, 15, 10]
+    assert second[0].id.page_id == 2
+    assert second[0].block_type == BlockTypes.Char
+
+
+def test_span_chars_survive_copies():
+    store = CharStore(page_id=0)
+    chars = store.add(["x", "y"], [[0, 0, 1, 1], [1, 0, 2, 1]], [0, 1])
+    store.finalize()
+
+    span = make_span(chars)
+    span.set_chars(chars)
+    assert [c.text for c in span.get_chars(None)] == ["x", "y"]
+
+    # Copies share the store instead of duplicating it
+    copied = copy.deepcopy(span)
+    assert copied.get_chars(None)[0].store is store
+
+    restored = pickle.loads(pickle.dumps(span))
+    assert [c.idx for c in restored.get_chars(None)] == [0, 1]
@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+import pytest
+
+from marker.schema.polygon import PolygonBox
+from marker.utils import geometry
+
+
+@pytest.fixture
+def polygons():
+    rng = random.Random(0)
+    boxes = []
+    for _ in range(40):
+        x0, y0 = rng.uniform(0, 500), rng.uniform(0, 700)
+        boxes.append(PolygonBox.from_bbox([x0, y0, x0 + rng.uniform(0, 120), y0 + rng.uniform(0, 40)]))
+    return boxes
+
+
+def test_pairwise_geometry_matches_polygon_box(polygons):
+    bboxes = geometry.bboxes_array(polygons)
+    gaps = geometry.minimum_gap(bboxes, bboxes)
+    distances = geometry.center_distance(bboxes, bboxes, x_weight=5)
+    abs_distances = geometry.center_distance(bboxes, bboxes, x_weight=5, absolute=True)
+    pcts = geometry.intersection_pct(bboxes, bboxes)
+
+    for i, a in enumerate(polygons):
+        for j, b in enumerate(polygons):
+            assert gaps[i, j] == pytest.approx(a.minimum_gap(b))
+            assert distances[i, j] == pytest.approx(a.center_distance(b, x_weight=5))
+            assert abs_distances[i, j] == pytest.approx(a.center_distance(b, x_weight=5, absolute=True))
+            assert pcts[i, j] == pytest.approx(a.intersection_pct(b))
+
+
+def test_transforms_match_polygon_box(polygons):
+    corners = geometry.corners_array(polygons)
+    bounds = (0, 0, 400, 500)
+    transformed = geometry.to_polygons(
+        geometry.fit_to_bounds(
+            geometry.expand(geometry.rescale(corners, (612, 792), (1224, 1584)), 0.05, 0.1),
+            bounds,
+        )
+    )
+    for polygon, result in zip(polygons, transformed):
+        expected = polygon.rescale((612, 792), (1224, 1584)).expand(0.05, 0.1).fit_to_bounds(bounds)
+        assert np.allclose(result.polygon, expected.polygon)
+        assert np.allclose(result.bbox, expected.bbox)
+
+
+def test_empty_inputs():
+    assert geometry.bboxes_array([]).shape == (0, 4)
+    assert geometry.to_polygons(geometry.rescale(geometry.corners_array([]), (1, 1), (2, 2))) == []
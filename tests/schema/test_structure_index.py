@@ -0,0 +1,74 @@
+from marker.schema import BlockTypes
+from marker.schema.blocks import Text
+from marker.schema.document import Document
+from marker.schema.groups.page import PageGroup
+from marker.schema.polygon import PolygonBox
+
+
+def make_document(page_count=3, blocks_per_page=4):
+    pages = []
+    for page_id in range(page_count):
+        page = PageGroup(page_id=page_id, polygon=PolygonBox.from_bbox([0, 0, 100, 100]))
+        for i in range(blocks_per_page):
+            block = page.add_block(Text, PolygonBox.from_bbox([0, i * 10, 100, i * 10 + 5]))
+            page.add_structure(block)
+        pages.append(page)
+    return Document(filepath="test.pdf", pages=pages)
+
+
+def test_structure_index_matches_list_index():
+    document = make_document()
+    page = document.pages[1]
+    for idx, block_id in enumerate(page.structure):
+        assert page.structure_index(block_id) == page.structure.index(block_id) == idx
+
+    # In-place edits and reassignment are picked up
+    new_block = page.add_block(Text, PolygonBox.from_bbox([0, 0, 10, 10]))
+    page.structure.insert(1, new_block.id)
+    assert page.structure_index(page.structure[2]) == 2
+    page.structure = list(reversed(page.structure))
+    for block_id in page.structure:
+        assert page.structure_index(block_id) == page.structure.index(block_id)
+
+
+def test_structure_index_updates():
+    document = make_document()
+    page = document.pages[0]
+    first, second, third, fourth = page.structure_blocks(page)
+
+    replacement = Text(polygon=PolygonBox.from_bbox([0, 0, 10, 10]), page_id=0)
+    page.replace_block(second, replacement)
+    assert page.structure_index(replacement.id) == 1
+    assert document.get_next_block(first) is replacement
+    assert document.get_prev_block(third) is replacement
+
+    page.remove_structure_items([replacement.id])
+    assert document.get_next_block(first) is third
+    assert page.structure_index(fourth.id) == 2
+
+
+def test_document_navigation():
+    document = make_document()
+    last_on_first_page = document.pages[0].get_block(document.pages[0].structure[-1])
+    first_on_second_page = document.pages[1].get_block(document.pages[1].structure[0])
+
+    assert document.get_page(2) is document.pages[2]
+    assert document.get_page(5) is None
+    assert document.get_next_block(last_on_first_page) is first_on_second_page
+    assert document.get_prev_block(first_on_second_page) is last_on_first_page
+    assert document.get_next_page(document.pages[0]) is document.pages[1]
+    assert document.get_prev_page(document.pages[0]) is None
+    assert document.get_next_block(
+        last_on_first_page, ignored_block_types=[BlockTypes.Text]
+    ) is None
+
+
+def test_block_id_string_cache():
+    document = make_document(page_count=1, blocks_per_page=1)
+    block = document.pages[0].children[0]
+    assert str(block.id) == "/page/0/Text/0"
+
+    block.block_id = 5
+    assert str(block.id) == "/page/0/Text/5"
+    assert block.id == "/page/0/Text/5"
+    assert hash(block.id) == hash("/page/0/Text/5")
@@ -0,0 +1,88 @@
+from typing import Annotated
+
+from PIL import Image
+from pydantic import BaseModel
+
+from marker.schema.blocks import Text
+from marker.schema.polygon import PolygonBox
+from marker.services import BaseService
+from marker.services.cache import CachedLLMService
+from marker.utils.cache import DiskCache
+
+
+class AnswerSchema(BaseModel):
+    answer: str
+
+
+class CountingService(BaseService):
+    fake_model: Annotated[str, "The model name."] = "fake-1"
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.calls = 0
+
+    def __call__(self, prompt, image, block, response_schema, max_retries=None, timeout=None):
+        self.calls += 1
+        if block:
+            block.update_metadata(llm_request_count=1)
+        return {"answer": prompt.upper()}
+
+
+def make_block():
+    return Text(polygon=PolygonBox.from_bbox([0, 0, 10, 10]), page_id=0, block_id=0)
+
+
+def test_cached_service_hits(tmp_path):
+    inner = CountingService()
+    service = CachedLLMService(inner, str(tmp_path), 1024 * 1024)
+    image = Image.new("RGB", (32, 32), "white")
+
+    block = make_block()
+    assert service("hello", image, block, AnswerSchema) == {"answer": "HELLO"}
+    assert service("hello", image, block, AnswerSchema) == {"answer": "HELLO"}
+    assert inner.calls == 1
+    assert block.metadata.llm_cache_hits == 1
+    assert block.metadata.llm_cache_misses == 1
+    assert block.metadata.llm_request_count == 1
+
+    # A different image, prompt or model is a different request
+    service("hello", Image.new("RGB", (32, 32), "black"), None, AnswerSchema)
+    service("goodbye", image, None, AnswerSchema)
+    inner.fake_model = "fake-2"
+    service("hello", image, None, AnswerSchema)
+    assert inner.calls == 4
+
+    # The cache is on disk, so a new service reuses it
+    fresh = CachedLLMService(CountingService(), str(tmp_path), 1024 * 1024)
+    fresh("hello", image, None, AnswerSchema)
+    assert fresh.service.calls == 0
+    assert (service.hits, service.misses) == (1, 4)
+
+
+def test_cached_service_skips_failures(tmp_path):
+    class FailingService(CountingService):
+        def __call__(self, *args, **kwargs):
+            self.calls += 1
+            return {}
+
+    inner = FailingService()
+    service = CachedLLMService(inner, str(tmp_path), 1024 * 1024)
+    service("hello", None, None, AnswerSchema)
+    service("hello", None, None, AnswerSchema)
+    assert inner.calls == 2
+
+
+def test_cache_evicts_only_over_budget(tmp_path, mocker):
+    cache = DiskCache(str(tmp_path), 1000)
+    evict = mocker.spy(cache, "evict")
+    for i in range(10):
+        cache.put(f"key{i}", b"x" * 50)
+    # Writes under the budget don't rescan the directory
+    assert evict.call_count == 0
+    assert cache.current_bytes == 500
+
+    for i in range(10, 100):
+        cache.put(f"key{i}", b"x" * 50)
+    on_disk = sum(path.stat().st_size for path in tmp_path.glob("*.bin"))
+    assert on_disk == cache.current_bytes <= 1000
+    assert evict.call_count < 90
@@ -0,0 +1,63 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from marker.services.transport import LLMTransport
+
+
+@pytest.fixture
+def stand_in_server():
+    state = {"in_flight": 0, "max_in_flight": 0, "clients": set()}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with lock:
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+                state["clients"].add(self.client_address)
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+
+            body = json.dumps({"response": "ok"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+
+
+def test_transport_limits_concurrency_and_reuses_connections(stand_in_server):
+    url, state = stand_in_server
+    transport = LLMTransport(max_concurrency=2, max_connections=2, keepalive_expiry=30)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(
+                    lambda _: transport.run(lambda: transport.post_json(url, {"prompt": "hi"})),
+                    range(16),
+                )
+            )
+    finally:
+        transport.close()
+
+    assert results == [{"response": "ok"}] * 16
+    assert state["max_in_flight"] <= 2
+    # Keep-alive connections are reused, instead of one connection per request
+    assert len(state["clients"]) <= 2